@@ -1,6 +1,6 @@
 import requests
 import json
-from datetime import datetime
+from iotsdk.utils import format_iso_time, format_timestamp
 
 def batch_query_device_status(base_url, token, device_name_list=None, device_id_list=None):
     """
@@ -94,22 +94,10 @@ def batch_query_device_status(base_url, token, device_name_list=None, device_id_
                     
                     # 处理时间戳 - 注意API返回的是数值类型或ISO格式字符串
                     last_online_time = device_status.get("lastOnlineTime")
-                    time_str = "未知"
-                    
-                    if last_online_time:
-                        # 尝试处理为数值时间戳
-                        if isinstance(last_online_time, (int, float)):
-                            dt = datetime.fromtimestamp(last_online_time / 1000)
-                            time_str = dt.strftime("%Y-%m-%d %H:%M:%S")
-                        # 尝试处理为ISO格式字符串
-                        elif isinstance(last_online_time, str):
-                            try:
-                                # 移除Z和毫秒部分
-                                dt_str = last_online_time.replace("Z", "+00:00")
-                                dt = datetime.fromisoformat(dt_str)
-                                time_str = dt.strftime("%Y-%m-%d %H:%M:%S")
-                            except:
-                                time_str = last_online_time
+                    if isinstance(last_online_time, str):
+                        time_str = format_iso_time(last_online_time)
+                    else:
+                        time_str = format_timestamp(last_online_time)
                     
                     # 获取IP地址
                     ip_address = device_status.get("asAddress", "未知")
@@ -0,0 +1,74 @@
+"""
+导入耗时基准
+
+在全新的解释器中用 python -X importtime 导入指定模块，取多次运行的中位数，
+超过预算时以非零状态退出，可以直接放在CI中执行。同时检查 import iotsdk
+没有加载requests、没有给根日志记录器添加处理器。
+
+用法:
+    python benchmarks/bench_import.py --budget-ms 30
+    python benchmarks/bench_import.py --module iotsdk.client --budget-ms 300
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 导入iotsdk后检查副作用的脚本
+SIDE_EFFECT_CHECK = (
+    "import logging, sys\n"
+    "import iotsdk\n"
+    "assert 'requests' not in sys.modules, 'import iotsdk 加载了requests'\n"
+    "assert not logging.getLogger().handlers, 'import iotsdk 修改了根日志记录器'\n"
+)
+
+
+def measure_import(module: str) -> float:
+    """
+    在新进程中导入模块
+
+    Returns:
+        float: 模块的累计导入耗时(毫秒)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    # 每行格式: import time: self [us] | cumulative | imported package
+    for line in result.stderr.splitlines():
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000
+    raise RuntimeError(f"importtime输出中没有找到模块: {module}")
+
+
+def check_side_effects() -> None:
+    """导入iotsdk不应加载传输层依赖或修改日志配置"""
+    subprocess.run([sys.executable, "-c", SIDE_EFFECT_CHECK], cwd=ROOT, check=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量模块导入耗时并检查预算")
+    parser.add_argument("--module", default="iotsdk", help="要导入的模块")
+    parser.add_argument("--runs", type=int, default=5, help="运行次数，取中位数")
+    parser.add_argument("--budget-ms", type=float, default=30.0, help="导入耗时预算(毫秒)")
+    args = parser.parse_args()
+
+    if args.module == "iotsdk":
+        check_side_effects()
+
+    timings = [measure_import(args.module) for _ in range(args.runs)]
+    median = statistics.median(timings)
+    print(f"import {args.module}: 中位数 {median:.1f} ms (最小 {min(timings):.1f} ms, 预算 {args.budget_ms:.1f} ms)")
+
+    if median > args.budget_ms:
+        print("超出导入耗时预算")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+连接池性能对比基准
+
+在本地启动IoT云平台模拟器，分别用逐次新建连接(requests.post)和
+IoTClient连接池两种方式调用设备状态接口，对比每秒调用次数。
+
+用法:
+    python benchmarks/bench_pool.py --requests 2000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import requests
+
+# 将上级目录添加到模块搜索路径中，以便导入iotsdk
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from iotsdk.client import IoTClient
+from iotsdk.emulator import Emulator
+
+STATUS_ENDPOINT = "/api/v1/quickdevice/status"
+
+
+def bench_without_pool(base_url: str, count: int) -> float:
+    """每次调用都新建连接"""
+    url = f"{base_url}{STATUS_ENDPOINT}"
+    headers = {"Content-Type": "application/json", "token": "bench"}
+    data = json.dumps({"deviceName": "device-1"})
+
+    start = time.perf_counter()
+    for _ in range(count):
+        requests.post(url, headers=headers, data=data).json()
+    return count / (time.perf_counter() - start)
+
+
+def bench_with_pool(base_url: str, count: int) -> float:
+    """通过IoTClient的连接池复用连接"""
+    with IoTClient(base_url, "bench") as client:
+        start = time.perf_counter()
+        for _ in range(count):
+            client._make_request(STATUS_ENDPOINT, {"deviceName": "device-1"})
+        return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比有无连接池时的调用吞吐")
+    parser.add_argument("--requests", type=int, default=1000, help="每种方式的调用次数")
+    args = parser.parse_args()
+
+    with Emulator() as emulator:
+        without_pool = bench_without_pool(emulator.base_url, args.requests)
+        with_pool = bench_with_pool(emulator.base_url, args.requests)
+
+    print(f"无连接池: {without_pool:.1f} 次/秒")
+    print(f"连接池:   {with_pool:.1f} 次/秒")
+    print(f"提升:     {with_pool / without_pool:.2f} 倍")
+
+
+if __name__ == "__main__":
+    main()
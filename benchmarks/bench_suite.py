@@ -0,0 +1,363 @@
+"""
+DeviceManager操作基准套件
+
+在子进程中启动IoT云平台模拟器(服务端的CPU开销不计入被测进程)，按并发级别运行
+每个DeviceManager方法和IoTClient._make_request，统计吞吐(次/秒)、p50/p99延迟、
+每次操作的CPU时间和峰值内存。结果可以保存为JSON基线；与基线相比任一指标的退化
+超过阈值时以非零状态退出，可以直接放在CI中执行。
+
+用法:
+    python benchmarks/bench_suite.py --save-baseline
+    python benchmarks/bench_suite.py --threshold 0.2
+    python benchmarks/bench_suite.py --only get_device_status,make_request --concurrency 1,16
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+# 将上级目录添加到模块搜索路径中，以便导入iotsdk
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from iotsdk.client import IoTClient
+from iotsdk.device import DeviceManager
+from iotsdk.emulator import Emulator, SimulatedFleet, spawn
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# 模拟设备群参数，基准进程用同样的参数推导哪些设备在线
+FLEET_SIZE = 1_000_000
+FLEET_SEED = 0
+
+# 指标 -> 数值越大越好
+METRICS = {
+    "ops_per_sec": True,
+    "p50_ms": False,
+    "p99_ms": False,
+    "cpu_ms_per_op": False,
+    "peak_kib": False,
+}
+
+
+class Operation(NamedTuple):
+    """一个被测操作，func(device_manager, i)执行第i次操作"""
+
+    name: str
+    func: Callable[[DeviceManager, int], object]
+    description: str
+
+
+class Result(NamedTuple):
+    """一个操作在一个并发级别下的测量结果"""
+
+    op: str
+    concurrency: int
+    ops: int
+    errors: int
+    ops_per_sec: float
+    p50_ms: float
+    p99_ms: float
+    cpu_ms_per_op: float
+    peak_kib: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.op}@{self.concurrency}"
+
+
+def build_operations(fleet: SimulatedFleet) -> List[Operation]:
+    """构造被测操作；RRPC只发给在线设备，注册使用不重复的设备编码"""
+    online = [fleet.device_name(i) for i in range(20000) if fleet.status(i)[0] == "ONLINE"]
+    run_id = uuid.uuid4().hex[:8]
+    names = itertools.count()
+
+    def name(i: int) -> str:
+        return fleet.device_name(i % fleet.size)
+
+    def new_name() -> str:
+        return f"bench-{run_id}-{next(names)}"
+
+    def make_request(dm, i):
+        return dm.client._make_request(DeviceManager.STATUS_ENDPOINT, {"deviceName": name(i)})
+
+    def register_device(dm, i):
+        return dm.register_device("bench-product", new_name())
+
+    def get_device_detail(dm, i):
+        return dm.get_device_detail(device_name=name(i))
+
+    def get_device_status(dm, i):
+        return dm.get_device_status(device_name=name(i))
+
+    def batch_get_device_status(dm, i):
+        return dm.batch_get_device_status(device_name_list=[name(i * 100 + j) for j in range(100)])
+
+    def send_rrpc_message(dm, i):
+        return dm.send_rrpc_message(online[i % len(online)], fleet.product_key, b"\x01\x03\x00\x00")
+
+    def send_custom_command(dm, i):
+        return dm.send_custom_command(name(i), b'{"cmd": "ping"}')
+
+    def iter_device_status(dm, i):
+        return list(dm.iter_device_status((name(i * 1000 + j) for j in range(1000)), concurrency=4))
+
+    def register_devices(dm, i):
+        devices = [{"product_key": "bench-product", "device_name": new_name()} for _ in range(20)]
+        return list(dm.register_devices(devices, concurrency=4))
+
+    def send_rrpc_fanout(dm, i):
+        targets = [(online[(i * 20 + j) % len(online)], fleet.product_key) for j in range(20)]
+        return list(dm.send_rrpc_fanout(targets, b"\x01", deadline=10, concurrency=8))
+
+    return [
+        Operation("make_request", make_request, "IoTClient._make_request 单设备状态"),
+        Operation("register_device", register_device, "注册一个设备"),
+        Operation("get_device_detail", get_device_detail, "查询一个设备详情"),
+        Operation("get_device_status", get_device_status, "查询一个设备状态"),
+        Operation("batch_get_device_status", batch_get_device_status, "批量查询100个设备状态"),
+        Operation("send_rrpc_message", send_rrpc_message, "向在线设备发送RRPC"),
+        Operation("send_custom_command", send_custom_command, "下发一条自定义指令"),
+        Operation("iter_device_status", iter_device_status, "流式查询1000个设备状态"),
+        Operation("register_devices", register_devices, "并发注册20个设备"),
+        Operation("send_rrpc_fanout", send_rrpc_fanout, "向20个设备并发发送RRPC"),
+    ]
+
+
+def _failed(response) -> bool:
+    """单次操作的结果是否为失败"""
+    if isinstance(response, dict):
+        return not response.get("success")
+    if isinstance(response, list):
+        return any(not (item.get("success", True) if isinstance(item, dict) else item.success)
+                   for item in response)
+    return False
+
+
+def _run(device_manager: DeviceManager, operation: Operation, ops: int,
+         concurrency: int, start_index: int) -> Dict:
+    """用concurrency个线程共执行ops次操作，返回每次的延迟、错误数和墙钟时间"""
+    counter = itertools.count(start_index)
+    stop_at = start_index + ops
+    latencies: List[List[float]] = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+
+    def worker(slot: int) -> None:
+        record = latencies[slot].append
+        while True:
+            i = next(counter)
+            if i >= stop_at:
+                return
+            start = time.perf_counter()
+            try:
+                failed = _failed(operation.func(device_manager, i))
+            except Exception:
+                failed = True
+            record(time.perf_counter() - start)
+            if failed:
+                errors[slot] += 1
+
+    threads = [threading.Thread(target=worker, args=(slot,)) for slot in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "latencies": sorted(itertools.chain.from_iterable(latencies)),
+        "errors": sum(errors),
+        "elapsed": elapsed,
+    }
+
+
+def _percentile(values: Sequence[float], fraction: float) -> float:
+    """最近秩百分位数，values已排序"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(fraction * len(values))) - 1))
+    return values[index]
+
+
+def measure(device_manager: DeviceManager, operation: Operation, ops: int,
+            concurrency: int, warmup: int, memory_ops: int) -> Result:
+    """
+    测量一个操作在一个并发级别下的性能
+
+    计时和CPU时间在不启用tracemalloc的情况下测量；峰值内存在单独的一轮中用
+    tracemalloc测量，避免跟踪开销影响计时。
+    """
+    index = 0
+    if warmup:
+        _run(device_manager, operation, warmup, concurrency, index)
+        index += warmup
+
+    cpu_start = time.process_time()
+    run = _run(device_manager, operation, ops, concurrency, index)
+    cpu = time.process_time() - cpu_start
+    index += ops
+
+    peak = 0
+    if memory_ops:
+        tracemalloc.start()
+        try:
+            current, _ = tracemalloc.get_traced_memory()
+            _run(device_manager, operation, memory_ops, concurrency, index)
+            _, peak = tracemalloc.get_traced_memory()
+            peak -= current
+        finally:
+            tracemalloc.stop()
+
+    latencies = run["latencies"]
+    return Result(
+        op=operation.name,
+        concurrency=concurrency,
+        ops=ops,
+        errors=run["errors"],
+        ops_per_sec=round(ops / run["elapsed"], 1),
+        p50_ms=round(_percentile(latencies, 0.50) * 1000, 3),
+        p99_ms=round(_percentile(latencies, 0.99) * 1000, 3),
+        cpu_ms_per_op=round(cpu / ops * 1000, 3),
+        peak_kib=round(peak / 1024, 1),
+    )
+
+
+def compare(results: Sequence[Result], baseline: Dict, threshold: float,
+            metrics: Sequence[str]) -> List[str]:
+    """
+    与基线比较
+
+    Returns:
+        List[str]: 超过阈值的退化描述，为空表示没有退化
+    """
+    regressions = []
+    for result in results:
+        base = baseline.get("results", {}).get(result.key)
+        if base is None:
+            continue
+        for metric in metrics:
+            old, new = base.get(metric), getattr(result, metric)
+            if not old:
+                continue
+            change = (new - old) / old
+            if METRICS[metric]:
+                change = -change
+            if change > threshold:
+                regressions.append(f"{result.key} {metric}: {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+def _print_table(results: Sequence[Result]) -> None:
+    print(f"{'op':<28}{'conc':>6}{'ops/s':>12}{'p50(ms)':>10}{'p99(ms)':>10}"
+          f"{'cpu(ms/op)':>12}{'peak(KiB)':>12}{'errors':>8}")
+    for r in results:
+        print(f"{r.op:<28}{r.concurrency:>6}{r.ops_per_sec:>12.1f}{r.p50_ms:>10.2f}{r.p99_ms:>10.2f}"
+              f"{r.cpu_ms_per_op:>12.3f}{r.peak_kib:>12.1f}{r.errors:>8}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="按并发级别测量DeviceManager各操作的性能并与基线比较")
+    parser.add_argument("--ops", type=int, default=300, help="每个操作在每个并发级别下的执行次数")
+    parser.add_argument("--warmup", type=int, default=20, help="预热次数，不计入结果")
+    parser.add_argument("--memory-ops", type=int, default=50, help="测量峰值内存的执行次数，0表示不测量")
+    parser.add_argument("--concurrency", default="1,8", help="逗号分隔的并发级别")
+    parser.add_argument("--only", help="逗号分隔的操作名称，默认运行全部操作")
+    parser.add_argument("--list", action="store_true", help="列出全部操作后退出")
+    parser.add_argument("--latency", help="模拟器的接口延迟，如 0.002、uniform:0.001,0.005，默认无延迟")
+    parser.add_argument("--in-process", action="store_true",
+                        help="在当前进程中运行模拟器(CPU时间会包含服务端开销)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="基线文件路径")
+    parser.add_argument("--save-baseline", action="store_true", help="把本次结果保存为基线")
+    parser.add_argument("--threshold", type=float, default=0.25, help="允许的退化比例")
+    parser.add_argument("--metrics", default=",".join(METRICS), help="参与比较的指标")
+    parser.add_argument("--json", help="把本次结果写入该JSON文件")
+    args = parser.parse_args(argv)
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    metrics = args.metrics.split(",")
+    unknown = set(metrics) - set(METRICS)
+    if unknown:
+        parser.error(f"未知的指标: {', '.join(sorted(unknown))}")
+
+    fleet = SimulatedFleet(size=FLEET_SIZE, seed=FLEET_SEED)
+    operations = build_operations(fleet)
+    if args.list:
+        for operation in operations:
+            print(f"{operation.name:<28}{operation.description}")
+        return 0
+    if args.only:
+        wanted = set(args.only.split(","))
+        operations = [operation for operation in operations if operation.name in wanted]
+        if len(operations) != len(wanted):
+            parser.error("--only 中包含未知的操作名称")
+
+    emulator_args = ["--devices", str(FLEET_SIZE), "--seed", str(FLEET_SEED)]
+    if args.latency:
+        emulator_args += ["--latency", args.latency]
+
+    emulator = process = None
+    if args.in_process:
+        emulator = Emulator(fleet, latency=args.latency).start()
+        base_url = emulator.base_url
+    else:
+        process, base_url = spawn(emulator_args)
+
+    results = []
+    try:
+        with IoTClient(base_url, "bench", pool_maxsize=max(levels) * 8) as client:
+            device_manager = DeviceManager(client)
+            for operation in operations:
+                for level in levels:
+                    results.append(measure(device_manager, operation, args.ops, level,
+                                           args.warmup, args.memory_ops))
+    finally:
+        if emulator is not None:
+            emulator.stop()
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    _print_table(results)
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": {result.key: result._asdict() for result in results},
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"基线已保存到 {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"没有找到基线 {args.baseline}，使用 --save-baseline 生成")
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold, metrics)
+    if regressions:
+        print(f"相对基线退化超过 {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"与基线相比没有超过 {args.threshold:.0%} 的退化")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,6 @@
 import requests
 import json
-from datetime import datetime
+from iotsdk.utils import format_offline_duration, format_timestamp
 
 def query_device_status(base_url, token, device_name=None, device_id=None):
     """
@@ -65,11 +65,7 @@ def query_device_status(base_url, token, device_name=None, device_id=None):
             status_text = status_map.get(device_status, device_status)
             
             # 时间戳格式化
-            if timestamp_ms:
-                dt = datetime.fromtimestamp(timestamp_ms / 1000)  # 毫秒转秒
-                time_str = dt.strftime("%Y-%m-%d %H:%M:%S")
-            else:
-                time_str = "未知"
+            time_str = format_timestamp(timestamp_ms)
             
             # 显示状态信息
             print(f"设备状态: {status_text}")
@@ -78,20 +74,7 @@ def query_device_status(base_url, token, device_name=None, device_id=None):
             
             # 如果设备离线，计算离线时长
             if device_status == "OFFLINE" and timestamp_ms:
-                now_ms = int(datetime.now().timestamp() * 1000)
-                offline_duration_ms = now_ms - timestamp_ms
-                offline_minutes = offline_duration_ms / (1000 * 60)
-                
-                if offline_minutes < 60:
-                    offline_text = f"约 {int(offline_minutes)} 分钟"
-                else:
-                    offline_hours = offline_minutes / 60
-                    if offline_hours < 24:
-                        offline_text = f"约 {int(offline_hours)} 小时 {int(offline_minutes % 60)} 分钟"
-                    else:
-                        offline_days = int(offline_hours / 24)
-                        remaining_hours = int(offline_hours % 24)
-                        offline_text = f"约 {offline_days} 天 {remaining_hours} 小时"
+                offline_text = format_offline_duration(timestamp_ms)
                 
                 print(f"离线时长: {offline_text}")
         else:
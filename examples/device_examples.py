@@ -2,6 +2,7 @@
 IoT SDK设备管理示例
 """
 
+import logging
 import sys
 import os
 
@@ -10,8 +11,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import iotsdk
 from iotsdk.client import IoTClient  # 直接导入IoTClient类
+from iotsdk.auth import FileTokenStore
+from iotsdk.downlink import CommandQueue
 from iotsdk.utils import pretty_print_json
-import base64  # 添加base64模块用于消息编码
 
 # 基础配置
 BASE_URL = "https://xxx.xxx.com"
@@ -27,10 +29,12 @@ def initialize_client_with_credentials_example():
     print("\n===== 使用应用凭证初始化客户端示例 =====")
     
     # 使用应用凭证初始化客户端
+    # token缓存在本地文件中，有效期内再次运行示例无需重新认证
     client = IoTClient.from_credentials(  # 使用直接导入的IoTClient类
         base_url=BASE_URL,
         app_id=APP_ID,
-        app_secret=APP_SECRET
+        app_secret=APP_SECRET,
+        token_store=FileTokenStore(ttl=3600)
     )
     
     print("\n客户端初始化成功!")
@@ -156,19 +160,14 @@ def send_custom_command_example(client):
     message_content = '{"washingMode": 2, "washingTime": 30}'
     print(f"原始消息内容: {message_content}")
     
-    # 将消息内容转换为Base64编码
-    message_bytes = message_content.encode('utf-8')
-    base64_message = base64.b64encode(message_bytes).decode('utf-8')
-    
-    # 构建请求体
-    payload = {
-        "deviceName": "32test",
-        "messageContent": base64_message
-    }
+    # 创建设备管理器
+    device_manager = iotsdk.create_device_manager(client)
     
-    # 发送请求到自定义下发指令的API端点
-    endpoint = "/api/v1/device/down/record/add/custom"
-    response = client._make_request(endpoint, payload)
+    # 发送自定义指令，消息内容由SDK进行Base64编码
+    response = device_manager.send_custom_command(
+        device_name="32test",
+        message_content=message_content
+    )
     
     # 检查结果
     if client.check_response(response):
@@ -176,6 +175,12 @@ def send_custom_command_example(client):
         print(f"响应数据: {response.get('data', {})}")
     else:
         print(f"\n自定义指令下发失败: {response.get('errorMessage', '未知错误')}")
+    
+    # 大量指令可以提交到后台队列，调用方不会阻塞
+    with CommandQueue(device_manager, workers=8) as commands:
+        futures = [commands.submit(f"device-{i}", message_content) for i in range(3)]
+        for future in futures:
+            print(f"后台下发结果: {client.check_response(future.result())}")
 
 
 def test_client_functionality(client):
@@ -200,6 +205,12 @@ def test_client_functionality(client):
 if __name__ == "__main__":
     """运行示例"""
     
+    # SDK本身不配置日志输出，示例中输出INFO级别日志
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
     # 首先创建一个全局客户端实例，后续所有示例共用此实例
     print("\n===== 创建SDK客户端 =====")
     print("使用应用凭证自动获取token...")
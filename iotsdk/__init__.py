@@ -1,34 +1,78 @@
 """
 IoT云平台SDK
 提供与IoT云平台交互的简便方法
+
+导入iotsdk不会加载requests等传输层依赖，也不会修改日志配置；
+各个类在首次访问时才导入对应的模块。
 """
 
-from .client import IoTClient
-from .device import DeviceManager
+import importlib
+import logging
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .client import IoTClient
+    from .device import DeviceManager
+    from .async_client import AsyncIoTClient
+    from .async_device import AsyncDeviceManager
+    from .loader import DeviceStatusLoader
+    from .models import DeviceStatus, DeviceDetail
 
 __version__ = "1.0.0"
 
-def create_client(base_url: str, token: str):
+# 库不配置日志输出，由应用决定是否以及如何输出iotsdk的日志
+logging.getLogger('iotsdk').addHandler(logging.NullHandler())
+
+# 公开名称 -> 所在模块，首次访问时导入
+_LAZY_ATTRIBUTES = {
+    "IoTClient": ".client",
+    "DeviceManager": ".device",
+    "AsyncIoTClient": ".async_client",
+    "AsyncDeviceManager": ".async_device",
+    "DeviceStatusLoader": ".loader",
+    "DeviceStatus": ".models",
+    "DeviceDetail": ".models",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES) + ["create_client", "create_device_manager"]
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+def create_client(base_url: str, token: str) -> "IoTClient":
     """
     创建IoT客户端
-    
+
     Args:
         base_url: API基础URL
         token: 认证令牌
-        
+
     Returns:
         IoTClient: IoT客户端实例
     """
+    from .client import IoTClient
     return IoTClient(base_url, token)
-    
-def create_device_manager(client: IoTClient):
+
+def create_device_manager(client: "IoTClient") -> "DeviceManager":
     """
     创建设备管理器
-    
+
     Args:
         client: IoT客户端实例
-        
+
     Returns:
         DeviceManager: 设备管理器实例
     """
-    return DeviceManager(client) 
\ No newline at end of file
+    from .device import DeviceManager
+    return DeviceManager(client)
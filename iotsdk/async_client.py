@@ -0,0 +1,234 @@
+import asyncio
+import json
+import logging
+from typing import Dict, Optional
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp为可选依赖：pip install iotsdk[async]
+    aiohttp = None
+
+from .client import IoTClient, JSONCodec, get_default_codec
+
+# 默认同时在途的请求数上限
+DEFAULT_MAX_CONCURRENCY = 100
+
+
+def _require_aiohttp() -> None:
+    if aiohttp is None:
+        raise ImportError("异步客户端需要安装aiohttp: pip install iotsdk[async]")
+
+
+class AsyncIoTClient:
+    """
+    IoT云平台异步SDK客户端类
+    基于asyncio和aiohttp，在单个事件循环中并发执行大量请求
+    """
+
+    def __init__(self, base_url: str, token: str, logger=None,
+                 session: Optional["aiohttp.ClientSession"] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 limit_per_host: int = 0,
+                 timeout: Optional[float] = None,
+                 codec: Optional[JSONCodec] = None):
+        """
+        初始化异步IoT客户端
+
+        Args:
+            base_url: API基础URL
+            token: 认证令牌
+            logger: 可选的日志记录器
+            session: 可选的aiohttp会话，未提供时在首次请求时创建
+            max_concurrency: 同时在途的请求数上限，超出的请求排队等待
+            limit_per_host: 每个主机的最大连接数，0表示不单独限制
+            timeout: 单个请求的总超时时间(秒)，None表示不限制
+            codec: JSON编解码器，默认优先使用orjson
+        """
+        _require_aiohttp()
+
+        self.base_url = base_url.rstrip('/')
+        self.token = token
+        self.logger = logger or logging.getLogger('iotsdk')
+
+        # 检查参数有效性
+        if not self.base_url:
+            raise ValueError("无效的base_url")
+        if not self.token:
+            raise ValueError("无效的token")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency必须大于0")
+
+        self.max_concurrency = max_concurrency
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.codec = codec or get_default_codec()
+        self._session = session
+        self._owns_session = session is None
+        self._semaphore = None
+
+        self.logger.info(f"异步IoT客户端已初始化: {self.base_url}")
+
+    @classmethod
+    async def from_credentials(cls, base_url: str, app_id: str, app_secret: str,
+                               logger=None, **client_options):
+        """
+        通过应用凭证初始化异步IoT客户端
+
+        Args:
+            base_url: API基础URL
+            app_id: 应用ID
+            app_secret: 应用密钥
+            logger: 可选的日志记录器
+            **client_options: 传递给构造函数的并发等配置
+
+        Returns:
+            AsyncIoTClient: 初始化后的客户端实例
+        """
+        _require_aiohttp()
+
+        logger = logger or logging.getLogger('iotsdk')
+        logger.info("通过应用凭证初始化异步IoT客户端")
+
+        # 构建身份验证URL
+        auth_url = f"{base_url.rstrip('/')}/api/v1/oauth/auth"
+
+        # 准备认证请求
+        headers = {"Content-Type": "application/json"}
+        payload = {
+            "appId": app_id,
+            "appSecret": app_secret
+        }
+
+        logger.debug(f"发送认证请求: POST {auth_url}")
+
+        session = client_options.pop("session", None)
+        owns_session = session is None
+        if owns_session:
+            session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(
+                limit=client_options.get("max_concurrency", DEFAULT_MAX_CONCURRENCY),
+                limit_per_host=client_options.get("limit_per_host", 0)
+            ))
+
+        try:
+            try:
+                # 发送认证请求
+                async with session.post(auth_url, headers=headers, data=json.dumps(payload)) as response:
+                    response.raise_for_status()
+                    result = json.loads(await response.read())
+            except aiohttp.ClientError as e:
+                logger.error(f"认证请求错误: {e}")
+                raise
+            except json.JSONDecodeError as e:
+                logger.error(f"认证响应解析错误: {e}")
+                raise ValueError(f"无法解析认证响应为JSON: {e}")
+
+            # 检查响应是否成功
+            if not result.get("success") or result.get("code") != 200:
+                error_msg = result.get("errorMessage", "未知错误")
+                logger.error(f"认证失败: {error_msg}")
+                raise ValueError(f"认证失败: {error_msg}")
+
+            logger.info("认证成功，已获取token")
+
+            client = cls(base_url=base_url, token=result["data"], logger=logger,
+                         session=session, **client_options)
+            client._owns_session = owns_session
+            return client
+
+        except BaseException:
+            # 超时、取消、响应缺少data等任何异常都要关闭自行创建的会话
+            if owns_session:
+                await session.close()
+            raise
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """获取会话，首次调用时在当前事件循环中创建连接池"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency,
+                                             limit_per_host=self.limit_per_host)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._owns_session = True
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def _make_request(self,
+                            endpoint: str,
+                            payload: Dict = None,
+                            method: str = 'POST',
+                            additional_headers: Dict = None) -> Dict:
+        """
+        发送API请求的通用方法
+
+        Args:
+            endpoint: API端点路径
+            payload: 请求体数据
+            method: HTTP方法(默认POST)
+            additional_headers: 附加的请求头
+
+        Returns:
+            Dict: API响应结果
+        """
+        # 构建完整URL
+        url = f"{self.base_url}{endpoint}"
+
+        # 设置请求头
+        headers = {
+            "Content-Type": "application/json",
+            "token": self.token
+        }
+
+        # 添加附加的请求头
+        if additional_headers:
+            headers.update(additional_headers)
+
+        session = self._get_session()
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"发送请求: {method} {url}")
+
+        try:
+            # 信号量限制在途请求数，其余请求在事件循环中排队
+            async with self._semaphore:
+                if method.upper() == 'POST':
+                    payload_data = self.codec.dumps(payload) if payload else None
+                    request = session.post(url, headers=headers, data=payload_data, timeout=timeout)
+                elif method.upper() == 'GET':
+                    request = session.get(url, headers=headers, params=payload, timeout=timeout)
+                else:
+                    raise ValueError(f"不支持的HTTP方法: {method}")
+
+                async with request as response:
+                    # 检查HTTP状态码
+                    response.raise_for_status()
+                    body = await response.read()
+
+            # 解析响应
+            result = self.codec.loads(body)
+
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"收到响应: {result}")
+
+            return result
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.error(f"请求错误: {e}")
+            raise
+        except json.JSONDecodeError as e:
+            self.logger.error(f"JSON解析错误: {e}")
+            raise ValueError(f"无法解析响应为JSON: {e}")
+
+    # 响应检查逻辑与同步客户端一致
+    check_response = IoTClient.check_response
+
+    async def close(self) -> None:
+        """关闭客户端持有的连接池"""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
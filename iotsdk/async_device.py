@@ -0,0 +1,132 @@
+from typing import Dict, List, Optional
+
+from .async_client import AsyncIoTClient
+from .device import MessageContent, _DeviceManagerBase
+
+
+class AsyncDeviceManager(_DeviceManagerBase):
+    """异步设备管理模块，接口与DeviceManager一致，所有方法均为协程"""
+
+    def __init__(self, client: AsyncIoTClient):
+        """
+        初始化异步设备管理模块
+
+        Args:
+            client: 异步IoT客户端实例
+        """
+        super().__init__(client)
+
+    async def register_device(self,
+                              product_key: str,
+                              device_name: Optional[str] = None,
+                              nick_name: Optional[str] = None) -> Dict:
+        """
+        注册设备
+
+        Args:
+            product_key: 产品唯一标识码
+            device_name: 设备标识码，可选，若未提供则自动生成
+            nick_name: 设备显示名称，可选
+
+        Returns:
+            Dict: 注册结果，包含设备ID和密钥等信息
+        """
+        payload = self._register_payload(product_key, device_name, nick_name)
+        response = await self.client._make_request(self.REGISTER_ENDPOINT, payload)
+        self._on_register_response(response)
+        return response
+
+    async def get_device_detail(self,
+                                device_name: Optional[str] = None,
+                                device_id: Optional[str] = None) -> Dict:
+        """
+        查询设备详情
+
+        Args:
+            device_name: 设备编码，可选
+            device_id: 设备唯一标识，可选
+
+        Returns:
+            Dict: 设备详情信息
+        """
+        payload = self._device_payload(device_name, device_id)
+        response = await self.client._make_request(self.DETAIL_ENDPOINT, payload)
+        self._on_detail_response(response)
+        return response
+
+    async def get_device_status(self,
+                                device_name: Optional[str] = None,
+                                device_id: Optional[str] = None) -> Dict:
+        """
+        查询设备在线状态
+
+        Args:
+            device_name: 设备编码，可选
+            device_id: 设备唯一标识，可选
+
+        Returns:
+            Dict: 设备状态信息
+        """
+        payload = self._device_payload(device_name, device_id)
+        response = await self.client._make_request(self.STATUS_ENDPOINT, payload)
+        self._on_status_response(response)
+        return response
+
+    async def batch_get_device_status(self,
+                                      device_name_list: Optional[List[str]] = None,
+                                      device_id_list: Optional[List[str]] = None) -> Dict:
+        """
+        批量查询设备运行状态
+
+        Args:
+            device_name_list: 设备编码列表，可选
+            device_id_list: 设备唯一标识列表，可选
+
+        Returns:
+            Dict: 批量设备状态信息
+        """
+        payload = self._batch_status_payload(device_name_list, device_id_list)
+        response = await self.client._make_request(self.BATCH_STATUS_ENDPOINT, payload)
+        self._on_batch_status_response(response)
+        return response
+
+    async def send_rrpc_message(self,
+                                device_name: str,
+                                product_key: str,
+                                message_content: MessageContent,
+                                timeout: int = 5000) -> Dict:
+        """
+        发送RRPC消息
+
+        Args:
+            device_name: 设备编码
+            product_key: 产品唯一标识码
+            message_content: 消息内容，字符串按UTF-8编码，bytes/bytearray/memoryview原样发送
+            timeout: 超时时间(毫秒)，默认5000ms
+
+        Returns:
+            Dict: 消息发送结果，设备响应的原始字节保存在payload中
+        """
+        payload = self._rrpc_payload(device_name, product_key, message_content, timeout)
+        response = await self.client._make_request(self.RRPC_ENDPOINT, payload)
+        self._decode_rrpc_response(response)
+        self._on_rrpc_response(response)
+        return response
+
+    async def send_custom_command(self,
+                                  device_name: str,
+                                  message_content: MessageContent) -> Dict:
+        """
+        下发自定义指令(异步下行，设备需订阅相应主题)
+
+        Args:
+            device_name: 设备编码
+            message_content: 指令内容，发送前进行Base64编码
+
+        Returns:
+            Dict: 指令下发结果
+        """
+        payload = self._custom_command_payload(device_name, message_content)
+        response = await self.client._make_request(self.CUSTOM_COMMAND_ENDPOINT, payload)
+        self._on_custom_command_response(response)
+        return response
@@ -0,0 +1,433 @@
+import json
+import logging
+import os
+import stat
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+import requests
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def authenticate(session: requests.Session,
+                 base_url: str,
+                 app_id: str,
+                 app_secret: str,
+                 logger=None,
+                 timeout: Optional[float] = None) -> str:
+    """
+    通过应用凭证获取token
+
+    Args:
+        session: 发送认证请求使用的HTTP会话
+        base_url: API基础URL
+        app_id: 应用ID
+        app_secret: 应用密钥
+        logger: 可选的日志记录器
+        timeout: 认证请求的超时时间(秒)，None表示不限制
+
+    Returns:
+        str: 认证令牌
+    """
+    logger = logger or logging.getLogger('iotsdk')
+
+    # 构建身份验证URL
+    auth_url = f"{base_url.rstrip('/')}/api/v1/oauth/auth"
+
+    # 准备认证请求
+    headers = {"Content-Type": "application/json"}
+    payload = {
+        "appId": app_id,
+        "appSecret": app_secret
+    }
+
+    logger.debug(f"发送认证请求: POST {auth_url}")
+
+    try:
+        # 发送认证请求
+        response = session.post(auth_url, headers=headers, data=json.dumps(payload), timeout=timeout)
+        response.raise_for_status()
+
+        # 解析响应
+        result = response.json()
+        logger.debug(f"收到认证响应: {result}")
+
+        # 检查响应是否成功
+        if not result.get("success") or result.get("code") != 200:
+            error_msg = result.get("errorMessage", "未知错误")
+            logger.error(f"认证失败: {error_msg}")
+            raise ValueError(f"认证失败: {error_msg}")
+
+        logger.info("认证成功，已获取token")
+        return result["data"]
+
+    except requests.exceptions.RequestException as e:
+        logger.error(f"认证请求错误: {e}")
+        raise
+    except json.JSONDecodeError as e:
+        logger.error(f"认证响应解析错误: {e}")
+        raise ValueError(f"无法解析认证响应为JSON: {e}")
+
+
+class FileTokenStore:
+    """
+    跨进程共享的token文件缓存
+
+    同一主机上的多个进程(如定时任务、命令行脚本)通过文件锁共享仍在有效期内的token，
+    避免每次启动都请求认证接口。缓存文件仅对当前用户可读写，权限过宽的文件会被忽略。
+    """
+
+    # 未指定路径时使用的环境变量
+    PATH_ENV = "IOTSDK_TOKEN_CACHE"
+
+    def __init__(self, path: Optional[str] = None, ttl: float = 3600, logger=None):
+        """
+        初始化token文件缓存
+
+        Args:
+            path: 缓存文件路径，默认读取环境变量IOTSDK_TOKEN_CACHE，
+                  未设置时为 ~/.iotsdk/tokens.json
+            ttl: 缓存token的最长有效期(秒)
+            logger: 可选的日志记录器
+        """
+        self.path = path or os.environ.get(self.PATH_ENV) or os.path.join(
+            os.path.expanduser("~"), ".iotsdk", "tokens.json")
+        self.ttl = ttl
+        self.logger = logger or logging.getLogger('iotsdk')
+
+    @staticmethod
+    def _key(base_url: str, app_id: str) -> str:
+        return f"{base_url.rstrip('/')}|{app_id}"
+
+    @contextmanager
+    def lock(self):
+        """获取跨进程的排他文件锁"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+        fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            os.close(fd)
+
+    def _read_all(self) -> Dict[str, Dict]:
+        """读取缓存文件，文件不存在、损坏或权限过宽时返回空缓存"""
+        try:
+            if fcntl is not None and os.stat(self.path).st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+                self.logger.warning(f"token缓存文件权限过宽，已忽略: {self.path}")
+                return {}
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"读取token缓存失败: {e}")
+            return {}
+
+    def _write_all(self, entries: Dict[str, Dict]) -> None:
+        """以仅当前用户可读写的权限原子替换缓存文件"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tokens-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def load(self, base_url: str, app_id: str) -> Optional[Tuple[str, float]]:
+        """
+        读取未过期的token，调用方需持有文件锁
+
+        Returns:
+            Optional[Tuple[str, float]]: (token, 过期时间的Unix时间戳)，无有效token时为None
+        """
+        entry = self._read_all().get(self._key(base_url, app_id))
+        if not entry or entry.get("expires_at", 0) <= time.time():
+            return None
+        return entry["token"], entry["expires_at"]
+
+    def save(self, base_url: str, app_id: str, token: str, expires_at: float) -> None:
+        """写入token并清理已过期的条目，调用方需持有文件锁"""
+        now = time.time()
+        entries = {
+            key: entry for key, entry in self._read_all().items()
+            if entry.get("expires_at", 0) > now
+        }
+        entries[self._key(base_url, app_id)] = {"token": token, "expires_at": expires_at}
+        self._write_all(entries)
+
+
+class TokenManager:
+    """
+    token生命周期管理
+
+    按(base_url, appId)缓存token，临近过期时提前刷新；认证失败需要重新获取时，
+    只有一个线程发起认证请求，其余线程等待其结果，避免并发重复认证。
+    """
+
+    _registry: Dict[Tuple[str, str], "TokenManager"] = {}
+    _registry_lock = threading.Lock()
+
+    # 换取token后该秒数内再被拒绝时，认为失败与token无关，不重新认证
+    MIN_REAUTH_INTERVAL = 5.0
+
+    def __init__(self,
+                 base_url: str,
+                 app_id: str,
+                 app_secret: str,
+                 session: Optional[requests.Session] = None,
+                 logger=None,
+                 token_ttl: Optional[float] = None,
+                 refresh_margin: float = 60,
+                 store: Optional[FileTokenStore] = None,
+                 timeout: Optional[float] = None):
+        """
+        初始化token管理器
+
+        Args:
+            base_url: API基础URL
+            app_id: 应用ID
+            app_secret: 应用密钥
+            session: 发送认证请求使用的HTTP会话
+            logger: 可选的日志记录器
+            token_ttl: token有效期(秒)，None表示未知，仅在认证失败时刷新
+            refresh_margin: 距离过期不足该秒数时提前刷新
+            store: 可选的跨进程token缓存，认证前先尝试读取其中的有效token
+            timeout: 认证请求的超时时间(秒)，None表示不限制；认证期间持有刷新标记和文件锁，
+                     建议设置，避免一次挂起的认证请求阻塞所有线程和进程
+        """
+        self.base_url = base_url.rstrip('/')
+        self.app_id = app_id
+        self.app_secret = app_secret
+        self.session = session or requests.Session()
+        self.logger = logger or logging.getLogger('iotsdk')
+        self.token_ttl = token_ttl
+        self.refresh_margin = refresh_margin
+        self.store = store
+        self.timeout = timeout
+
+        self._token = None
+        self._issued_at = 0.0
+        self._authenticated_at = None
+        self._expires_at = float("inf")
+        self._refresh_at = float("inf")
+        self._cond = threading.Condition()
+        self._refreshing = False
+        self._generation = 0
+        self._last_error = None
+
+    @classmethod
+    def for_credentials(cls, base_url: str, app_id: str, app_secret: str, **options) -> "TokenManager":
+        """
+        获取(base_url, appId)对应的共享token管理器，不存在时创建
+
+        Args:
+            base_url: API基础URL
+            app_id: 应用ID
+            app_secret: 应用密钥
+            **options: 创建新管理器时传递给构造函数的参数；管理器已存在时，
+                       其中不为None的设置通过configure更新到该管理器
+
+        Returns:
+            TokenManager: 同一进程内共享的token管理器
+        """
+        key = (base_url.rstrip('/'), app_id)
+        with cls._registry_lock:
+            manager = cls._registry.get(key)
+            if manager is None or manager.app_secret != app_secret:
+                manager = cls(base_url, app_id, app_secret, **options)
+                cls._registry[key] = manager
+            else:
+                manager.configure(**options)
+            return manager
+
+    def configure(self,
+                  session: Optional[requests.Session] = None,
+                  logger=None,
+                  token_ttl: Optional[float] = None,
+                  refresh_margin: Optional[float] = None,
+                  store: Optional[FileTokenStore] = None,
+                  timeout: Optional[float] = None) -> None:
+        """
+        更新共享管理器的设置，为None的参数保持原值
+
+        新的token_ttl、refresh_margin或store立即作用于当前token的过期和提前刷新时间。
+
+        Args:
+            session: 发送认证请求使用的HTTP会话
+            logger: 日志记录器
+            token_ttl: token有效期(秒)
+            refresh_margin: 距离过期不足该秒数时提前刷新
+            store: 跨进程token缓存
+            timeout: 认证请求的超时时间(秒)
+        """
+        with self._cond:
+            if session is not None:
+                self.session = session
+            if logger is not None:
+                self.logger = logger
+            if token_ttl is not None:
+                self.token_ttl = token_ttl
+            if refresh_margin is not None:
+                self.refresh_margin = refresh_margin
+            if store is not None:
+                self.store = store
+            if timeout is not None:
+                self.timeout = timeout
+
+            if self._token:
+                ttl = self._effective_ttl()
+                if ttl:
+                    self._expires_at = min(self._expires_at, self._issued_at + ttl)
+                self._refresh_at = self._expires_at - self._effective_margin()
+
+    def get_token(self) -> str:
+        """
+        获取当前有效的token
+
+        即将过期时由一个线程负责刷新，刷新期间其余线程继续使用尚未过期的旧token；
+        已过期或尚无token时所有线程等待刷新结果。
+
+        Returns:
+            str: 认证令牌
+        """
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if self._token and now < self._refresh_at:
+                    return self._token
+                if not self._refreshing:
+                    break
+                if self._token and now < self._expires_at:
+                    return self._token
+                self._wait_for_refresh()
+
+            self._refreshing = True
+            stale_token = self._token
+
+        return self._refresh(stale_token)
+
+    def invalidate(self, stale_token: Optional[str]) -> str:
+        """
+        报告token已失效并获取新token
+
+        如果其他线程已经换取了新token，直接返回新token而不重复认证；被拒绝的token是
+        MIN_REAUTH_INTERVAL秒内刚请求认证接口换取的，说明拒绝与token无关，原样返回该token。
+        从跨进程缓存读取的token可能已被服务端吊销，被拒绝时总是重新认证。
+
+        Args:
+            stale_token: 请求时使用的、被服务端拒绝的token
+
+        Returns:
+            str: 新的认证令牌
+        """
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if self._token and self._token != stale_token and now < self._expires_at:
+                    return self._token
+                if (self._token and self._token == stale_token and self._authenticated_at is not None
+                        and now - self._authenticated_at < self.MIN_REAUTH_INTERVAL):
+                    self.logger.warning("刚换取的token被拒绝，不再重新认证")
+                    return self._token
+                if not self._refreshing:
+                    break
+                self._wait_for_refresh()
+
+            self.logger.info("token已失效，重新认证")
+            self._refreshing = True
+
+        return self._refresh(stale_token)
+
+    def _wait_for_refresh(self) -> None:
+        """等待进行中的刷新完成，刷新失败时抛出相同的异常"""
+        generation = self._generation
+        while self._refreshing and generation == self._generation:
+            self._cond.wait()
+        if generation != self._generation and self._last_error is not None:
+            raise self._last_error
+
+    def _effective_ttl(self) -> Optional[float]:
+        """token有效期，同时配置时取token_ttl与缓存ttl中较小者"""
+        ttls = [ttl for ttl in (self.token_ttl, self.store.ttl if self.store else None) if ttl]
+        return min(ttls) if ttls else None
+
+    def _effective_margin(self) -> float:
+        """提前刷新的秒数，不超过有效期的一半，避免有效期较短时反复刷新"""
+        ttl = self._effective_ttl()
+        return min(self.refresh_margin, ttl / 2) if ttl else self.refresh_margin
+
+    def _fetch_token(self, stale_token: Optional[str]) -> Tuple[str, float, bool]:
+        """
+        获取新token、其剩余有效秒数以及是否刚请求认证接口换取
+
+        配置了跨进程缓存时在文件锁内先读取缓存，其他进程刚换取的token可以直接使用，
+        只有缓存中没有可用token时才请求认证接口并写回缓存。
+        """
+        ttl = self._effective_ttl()
+        if self.store is None:
+            token = authenticate(self.session, self.base_url, self.app_id, self.app_secret, self.logger,
+                                 self.timeout)
+            return token, ttl if ttl else float("inf"), True
+
+        with self.store.lock():
+            cached = self.store.load(self.base_url, self.app_id)
+            if cached is not None:
+                token, expires_at = cached
+                remaining = expires_at - time.time()
+                if token != stale_token and remaining > self._effective_margin():
+                    self.logger.debug("使用token缓存中的有效token")
+                    return token, remaining, False
+
+            token = authenticate(self.session, self.base_url, self.app_id, self.app_secret, self.logger,
+                                 self.timeout)
+            self.store.save(self.base_url, self.app_id, token, time.time() + ttl)
+            return token, ttl, True
+
+    def _refresh(self, stale_token: Optional[str] = None) -> str:
+        """获取新token并唤醒等待中的线程，调用前需已占用刷新标记"""
+        try:
+            token, remaining, authenticated = self._fetch_token(stale_token)
+        except BaseException as e:
+            # KeyboardInterrupt等也要释放刷新标记，等待中的线程随后自行重新刷新
+            with self._cond:
+                self._refreshing = False
+                self._generation += 1
+                self._last_error = e if isinstance(e, Exception) else None
+                self._cond.notify_all()
+            raise
+
+        with self._cond:
+            self._token = token
+            self._issued_at = time.monotonic()
+            # 只有刚请求认证接口换取的token才受MIN_REAUTH_INTERVAL保护，缓存中读取的token被拒绝时总是重新认证
+            self._authenticated_at = self._issued_at if authenticated else None
+            self._expires_at = self._issued_at + remaining
+            self._refresh_at = self._expires_at - self._effective_margin()
+            self._refreshing = False
+            self._generation += 1
+            self._last_error = None
+            self._cond.notify_all()
+        return token
@@ -0,0 +1,329 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+
+class _DetailEntry:
+    """缓存条目，设备编码和设备ID两个别名指向同一条目"""
+
+    __slots__ = ("device_name", "device_id", "response", "fetched_at")
+
+    def __init__(self, device_name: Optional[str], device_id: Optional[str], response: Dict):
+        self.device_name = device_name
+        self.device_id = device_id
+        self.response = response
+        self.fetched_at = time.monotonic()
+
+
+class DeviceDetailCache:
+    """
+    设备详情缓存
+
+    按设备编码和设备ID缓存get_device_detail的响应，两个别名共享同一条目；
+    条目数量超过上限时淘汰最久未使用的条目。可以为单个字段(如status)设置更短的有效期，
+    请求完整详情时以各字段中最短的有效期为准。
+    """
+
+    def __init__(self,
+                 maxsize: int = 10000,
+                 ttl: float = 300,
+                 field_ttls: Optional[Dict[str, float]] = None):
+        """
+        初始化设备详情缓存
+
+        Args:
+            maxsize: 最多缓存的设备数
+            ttl: 字段默认有效期(秒)
+            field_ttls: 按字段覆盖的有效期，如 {"status": 5}
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize必须大于0")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.field_ttls = dict(field_ttls or {})
+        self.hits = 0
+        self.misses = 0
+
+        self._by_name: Dict[str, _DetailEntry] = {}
+        self._by_id: Dict[str, _DetailEntry] = {}
+        self._lru: "OrderedDict[_DetailEntry, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def _max_age(self, fields: Iterable[str]) -> float:
+        """若干字段中最短的有效期"""
+        return min((self.field_ttls.get(field, self.ttl) for field in fields), default=self.ttl)
+
+    def _lookup(self, device_name: Optional[str], device_id: Optional[str]) -> Optional[_DetailEntry]:
+        entry = self._by_id.get(device_id) if device_id else None
+        if entry is None and device_name:
+            entry = self._by_name.get(device_name)
+        # 同时提供两个标识时必须指向同一设备
+        if entry is not None and device_name and device_id:
+            if entry.device_name != device_name or entry.device_id != device_id:
+                return None
+        return entry
+
+    def get(self,
+            device_name: Optional[str] = None,
+            device_id: Optional[str] = None,
+            fields: Optional[Iterable[str]] = None) -> Optional[Dict]:
+        """
+        读取缓存的设备详情
+
+        Args:
+            device_name: 设备编码，可选
+            device_id: 设备唯一标识，可选
+            fields: 调用方需要的字段，仅检查这些字段的有效期；None表示需要全部字段
+
+        Returns:
+            Optional[Dict]: 与get_device_detail结构相同的响应，未命中时为None
+        """
+        with self._lock:
+            entry = self._lookup(device_name, device_id)
+            if entry is not None:
+                data = entry.response["data"]
+                age = time.monotonic() - entry.fetched_at
+                if age <= self._max_age(data if fields is None else fields):
+                    self._lru.move_to_end(entry)
+                    self.hits += 1
+                    # 返回副本，调用方修改结果不影响缓存
+                    return copy.deepcopy(entry.response)
+                # 所有字段都已过期的条目直接删除
+                if age > max(self.ttl, *self.field_ttls.values()):
+                    self._remove(entry)
+            self.misses += 1
+            return None
+
+    def put(self, response: Dict) -> None:
+        """
+        写入get_device_detail的成功响应，缓存保存响应的副本
+
+        Args:
+            response: 设备详情响应
+        """
+        if not response or not response.get("success") or not isinstance(response.get("data"), dict):
+            return
+
+        data = response["data"]
+        device_name = data.get("deviceName")
+        device_id = data.get("deviceId")
+        if not device_name and not device_id:
+            return
+
+        with self._lock:
+            self._invalidate(device_name, device_id)
+            entry = _DetailEntry(device_name, device_id, copy.deepcopy(response))
+            if device_name:
+                self._by_name[device_name] = entry
+            if device_id:
+                self._by_id[device_id] = entry
+            self._lru[entry] = None
+
+            while len(self._lru) > self.maxsize:
+                self._remove(next(iter(self._lru)))
+
+    def invalidate(self, device_name: Optional[str] = None, device_id: Optional[str] = None) -> None:
+        """
+        删除设备的缓存条目，任一别名命中即同时删除两个别名
+
+        Args:
+            device_name: 设备编码，可选
+            device_id: 设备唯一标识，可选
+        """
+        with self._lock:
+            self._invalidate(device_name, device_id)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._by_name.clear()
+            self._by_id.clear()
+            self._lru.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        缓存统计
+
+        Returns:
+            Dict[str, int]: 命中次数、未命中次数和当前条目数
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._lru)}
+
+    def _invalidate(self, device_name: Optional[str], device_id: Optional[str]) -> None:
+        for entry in (self._by_name.get(device_name) if device_name else None,
+                      self._by_id.get(device_id) if device_id else None):
+            if entry is not None:
+                self._remove(entry)
+
+    def _remove(self, entry: _DetailEntry) -> None:
+        if entry.device_name and self._by_name.get(entry.device_name) is entry:
+            del self._by_name[entry.device_name]
+        if entry.device_id and self._by_id.get(entry.device_id) is entry:
+            del self._by_id[entry.device_id]
+        self._lru.pop(entry, None)
+
+
+class DeviceStatusCache:
+    """
+    设备状态缓存(stale-while-revalidate)
+
+    缓存时间未超过soft_ttl时直接返回；超过soft_ttl但未超过hard_ttl时立即返回旧状态，
+    同时在后台通过batchGetDeviceState批量刷新；超过hard_ttl或未缓存时同步查询。
+    后台刷新和同步查询都经过DeviceStatusLoader合并为批量请求。
+    """
+
+    def __init__(self,
+                 device_manager,
+                 soft_ttl: float = 5,
+                 hard_ttl: float = 60,
+                 maxsize: int = 100000,
+                 loader=None):
+        """
+        初始化设备状态缓存
+
+        Args:
+            device_manager: 设备管理器实例
+            soft_ttl: 超过该秒数后返回旧状态并在后台刷新
+            hard_ttl: 超过该秒数后必须同步查询
+            maxsize: 最多缓存的设备数，超出时淘汰最久未使用的设备
+            loader: 可选的DeviceStatusLoader，未提供时自动创建
+        """
+        if not 0 <= soft_ttl <= hard_ttl:
+            raise ValueError("需要满足 0 <= soft_ttl <= hard_ttl")
+
+        if loader is None:
+            from .loader import DeviceStatusLoader
+            loader = DeviceStatusLoader(device_manager)
+            self._owns_loader = True
+        else:
+            self._owns_loader = False
+
+        self.loader = loader
+        self.logger = device_manager.logger
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def get_device_status(self,
+                          device_name: Optional[str] = None,
+                          device_id: Optional[str] = None) -> Dict:
+        """
+        查询设备在线状态，优先返回缓存
+
+        Args:
+            device_name: 设备编码，可选
+            device_id: 设备唯一标识，可选，同时提供时按设备ID查询
+
+        Returns:
+            Dict: 与DeviceStatusLoader.get_device_status结构相同的响应
+        """
+        if not device_name and not device_id:
+            raise ValueError("设备编码(deviceName)和设备ID(deviceId)至少需要提供一个")
+
+        key = ("deviceId", device_id) if device_id else ("deviceName", device_name)
+
+        cached = None
+        refresh = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                response, fetched_at = entry
+                age = time.monotonic() - fetched_at
+                if age < self.hard_ttl:
+                    self._entries.move_to_end(key)
+                    cached = {**response, "data": dict(response["data"])}
+                    if age < self.soft_ttl:
+                        self.hits += 1
+                    else:
+                        self.stale_hits += 1
+                        refresh = key not in self._refreshing
+                        self._refreshing.add(key)
+            if cached is None:
+                self.misses += 1
+
+        if cached is not None:
+            if refresh:
+                self._refresh_in_background(key)
+            return cached
+
+        response = self.loader.get_device_status(device_name=None if device_id else device_name,
+                                                 device_id=device_id)
+        self._store(key, response)
+        return response
+
+    def invalidate(self, device_name: Optional[str] = None, device_id: Optional[str] = None) -> None:
+        """删除设备的缓存状态"""
+        with self._lock:
+            if device_name:
+                self._entries.pop(("deviceName", device_name), None)
+            if device_id:
+                self._entries.pop(("deviceId", device_id), None)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        缓存统计
+
+        Returns:
+            Dict[str, int]: 新鲜命中、过期命中、未命中次数和当前条目数
+        """
+        return {"hits": self.hits, "stale_hits": self.stale_hits,
+                "misses": self.misses, "size": len(self._entries)}
+
+    def close(self) -> None:
+        """停止自动创建的后台批量查询"""
+        if self._owns_loader:
+            self.loader.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _refresh_in_background(self, key: tuple) -> None:
+        """提交后台刷新，完成后更新缓存"""
+        field, value = key
+        try:
+            if field == "deviceId":
+                future = self.loader.load(device_id=value)
+            else:
+                future = self.loader.load(device_name=value)
+        except Exception as e:
+            # 提交失败(如加载器已关闭)时清除刷新标记，下次过期命中时重新尝试
+            with self._lock:
+                self._refreshing.discard(key)
+            self.logger.warning(f"提交后台刷新设备状态失败: {value} {e}")
+            return
+        future.add_done_callback(lambda f: self._on_refreshed(key, f))
+
+    def _on_refreshed(self, key: tuple, future) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            # 刷新失败时保留旧状态，直到hard_ttl到期后同步查询
+            self.logger.warning(f"后台刷新设备状态失败: {key[1]} {error}")
+            return
+        self._store(key, future.result())
+
+    def _store(self, key: tuple, response: Dict) -> None:
+        with self._lock:
+            self._entries[key] = (response, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
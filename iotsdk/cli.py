@@ -0,0 +1,428 @@
+"""
+iotsdk命令行工具
+
+在一个进程内复用同一个带连接池的客户端，从文件或标准输入流式读取设备列表，
+并发执行查询、注册和下发，每个设备输出一行NDJSON或CSV结果。
+
+用法:
+    iotsdk status dev-001 dev-002
+    iotsdk batch-status -i devices.txt --format csv -o status.csv
+    cat devices.txt | iotsdk register --product-key pk --checkpoint register.log
+    iotsdk rrpc --product-key pk --message-hex 01ff -i devices.txt --deadline 10
+    iotsdk downlink --message '{"cmd": "reboot"}' -i devices.txt
+
+凭证通过参数或环境变量 IOTSDK_BASE_URL、IOTSDK_TOKEN、IOTSDK_APP_ID、IOTSDK_APP_SECRET 提供。
+"""
+
+import argparse
+import base64
+import binascii
+import csv
+import json
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from . import __version__
+
+# 各子命令CSV输出的列，NDJSON输出完整记录
+STATUS_FIELDS = ["device", "success", "status", "timestamp", "errorMessage"]
+DETAIL_FIELDS = ["device", "success", "deviceId", "deviceName", "productKey",
+                 "nickName", "status", "errorMessage"]
+BATCH_STATUS_FIELDS = ["deviceId", "deviceName", "status", "timestamp", "lastOnlineTime"]
+REGISTER_FIELDS = ["productKey", "deviceName", "nickName", "deviceId", "deviceSecret",
+                   "success", "skipped", "recovered", "errorMessage"]
+RRPC_FIELDS = ["deviceName", "productKey", "success", "timedOut", "skipped",
+               "latencyMs", "payload", "errorMessage"]
+DOWNLINK_FIELDS = ["deviceName", "success", "errorMessage"]
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+class _RecordWriter:
+    """逐条写出NDJSON或CSV记录，可在多个线程中调用"""
+
+    def __init__(self, stream, output_format: str, fields: Sequence[str]):
+        self.stream = stream
+        self.output_format = output_format
+        self.total = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._csv = None
+        if output_format == "csv":
+            self._csv = csv.DictWriter(stream, fieldnames=list(fields), extrasaction="ignore")
+            self._csv.writeheader()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self.total += 1
+            if not record.get("success") and not record.get("skipped"):
+                self.failed += 1
+            if self._csv is not None:
+                self._csv.writerow(record)
+            else:
+                self.stream.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+
+def _iter_lines(args) -> Iterator[str]:
+    """命令行中给出的设备优先，否则逐行读取输入文件或标准输入，跳过空行和#注释"""
+    if args.devices:
+        yield from args.devices
+        return
+
+    stream = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    try:
+        for line in stream:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def _split_line(line: str) -> List[str]:
+    """按逗号拆分一行输入"""
+    return [field.strip() for field in line.split(",")]
+
+
+def _map_concurrent(func: Callable[[str], Dict[str, Any]],
+                    items: Iterable[str],
+                    concurrency: int) -> Iterator[Dict[str, Any]]:
+    """保持concurrency个调用在途，按完成顺序产出结果；输入惰性读取"""
+    source = iter(items)
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="iotsdk-cli") as executor:
+        in_flight = set()
+        try:
+            for item in source:
+                in_flight.add(executor.submit(func, item))
+                if len(in_flight) >= concurrency:
+                    break
+
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = next(source, None)
+                    if item is not None:
+                        in_flight.add(executor.submit(func, item))
+                    yield future.result()
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+
+def _read_message(args) -> Optional[bytes]:
+    """解析--message/--message-hex/--message-base64/--message-file"""
+    try:
+        if args.message is not None:
+            return args.message.encode("utf-8")
+        if args.message_hex is not None:
+            return bytes.fromhex(args.message_hex)
+        if args.message_base64 is not None:
+            return base64.b64decode(args.message_base64, validate=True)
+    except (ValueError, binascii.Error) as e:
+        raise ValueError(f"消息内容格式错误: {e}")
+    if args.message_file is not None:
+        if args.message_file == "-":
+            return sys.stdin.buffer.read()
+        with open(args.message_file, "rb") as f:
+            return f.read()
+    return None
+
+
+def _encode_reply(payload: Optional[bytes], encoding: str) -> Optional[str]:
+    """按--reply-encoding把RRPC响应字节转换为可输出的字符串"""
+    if payload is None:
+        return None
+    if encoding == "hex":
+        return payload.hex()
+    if encoding == "base64":
+        return base64.b64encode(payload).decode("ascii")
+    return payload.decode("utf-8", errors="replace")
+
+
+def _device_result(device: str, response: Dict) -> Dict[str, Any]:
+    """把单设备查询的响应整理为一条输出记录"""
+    record = {"device": device, "success": bool(response.get("success"))}
+    data = response.get("data")
+    if isinstance(data, dict):
+        for key, value in data.items():
+            record.setdefault(key, value)
+    if not record["success"]:
+        record["errorMessage"] = response.get("errorMessage", "未知错误")
+    return record
+
+
+def _device_error(device: str, error: Exception) -> Dict[str, Any]:
+    return {"device": device, "success": False, "errorMessage": str(error)}
+
+
+def _create_client(args, concurrency: int):
+    """根据参数或环境变量创建客户端，连接池大小不小于并发数"""
+    from .client import DEFAULT_POOL_MAXSIZE, IoTClient
+
+    options = {"pool_maxsize": max(concurrency, DEFAULT_POOL_MAXSIZE), "timeout": args.timeout}
+    if args.token:
+        return IoTClient(args.base_url, args.token, **options)
+
+    from .auth import FileTokenStore
+    token_store = FileTokenStore() if args.token_cache else None
+    return IoTClient.from_credentials(args.base_url, args.app_id, args.app_secret,
+                                      token_store=token_store, **options)
+
+
+def _run_status(args, device_manager, writer: _RecordWriter) -> None:
+    def query(device: str) -> Dict[str, Any]:
+        try:
+            if args.by_id:
+                response = device_manager.get_device_status(device_id=device)
+            else:
+                response = device_manager.get_device_status(device_name=device)
+        except Exception as e:
+            return _device_error(device, e)
+        return _device_result(device, response)
+
+    for record in _map_concurrent(query, _iter_lines(args), args.concurrency):
+        writer.write(record)
+
+
+def _run_detail(args, device_manager, writer: _RecordWriter) -> None:
+    def query(device: str) -> Dict[str, Any]:
+        try:
+            if args.by_id:
+                response = device_manager.get_device_detail(device_id=device)
+            else:
+                response = device_manager.get_device_detail(device_name=device)
+        except Exception as e:
+            return _device_error(device, e)
+        return _device_result(device, response)
+
+    for record in _map_concurrent(query, _iter_lines(args), args.concurrency):
+        writer.write(record)
+
+
+def _run_batch_status(args, device_manager, writer: _RecordWriter) -> None:
+    records = device_manager.iter_device_status(_iter_lines(args),
+                                                use_device_id=args.by_id,
+                                                concurrency=args.concurrency,
+                                                chunk_size=args.chunk_size)
+    for record in records:
+        record.setdefault("success", True)
+        writer.write(record)
+
+
+def _run_register(args, device_manager, writer: _RecordWriter) -> None:
+    def devices() -> Iterator[Dict[str, Any]]:
+        for line in _iter_lines(args):
+            fields = _split_line(line)
+            yield {"product_key": args.product_key,
+                   "device_name": fields[0],
+                   "nick_name": fields[1] if len(fields) > 1 and fields[1] else None}
+
+    results = device_manager.register_devices(devices(),
+                                              checkpoint=args.checkpoint,
+                                              concurrency=args.concurrency,
+                                              rate=args.rate,
+                                              recover_existing=args.recover_existing)
+    for result in results:
+        writer.write(result)
+
+
+def _run_rrpc(args, device_manager, writer: _RecordWriter) -> None:
+    message = _read_message(args)
+
+    def targets() -> Iterator[Sequence[str]]:
+        for line in _iter_lines(args):
+            fields = _split_line(line)
+            product_key = fields[1] if len(fields) > 1 and fields[1] else args.product_key
+            if not product_key:
+                raise ValueError(f"设备 {fields[0]} 没有指定产品唯一标识码，请使用--product-key")
+            yield fields[0], product_key
+
+    results = device_manager.send_rrpc_fanout(targets(), message,
+                                              deadline=args.deadline,
+                                              concurrency=args.concurrency,
+                                              timeout=args.rrpc_timeout)
+    for result in results:
+        payload = result.response.get("payload") if result.response else None
+        writer.write({
+            "deviceName": result.device_name,
+            "productKey": result.product_key,
+            "success": result.success,
+            "timedOut": result.timed_out,
+            "skipped": result.skipped,
+            "latencyMs": round(result.latency * 1000, 1),
+            "payload": _encode_reply(payload, args.reply_encoding),
+            "errorMessage": result.error,
+        })
+
+
+def _run_downlink(args, device_manager, writer: _RecordWriter) -> None:
+    from .downlink import CommandQueue
+
+    message = _read_message(args)
+
+    def on_done(device_name: str, future) -> None:
+        try:
+            response = future.result()
+        except Exception as e:
+            writer.write({"deviceName": device_name, "success": False, "errorMessage": str(e)})
+            return
+        success = device_manager.client.check_response(response)
+        writer.write({"deviceName": device_name, "success": success,
+                      "errorMessage": None if success else response.get("errorMessage", "未知错误")})
+
+    # 结果在工作线程中按完成顺序写出，队列满时submit阻塞，输入按发送速度读取
+    with CommandQueue(device_manager, workers=args.concurrency,
+                      maxsize=max(args.queue_size, args.concurrency)) as commands:
+        for line in _iter_lines(args):
+            device_name = _split_line(line)[0]
+            future = commands.submit(device_name, message)
+            future.add_done_callback(lambda f, name=device_name: on_done(name, f))
+
+
+def _add_input_arguments(parser: argparse.ArgumentParser, by_id: bool = False) -> None:
+    parser.add_argument("devices", nargs="*", help="设备列表，未指定时从--input读取")
+    parser.add_argument("-i", "--input", default="-",
+                        help="设备列表文件，每行一个设备，默认读取标准输入")
+    if by_id:
+        parser.add_argument("--by-id", action="store_true", help="输入为设备ID而不是设备编码")
+
+
+def _add_message_arguments(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--message", help="消息内容，按UTF-8编码发送")
+    group.add_argument("--message-hex", help="十六进制表示的二进制消息内容")
+    group.add_argument("--message-base64", help="Base64表示的二进制消息内容")
+    group.add_argument("--message-file", help="从文件读取原始字节作为消息内容，-表示标准输入")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    构建命令行参数解析器
+
+    Returns:
+        argparse.ArgumentParser: 包含全部子命令的解析器
+    """
+    parser = argparse.ArgumentParser(prog="iotsdk", description="IoT云平台命令行工具")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    parser.add_argument("--base-url", default=os.environ.get("IOTSDK_BASE_URL"),
+                        help="API基础URL，默认读取环境变量IOTSDK_BASE_URL")
+    parser.add_argument("--token", default=os.environ.get("IOTSDK_TOKEN"),
+                        help="认证令牌，默认读取环境变量IOTSDK_TOKEN")
+    parser.add_argument("--app-id", default=os.environ.get("IOTSDK_APP_ID"),
+                        help="应用ID，未提供token时使用，默认读取环境变量IOTSDK_APP_ID")
+    parser.add_argument("--app-secret", default=os.environ.get("IOTSDK_APP_SECRET"),
+                        help="应用密钥，默认读取环境变量IOTSDK_APP_SECRET")
+    parser.add_argument("--token-cache", action="store_true",
+                        help="使用跨进程token文件缓存，路径见环境变量IOTSDK_TOKEN_CACHE")
+    parser.add_argument("--timeout", type=float, default=10.0, help="HTTP请求超时时间(秒)")
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson", help="输出格式")
+    parser.add_argument("-o", "--output", default="-", help="输出文件，默认为标准输出")
+    parser.add_argument("-v", "--verbose", action="count", default=0,
+                        help="输出日志，-v为INFO，-vv为DEBUG")
+
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+    subparsers.required = True
+
+    status = subparsers.add_parser("status", help="逐个查询设备在线状态")
+    _add_input_arguments(status, by_id=True)
+    status.add_argument("--concurrency", type=int, default=16, help="同时在途的请求数")
+    status.set_defaults(func=_run_status, fields=STATUS_FIELDS)
+
+    detail = subparsers.add_parser("detail", help="逐个查询设备详情")
+    _add_input_arguments(detail, by_id=True)
+    detail.add_argument("--concurrency", type=int, default=16, help="同时在途的请求数")
+    detail.set_defaults(func=_run_detail, fields=DETAIL_FIELDS)
+
+    batch_status = subparsers.add_parser("batch-status", help="批量查询任意数量设备的运行状态")
+    _add_input_arguments(batch_status, by_id=True)
+    batch_status.add_argument("--concurrency", type=int, default=4, help="同时在途的批量请求数")
+    batch_status.add_argument("--chunk-size", type=int, default=100, help="每个批量请求的设备数，最多100")
+    batch_status.set_defaults(func=_run_batch_status, fields=BATCH_STATUS_FIELDS)
+
+    register = subparsers.add_parser("register", help="批量注册设备，每行为 设备编码[,显示名称]")
+    _add_input_arguments(register)
+    register.add_argument("--product-key", required=True, help="产品唯一标识码")
+    register.add_argument("--checkpoint", help="检查点日志路径，重新运行时跳过已注册的设备")
+    register.add_argument("--concurrency", type=int, default=8, help="同时在途的注册请求数")
+    register.add_argument("--rate", type=float, help="每秒最多发送的注册请求数")
+    register.add_argument("--recover-existing", action="store_true",
+                          help="注册失败时，把同一产品下已存在的设备视为成功并补全设备密钥")
+    register.set_defaults(func=_run_register, fields=REGISTER_FIELDS)
+
+    rrpc = subparsers.add_parser("rrpc", help="在总时限内向多个设备发送RRPC消息，每行为 设备编码[,产品唯一标识码]")
+    _add_input_arguments(rrpc)
+    _add_message_arguments(rrpc)
+    rrpc.add_argument("--product-key", help="产品唯一标识码，输入行中未指定时使用")
+    rrpc.add_argument("--deadline", type=float, default=30.0, help="总时限(秒)")
+    rrpc.add_argument("--rrpc-timeout", type=int, default=5000, help="单个设备的RRPC超时时间(毫秒)")
+    rrpc.add_argument("--concurrency", type=int, default=32, help="同时在途的RRPC请求数")
+    rrpc.add_argument("--reply-encoding", choices=("text", "hex", "base64"), default="text",
+                      help="设备响应内容的输出方式")
+    rrpc.set_defaults(func=_run_rrpc, fields=RRPC_FIELDS)
+
+    downlink = subparsers.add_parser("downlink", help="向多个设备下发自定义指令")
+    _add_input_arguments(downlink)
+    _add_message_arguments(downlink)
+    downlink.add_argument("--concurrency", type=int, default=8, help="发送线程数")
+    downlink.add_argument("--queue-size", type=int, default=10000, help="排队指令数上限")
+    downlink.set_defaults(func=_run_downlink, fields=DOWNLINK_FIELDS)
+
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    命令行入口
+
+    Args:
+        argv: 命令行参数，默认为sys.argv[1:]
+
+    Returns:
+        int: 退出状态，全部成功为0，存在失败的设备为1，参数或请求错误为2
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if not args.base_url:
+        parser.error("需要提供--base-url或环境变量IOTSDK_BASE_URL")
+    if not args.token and not (args.app_id and args.app_secret):
+        parser.error("需要提供--token，或同时提供--app-id和--app-secret")
+    if args.concurrency < 1:
+        parser.error("--concurrency必须大于0")
+
+    # 库本身不配置日志，由命令行决定输出级别，日志写到标准错误，不影响结果输出
+    level = logging.WARNING if args.verbose == 0 else logging.INFO if args.verbose == 1 else logging.DEBUG
+    logging.basicConfig(level=level, format=LOG_FORMAT, stream=sys.stderr)
+    logger = logging.getLogger('iotsdk')
+
+    from .device import DeviceManager
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    writer = _RecordWriter(output, args.format, args.fields)
+    try:
+        with _create_client(args, args.concurrency) as client:
+            args.func(args, DeviceManager(client), writer)
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # 下游(如head)提前关闭管道时静默退出，避免解释器退出时再次刷新标准输出报错
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except Exception as e:
+        logger.error(f"{args.command} 执行失败: {e}")
+        return 2
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(f"{args.command}: 共 {writer.total} 个设备，失败 {writer.failed} 个", file=sys.stderr)
+    return 1 if writer.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
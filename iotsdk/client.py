@@ -1,13 +1,88 @@
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import logging
-from typing import Dict, List, Optional, Union, Any
+import queue
+import threading
+import time
+from urllib.parse import urlsplit
+from typing import Dict, List, Optional, Tuple, Union, Any
 
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖：pip install iotsdk[speedups]
+    orjson = None
+
+from .auth import FileTokenStore, TokenManager
+from .metrics import Metrics, RequestTiming
+from .ratelimit import AdaptiveConcurrencyLimiter, TokenBucket
+from .retry import (CircuitBreaker, CircuitOpenError, RetryPolicy,
+                    DEFAULT_RETRY_POLICIES, NO_RETRY, parse_retry_after)
+
+# 连接池默认配置
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+
+
+def create_session(pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                   pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                   pool_block: bool = False) -> requests.Session:
+    """
+    创建带连接池的HTTP会话
+
+    Args:
+        pool_connections: 缓存的主机连接池数量
+        pool_maxsize: 每个主机保留的最大连接数
+        pool_block: 连接数达到上限时是否阻塞等待，而不是临时新建连接
+
+    Returns:
+        requests.Session: 复用keep-alive连接的会话
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections,
+                          pool_maxsize=pool_maxsize,
+                          pool_block=pool_block)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class JSONCodec:
+    """
+    基于标准库json的编解码器
+
+    请求体直接编码为UTF-8字节，响应从原始字节解码，不经过requests的字符集检测
+    """
+    
+    name = "json"
+    
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """基于orjson的编解码器，解码失败时抛出的异常同样是json.JSONDecodeError的子类"""
+    
+    name = "orjson"
+    
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+    
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+def get_default_codec() -> JSONCodec:
+    """
+    获取默认编解码器
+    
+    Returns:
+        JSONCodec: 已安装orjson时使用orjson，否则使用标准库json
+    """
+    return OrjsonCodec() if orjson is not None else JSONCodec()
 
 
 class IoTClient:
@@ -16,7 +91,25 @@ class IoTClient:
     提供与IoT云平台交互的基础功能
     """
     
-    def __init__(self, base_url: str, token: str, logger=None):
+    # 视为token失效的HTTP状态码或响应code；403表示没有权限，重新认证无济于事
+    AUTH_FAILURE_CODES = (401,)
+    
+    def __init__(self, base_url: str, token: str, logger=None,
+                 session: Optional[requests.Session] = None,
+                 pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 pool_block: bool = False,
+                 pool_idle_timeout: Optional[float] = None,
+                 token_manager: Optional[TokenManager] = None,
+                 retry_policies: Optional[Dict[str, RetryPolicy]] = None,
+                 default_retry_policy: RetryPolicy = NO_RETRY,
+                 circuit_breaker_threshold: Optional[int] = None,
+                 circuit_breaker_timeout: float = 30.0,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+                 timeout: Optional[float] = None,
+                 codec: Optional[JSONCodec] = None,
+                 metrics: Optional[Metrics] = None):
         """
         初始化IoT客户端
 
@@ -24,8 +117,25 @@ class IoTClient:
             base_url: API基础URL
             token: 认证令牌
             logger: 可选的日志记录器
+            session: 可选的HTTP会话，未提供时自动创建带连接池的会话
+            pool_connections: 缓存的主机连接池数量
+            pool_maxsize: 每个主机保留的最大连接数
+            pool_block: 连接数达到上限时是否阻塞等待
+            pool_idle_timeout: 某个主机空闲超过该秒数后关闭其连接池中的空闲连接，None表示不回收
+            token_manager: 可选的token管理器，提供时token由其自动刷新
+            retry_policies: 按接口路径覆盖的重试策略，与默认策略合并；
+                            默认查询类接口最多尝试3次，注册、下行等写操作不重试
+            default_retry_policy: 未单独配置的接口使用的重试策略，默认不重试
+            circuit_breaker_threshold: 单个接口连续失败多少次后熔断，None表示不启用
+            circuit_breaker_timeout: 熔断后经过多少秒允许探测请求
+            rate_limiter: 可选的令牌桶限流器，多个客户端可共用同一实例
+            concurrency_limiter: 可选的自适应并发限制，根据延迟、限流和超时调整并发上限
+            timeout: 单次HTTP请求的超时时间(秒)，None表示不限制
+            codec: JSON编解码器，默认优先使用orjson
+            metrics: 可选的请求指标，未提供时不做任何计时
         """
         self.base_url = base_url.rstrip('/')
+        self.token_manager = token_manager
         self.token = token
         self.logger = logger or logging.getLogger('iotsdk')
         
@@ -34,19 +144,68 @@ class IoTClient:
             raise ValueError("无效的base_url")
         if not self.token:
             raise ValueError("无效的token")
+        
+        # 连接池：所有DeviceManager方法共用同一会话
+        self._owns_session = session is None
+        self.session = session or create_session(pool_connections, pool_maxsize, pool_block)
+        self.pool_idle_timeout = pool_idle_timeout
+        # 主机(scheme://host:port) -> 最近一次请求的时间
+        self._pool_last_used: Dict[str, float] = {}
+        self._pool_lock = threading.Lock()
+        
+        # 重试与熔断：每个接口独立配置，熔断器按接口惰性创建
+        self.retry_policies = dict(DEFAULT_RETRY_POLICIES)
+        if retry_policies:
+            self.retry_policies.update(retry_policies)
+        self.default_retry_policy = default_retry_policy
+        self.circuit_breaker_threshold = circuit_breaker_threshold
+        self.circuit_breaker_timeout = circuit_breaker_timeout
+        self._circuit_breakers: Dict[str, CircuitBreaker] = {}
+        
+        # 限流：所有经过_make_request的请求共用
+        self.rate_limiter = rate_limiter
+        self.concurrency_limiter = concurrency_limiter
+        self.timeout = timeout
+        
+        self.codec = codec or get_default_codec()
+        self.metrics = metrics
             
         self.logger.info(f"IoT客户端已初始化: {self.base_url}")
     
+    @property
+    def token(self) -> str:
+        """当前认证令牌，使用token管理器时自动获取有效token"""
+        if self.token_manager is not None:
+            return self.token_manager.get_token()
+        return self._token
+    
+    @token.setter
+    def token(self, value: str) -> None:
+        self._token = value
+    
     @classmethod
-    def from_credentials(cls, base_url: str, app_id: str, app_secret: str, logger=None):
+    def from_credentials(cls, base_url: str, app_id: str, app_secret: str, logger=None,
+                         session: Optional[requests.Session] = None,
+                         token_ttl: Optional[float] = None,
+                         refresh_margin: Optional[float] = None,
+                         token_store: Optional[FileTokenStore] = None,
+                         **client_options):
         """
         通过应用凭证初始化IoT客户端
 
+        同一进程内相同(base_url, appId)的客户端共享token，token临近过期时提前刷新，
+        请求因token失效被拒绝时自动重新认证并重试该请求。
+
         Args:
             base_url: API基础URL
             app_id: 应用ID
             app_secret: 应用密钥
             logger: 可选的日志记录器
+            session: 可选的HTTP会话，认证请求与后续请求共用
+            token_ttl: token有效期(秒)，None表示仅在认证失败时刷新
+            refresh_margin: 距离过期不足该秒数时提前刷新，默认60秒
+            token_store: 可选的跨进程token缓存，同一主机上的进程共享有效token
+            **client_options: 传递给构造函数的连接池等配置，其中的timeout同时用作认证请求的超时时间
 
         Returns:
             IoTClient: 初始化后的客户端实例
@@ -54,52 +213,41 @@ class IoTClient:
         logger = logger or logging.getLogger('iotsdk')
         logger.info("通过应用凭证初始化IoT客户端")
         
-        # 构建身份验证URL
-        auth_url = f"{base_url.rstrip('/')}/api/v1/oauth/auth"
+        # 认证请求与后续API调用共用同一连接池
+        owns_session = session is None
+        if owns_session:
+            session = create_session(
+                client_options.get("pool_connections", DEFAULT_POOL_CONNECTIONS),
+                client_options.get("pool_maxsize", DEFAULT_POOL_MAXSIZE),
+                client_options.get("pool_block", False)
+            )
         
-        # 准备认证请求
-        headers = {"Content-Type": "application/json"}
-        payload = {
-            "appId": app_id,
-            "appSecret": app_secret
-        }
-        
-        logger.debug(f"发送认证请求: POST {auth_url}")
-        logger.debug(f"认证请求体: {payload}")
+        # 同一(base_url, appId)已有token管理器时，这里显式指定的设置会更新到共享的管理器上
+        manager_options = {"session": session, "logger": logger,
+                           "token_ttl": token_ttl, "store": token_store,
+                           "timeout": client_options.get("timeout")}
+        if refresh_margin is not None:
+            manager_options["refresh_margin"] = refresh_margin
+        token_manager = TokenManager.for_credentials(base_url, app_id, app_secret, **manager_options)
         
         try:
-            # 发送认证请求
-            response = requests.post(auth_url, headers=headers, data=json.dumps(payload))
-            response.raise_for_status()
-            
-            # 解析响应
-            result = response.json()
-            logger.debug(f"收到认证响应: {result}")
-            
-            # 检查响应是否成功
-            if not result.get("success") or result.get("code") != 200:
-                error_msg = result.get("errorMessage", "未知错误")
-                logger.error(f"认证失败: {error_msg}")
-                raise ValueError(f"认证失败: {error_msg}")
-            
-            # 获取token并创建客户端实例
-            token = result["data"]
-            logger.info("认证成功，已获取token")
-            
-            return cls(base_url=base_url, token=token, logger=logger)
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"认证请求错误: {e}")
+            token = token_manager.get_token()
+        except Exception:
+            if owns_session:
+                session.close()
             raise
-        except json.JSONDecodeError as e:
-            logger.error(f"认证响应解析错误: {e}")
-            raise ValueError(f"无法解析认证响应为JSON: {e}")
+            
+        client = cls(base_url=base_url, token=token, logger=logger, session=session,
+                     token_manager=token_manager, **client_options)
+        client._owns_session = owns_session
+        return client
         
     def _make_request(self, 
                      endpoint: str, 
                      payload: Dict = None, 
                      method: str = 'POST',
-                     additional_headers: Dict = None) -> Dict:
+                     additional_headers: Dict = None,
+                     timeout: Optional[float] = None) -> Dict:
         """
         发送API请求的通用方法
 
@@ -108,6 +256,7 @@ class IoTClient:
             payload: 请求体数据
             method: HTTP方法(默认POST)
             additional_headers: 附加的请求头
+            timeout: 本次请求的HTTP超时时间(秒)，默认使用客户端的timeout
 
         Returns:
             Dict: API响应结果
@@ -126,37 +275,273 @@ class IoTClient:
             headers.update(additional_headers)
             
         # 准备请求数据
-        payload_data = json.dumps(payload) if payload else None
+        payload_data = self.codec.dumps(payload) if payload else None
+        
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"发送请求: {method} {url}")
+            self.logger.debug(f"请求头: {headers}")
+            self.logger.debug(f"请求体: {payload_data}")
         
-        self.logger.debug(f"发送请求: {method} {url}")
-        self.logger.debug(f"请求头: {headers}")
-        self.logger.debug(f"请求体: {payload_data}")
+        self._evict_idle_connections(url)
         
         try:
-            # 发送请求
-            if method.upper() == 'POST':
-                response = requests.post(url, headers=headers, data=payload_data)
-            elif method.upper() == 'GET':
-                response = requests.get(url, headers=headers, params=payload)
-            else:
-                raise ValueError(f"不支持的HTTP方法: {method}")
-                
-            # 检查HTTP状态码
-            response.raise_for_status()
-            
-            # 解析响应
-            result = response.json()
-            
-            self.logger.debug(f"收到响应: {result}")
-            
-            return result
+            return self._request_with_retry(endpoint, method, url, headers, payload, payload_data,
+                                            self.timeout if timeout is None else timeout)
             
         except requests.exceptions.RequestException as e:
             self.logger.error(f"请求错误: {e}")
             raise
+        except CircuitOpenError as e:
+            self.logger.error(f"请求错误: {endpoint} {e}")
+            raise
         except json.JSONDecodeError as e:
             self.logger.error(f"JSON解析错误: {e}")
             raise ValueError(f"无法解析响应为JSON: {e}")
+    
+    def _request_with_retry(self, endpoint: str, method: str, url: str, headers: Dict,
+                            payload: Optional[Dict], payload_data: Optional[bytes],
+                            timeout: Optional[float] = None) -> Dict:
+        """按接口的重试策略发送请求，熔断期间直接抛出CircuitOpenError"""
+        policy = self.retry_policies.get(endpoint, self.default_retry_policy)
+        can_retry = policy.allows_retry(headers)
+        breaker = self._get_circuit_breaker(endpoint)
+        delay = policy.base_delay
+        attempt = 1
+        
+        while True:
+            if breaker is not None:
+                breaker.before_call()
+                
+            try:
+                result = self._request_once(method, url, headers, payload, payload_data, timeout, endpoint)
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout,
+                    requests.exceptions.HTTPError) as e:
+                response = e.response
+                status = response.status_code if response is not None else None
+                if self.metrics is not None:
+                    self.metrics.observe_error(endpoint, status)
+                
+                # 连接失败、超时和5xx计为接口故障；4xx说明服务本身可用
+                if breaker is not None:
+                    if status is None or status >= 500:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                        
+                retryable = status is None or status in policy.retry_statuses
+                if not (can_retry and retryable and attempt < policy.max_attempts):
+                    raise
+                    
+                retry_after = parse_retry_after(response.headers.get("Retry-After")) if response is not None else None
+                delay = policy.next_delay(delay, retry_after)
+                if delay is None:
+                    raise
+                    
+                self.logger.warning(f"请求失败: {e}，{delay:.2f}秒后进行第{attempt}次重试")
+                if self.metrics is not None:
+                    self.metrics.observe_retry(endpoint)
+                time.sleep(delay)
+                attempt += 1
+                continue
+            except Exception:
+                # 响应体不完整、无法解析等其他错误同样计为接口故障，释放半开状态的探测名额
+                if self.metrics is not None:
+                    self.metrics.observe_error(endpoint)
+                if breaker is not None:
+                    breaker.record_failure()
+                raise
+            except BaseException:
+                # 调用方中断(如KeyboardInterrupt)不反映接口状态，只归还探测名额
+                if breaker is not None:
+                    breaker.release_probe()
+                raise
+                
+            if breaker is not None:
+                breaker.record_success()
+            return result
+    
+    def _request_once(self, method: str, url: str, headers: Dict,
+                      payload: Optional[Dict], payload_data: Optional[bytes],
+                      timeout: Optional[float] = None, endpoint: Optional[str] = None) -> Dict:
+        """发送一次请求，token失效时重新认证并重放"""
+        token = self.token
+        headers["token"] = token
+        
+        response, http_time = self._send(method, url, headers, payload, payload_data, timeout)
+        result = self._parse_response(response, endpoint, method, payload_data, http_time)
+        
+        # token失效时由token管理器统一重新认证，然后重放本次请求
+        if self.token_manager is not None and self._is_auth_failure(response, result):
+            new_token = self.token_manager.invalidate(token)
+            # 刚换取的token同样被拒绝时token管理器不会重新认证，也就不必重放
+            if new_token != token:
+                headers["token"] = new_token
+                response, http_time = self._send(method, url, headers, payload, payload_data, timeout)
+                result = self._parse_response(response, endpoint, method, payload_data, http_time)
+            
+        # 检查HTTP状态码
+        response.raise_for_status()
+        
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"收到响应: {result}")
+        
+        return result
+    
+    def _get_circuit_breaker(self, endpoint: str) -> Optional[CircuitBreaker]:
+        """获取接口对应的熔断器，未启用熔断时返回None"""
+        if self.circuit_breaker_threshold is None:
+            return None
+        breaker = self._circuit_breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._circuit_breakers.setdefault(
+                endpoint, CircuitBreaker(self.circuit_breaker_threshold, self.circuit_breaker_timeout))
+        return breaker
+    
+    def _send(self, method: str, url: str, headers: Dict,
+              payload: Optional[Dict], payload_data: Optional[bytes],
+              timeout: Optional[float] = None) -> Tuple[requests.Response, float]:
+        """发送一次HTTP请求，先经过限流和并发控制；返回响应和HTTP请求耗时(秒)"""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+            
+        limiter = self.concurrency_limiter
+        if limiter is None:
+            start = time.monotonic()
+            response = self._send_http(method, url, headers, payload, payload_data, timeout)
+            return response, time.monotonic() - start
+            
+        limiter.acquire()
+        start = time.monotonic()
+        try:
+            response = self._send_http(method, url, headers, payload, payload_data, timeout)
+        except requests.exceptions.Timeout:
+            limiter.release(time.monotonic() - start, limiter.TIMEOUT)
+            raise
+        except BaseException:
+            limiter.release(time.monotonic() - start, limiter.ERROR)
+            raise
+            
+        if response.status_code == 429:
+            outcome = limiter.THROTTLED
+        elif response.status_code >= 500:
+            outcome = limiter.ERROR
+        else:
+            outcome = limiter.SUCCESS
+        latency = time.monotonic() - start
+        limiter.release(latency, outcome)
+        return response, latency
+    
+    def _send_http(self, method: str, url: str, headers: Dict,
+                   payload: Optional[Dict], payload_data: Optional[bytes],
+                   timeout: Optional[float] = None) -> requests.Response:
+        """发送HTTP请求（复用连接池中的keep-alive连接）"""
+        if method.upper() == 'POST':
+            return self.session.post(url, headers=headers, data=payload_data, timeout=timeout)
+        elif method.upper() == 'GET':
+            return self.session.get(url, headers=headers, params=payload, timeout=timeout)
+        else:
+            raise ValueError(f"不支持的HTTP方法: {method}")
+    
+    def _parse_response(self, response: requests.Response, endpoint: Optional[str] = None,
+                        method: str = 'POST', payload_data: Optional[bytes] = None,
+                        http_time: float = 0.0) -> Optional[Dict]:
+        """从原始字节解析JSON响应；HTTP错误响应的响应体可能不是JSON，此时返回None"""
+        if self.metrics is None:
+            return self._decode_response(response)
+            
+        start = time.monotonic()
+        try:
+            return self._decode_response(response)
+        finally:
+            ttfb = response.elapsed.total_seconds()
+            self.metrics.observe_request(RequestTiming(
+                endpoint=endpoint or response.url,
+                method=method,
+                status=response.status_code,
+                bytes_sent=len(payload_data) if payload_data else 0,
+                bytes_received=len(response.content),
+                ttfb=ttfb,
+                body=max(0.0, http_time - ttfb),
+                parse=time.monotonic() - start
+            ))
+    
+    def _decode_response(self, response: requests.Response) -> Optional[Dict]:
+        if not response.ok:
+            try:
+                return self.codec.loads(response.content)
+            except ValueError:
+                return None
+        return self.codec.loads(response.content)
+    
+    def _is_auth_failure(self, response: requests.Response, result: Optional[Dict]) -> bool:
+        """判断请求是否因token失效被拒绝"""
+        if response.status_code in self.AUTH_FAILURE_CODES:
+            return True
+        return isinstance(result, dict) and result.get("code") in self.AUTH_FAILURE_CODES
+    
+    def _evict_idle_connections(self, url: str) -> None:
+        """
+        请求的主机空闲时间超过pool_idle_timeout时关闭该主机连接池中的空闲连接，下次请求重新建立
+
+        空闲时间按主机分别统计，只回收该主机的空闲连接；连接池本身保留，
+        其他线程正在使用的连接不受影响，归还后照常复用。
+        """
+        if self.pool_idle_timeout is None:
+            return
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        
+        with self._pool_lock:
+            now = time.monotonic()
+            last_used = self._pool_last_used.get(origin)
+            self._pool_last_used[origin] = now
+            if last_used is None or now - last_used <= self.pool_idle_timeout:
+                return
+            
+            self.logger.debug(f"连接池空闲 {now - last_used:.1f} 秒，回收空闲连接: {origin}")
+            port = parts.port or (443 if parts.scheme == "https" else 80)
+            pools = self.session.get_adapter(url).poolmanager.pools
+            # 同一主机可能因TLS等参数不同对应多个连接池
+            for key in pools.keys():
+                if (key.key_scheme, key.key_host, key.key_port) != (parts.scheme, parts.hostname, port):
+                    continue
+                pool = pools.get(key)
+                if pool is not None:
+                    self._close_idle_connections(pool)
+    
+    @staticmethod
+    def _close_idle_connections(pool) -> None:
+        """关闭urllib3连接池中的空闲连接"""
+        # urllib3在pool.pool中保存空闲连接，空位为None；取出后放回同样数量的空位，池容量不变
+        idle = pool.pool
+        if idle is None:
+            return
+        taken = 0
+        while True:
+            try:
+                conn = idle.get(block=False)
+            except queue.Empty:
+                break
+            taken += 1
+            if conn is not None:
+                conn.close()
+        try:
+            for _ in range(taken):
+                idle.put(None, block=False)
+        except queue.Full:
+            pass
+    
+    def close(self) -> None:
+        """关闭客户端持有的连接池"""
+        if self._owns_session:
+            self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
             
     def check_response(self, response: Dict) -> bool:
         """
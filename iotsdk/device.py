@@ -1,59 +1,144 @@
-from typing import Dict, List, Optional, Union, Any
-from datetime import datetime
+from typing import Dict, List, Optional, Union, Any, Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import binascii
 import logging
 
+from .cache import DeviceDetailCache
 from .client import IoTClient
+from .fanout import RRPCResult, rrpc_fanout
+from .models import DeviceStatus, RRPCPayload
+from .provisioning import RegistrationLog, register_devices
+from .utils import (format_offline_duration, format_timestamp, iter_chunks,
+                    normalize_device_status)
 
-class DeviceManager:
-    """设备管理模块，提供设备相关操作"""
-    
-    def __init__(self, client: IoTClient):
+# RRPC和自定义指令支持的消息内容类型
+MessageContent = Union[str, bytes, bytearray, memoryview]
+
+
+class _DeviceManagerBase:
+    """同步与异步设备管理器共用的请求构建和响应处理逻辑"""
+
+    REGISTER_ENDPOINT = "/api/v1/quickdevice/register"
+    DETAIL_ENDPOINT = "/api/v1/quickdevice/detail"
+    STATUS_ENDPOINT = "/api/v1/quickdevice/status"
+    BATCH_STATUS_ENDPOINT = "/api/v1/quickdevice/batchGetDeviceState"
+    RRPC_ENDPOINT = "/api/v1/device/rrpc"
+    CUSTOM_COMMAND_ENDPOINT = "/api/v1/device/down/record/add/custom"
+
+    # 批量状态查询单次请求的设备数量上限
+    BATCH_STATUS_LIMIT = 100
+
+    def __init__(self, client):
         """
         初始化设备管理模块
-        
+
         Args:
             client: IoT客户端实例
         """
         self.client = client
         self.logger = client.logger
-        
-    def register_device(self, 
-                        product_key: str, 
-                        device_name: Optional[str] = None, 
-                        nick_name: Optional[str] = None) -> Dict:
-        """
-        注册设备
-        
-        Args:
-            product_key: 产品唯一标识码
-            device_name: 设备标识码，可选，若未提供则自动生成
-            nick_name: 设备显示名称，可选
-            
-        Returns:
-            Dict: 注册结果，包含设备ID和密钥等信息
-        """
-        endpoint = "/api/v1/quickdevice/register"
-        
-        # 构建请求体
+
+    @staticmethod
+    def _register_payload(product_key: str,
+                          device_name: Optional[str] = None,
+                          nick_name: Optional[str] = None) -> Dict:
+        """构建设备注册请求体"""
         payload = {
             "productKey": product_key
         }
-        
+
         # 添加可选参数
         if device_name:
             payload["deviceName"] = device_name
-            
+
         if nick_name:
             payload["nickName"] = nick_name
-            
-        # 发送请求
-        response = self.client._make_request(endpoint, payload)
-        
-        # 检查结果并格式化输出
+
+        return payload
+
+    @staticmethod
+    def _device_payload(device_name: Optional[str] = None,
+                        device_id: Optional[str] = None) -> Dict:
+        """构建按设备编码或设备ID查询的请求体"""
+        # 参数验证
+        if not device_name and not device_id:
+            raise ValueError("设备编码(deviceName)和设备ID(deviceId)至少需要提供一个")
+
+        payload = {}
+        if device_name:
+            payload["deviceName"] = device_name
+        if device_id:
+            payload["deviceId"] = device_id
+        return payload
+
+    @classmethod
+    def _batch_status_payload(cls,
+                              device_name_list: Optional[List[str]] = None,
+                              device_id_list: Optional[List[str]] = None) -> Dict:
+        """构建批量状态查询请求体"""
+        # 参数验证
+        if not device_name_list and not device_id_list:
+            raise ValueError("设备编码列表(deviceName)和设备ID列表(deviceId)至少需要提供一个")
+
+        # 检查设备数量限制
+        device_count = len(device_name_list or []) + len(device_id_list or [])
+        if device_count > cls.BATCH_STATUS_LIMIT:
+            raise ValueError(f"单次请求最多支持查询100个设备，当前请求包含{device_count}个设备")
+
+        payload = {}
+        if device_name_list:
+            payload["deviceName"] = device_name_list
+        if device_id_list:
+            payload["deviceId"] = device_id_list
+        return payload
+
+    @staticmethod
+    def _encode_message(message_content: MessageContent) -> str:
+        """将消息内容编码为Base64字符串，字节类型直接编码，不产生中间副本"""
+        if isinstance(message_content, str):
+            message_content = message_content.encode('utf-8')
+        elif not isinstance(message_content, (bytes, bytearray, memoryview)):
+            raise ValueError(f"不支持的消息内容类型: {type(message_content).__name__}")
+        return binascii.b2a_base64(message_content, newline=False).decode('ascii')
+
+    @classmethod
+    def _rrpc_payload(cls,
+                      device_name: str,
+                      product_key: str,
+                      message_content: MessageContent,
+                      timeout: int) -> Dict:
+        """构建RRPC请求体，消息内容使用Base64编码"""
+        return {
+            "deviceName": device_name,
+            "productKey": product_key,
+            "requestBase64Byte": cls._encode_message(message_content),
+            "timeout": timeout
+        }
+
+    @classmethod
+    def _custom_command_payload(cls, device_name: str, message_content: MessageContent) -> Dict:
+        """构建自定义指令下发请求体，消息内容使用Base64编码"""
+        return {
+            "deviceName": device_name,
+            "messageContent": cls._encode_message(message_content)
+        }
+
+    @staticmethod
+    def _decode_rrpc_response(response: Dict) -> Dict:
+        """把payloadBase64Byte解码为字节，保存在response["payload"]中"""
+        if isinstance(response, dict) and response.get("payloadBase64Byte"):
+            try:
+                response["payload"] = RRPCPayload(binascii.a2b_base64(response["payloadBase64Byte"]))
+            except (binascii.Error, TypeError):
+                response["payload"] = None
+        return response
+
+    def _on_register_response(self, response: Dict) -> None:
+        """输出设备注册结果"""
         if self.client.check_response(response):
             device_info = response["data"]
             self.logger.info(f"设备注册成功: {device_info['deviceName']}")
-            
+
             # 输出详细信息
             self.logger.info("设备信息摘要:")
             self.logger.info(f"产品密钥: {device_info['productKey']}")
@@ -61,46 +146,13 @@ class DeviceManager:
             self.logger.info(f"显示名称: {device_info['nickName']}")
             self.logger.info(f"设备ID: {device_info['deviceId']}")
             self.logger.info(f"设备密钥: {device_info['deviceSecret']}")
-        
-        return response
-        
-    def get_device_detail(self, 
-                          device_name: Optional[str] = None, 
-                          device_id: Optional[str] = None) -> Dict:
-        """
-        查询设备详情
-        
-        Args:
-            device_name: 设备编码，可选
-            device_id: 设备唯一标识，可选
-            
-        Returns:
-            Dict: 设备详情信息
-            
-        注意:
-            device_name和device_id至少需要提供一个
-        """
-        # 参数验证
-        if not device_name and not device_id:
-            raise ValueError("设备编码(deviceName)和设备ID(deviceId)至少需要提供一个")
-            
-        endpoint = "/api/v1/quickdevice/detail"
-        
-        # 构建请求体
-        payload = {}
-        if device_name:
-            payload["deviceName"] = device_name
-        if device_id:
-            payload["deviceId"] = device_id
-            
-        # 发送请求
-        response = self.client._make_request(endpoint, payload)
-        
-        # 检查结果并格式化输出
+
+    def _on_detail_response(self, response: Dict) -> None:
+        """输出设备详情摘要"""
         if self.client.check_response(response):
             device_info = response["data"]
             device_status = device_info["status"]
-            
+
             # 格式化设备状态
             status_map = {
                 "ONLINE": "在线",
@@ -108,53 +160,19 @@ class DeviceManager:
                 "UNACTIVE": "未激活"
             }
             status_text = status_map.get(device_status, device_status)
-            
+
             # 输出设备基础信息
             self.logger.info(f"设备ID: {device_info.get('deviceId', '未知')}")
             self.logger.info(f"设备名称: {device_info.get('deviceName', '未知')}")
             self.logger.info(f"设备状态: {status_text}")
-            
-        return response
-        
-    def get_device_status(self, 
-                          device_name: Optional[str] = None, 
-                          device_id: Optional[str] = None) -> Dict:
-        """
-        查询设备在线状态
-        
-        Args:
-            device_name: 设备编码，可选
-            device_id: 设备唯一标识，可选
-            
-        Returns:
-            Dict: 设备状态信息
-            
-        注意:
-            device_name和device_id至少需要提供一个
-        """
-        # 参数验证
-        if not device_name and not device_id:
-            raise ValueError("设备编码(deviceName)和设备ID(deviceId)至少需要提供一个")
-            
-        endpoint = "/api/v1/quickdevice/status"
-        
-        # 构建请求体
-        payload = {}
-        if device_name:
-            payload["deviceName"] = device_name
-        if device_id:
-            payload["deviceId"] = device_id
-            
-        # 发送请求
-        response = self.client._make_request(endpoint, payload)
-        print(response)
-        
-        # 检查结果并格式化输出
+
+    def _on_status_response(self, response: Dict) -> None:
+        """输出设备状态、更新时间及离线时长"""
         if self.client.check_response(response):
             status_data = response["data"]
             device_status = status_data.get("status")
             timestamp_ms = status_data.get("timestamp")
-            
+
             # 状态映射
             status_map = {
                 "ONLINE": "在线",
@@ -162,162 +180,386 @@ class DeviceManager:
                 "UNACTIVE": "未激活"
             }
             status_text = status_map.get(device_status, device_status)
-            
+
             # 时间戳格式化
-            if timestamp_ms:
-                dt = datetime.fromtimestamp(timestamp_ms / 1000)  # 毫秒转秒
-                time_str = dt.strftime("%Y-%m-%d %H:%M:%S")
-            else:
-                time_str = "未知"
-                
+            time_str = format_timestamp(timestamp_ms)
+
             # 显示状态信息
             self.logger.info(f"设备状态: {status_text}")
             self.logger.info(f"状态更新时间: {time_str}")
-            
+
             # 如果设备离线，计算离线时长
             if device_status == "OFFLINE" and timestamp_ms:
-                now_ms = int(datetime.now().timestamp() * 1000)
-                offline_duration_ms = now_ms - timestamp_ms
-                offline_minutes = offline_duration_ms / (1000 * 60)
-                
-                if offline_minutes < 60:
-                    offline_text = f"约 {int(offline_minutes)} 分钟"
-                else:
-                    offline_hours = offline_minutes / 60
-                    if offline_hours < 24:
-                        offline_text = f"约 {int(offline_hours)} 小时 {int(offline_minutes % 60)} 分钟"
-                    else:
-                        offline_days = int(offline_hours / 24)
-                        remaining_hours = int(offline_hours % 24)
-                        offline_text = f"约 {offline_days} 天 {remaining_hours} 小时"
-                
-                self.logger.info(f"离线时长: {offline_text}")
-                
-        return response
-        
-    def batch_get_device_status(self, 
-                                device_name_list: Optional[List[str]] = None, 
-                                device_id_list: Optional[List[str]] = None) -> Dict:
-        """
-        批量查询设备运行状态
-        
-        Args:
-            device_name_list: 设备编码列表，可选
-            device_id_list: 设备唯一标识列表，可选
-            
-        Returns:
-            Dict: 批量设备状态信息
-            
-        注意:
-            device_name_list和device_id_list至少需要提供一个
-        """
-        # 参数验证
-        if not device_name_list and not device_id_list:
-            raise ValueError("设备编码列表(deviceName)和设备ID列表(deviceId)至少需要提供一个")
-            
-        # 检查设备数量限制
-        device_count = len(device_name_list or []) + len(device_id_list or [])
-        if device_count > 100:
-            raise ValueError(f"单次请求最多支持查询100个设备，当前请求包含{device_count}个设备")
-            
-        endpoint = "/api/v1/quickdevice/batchGetDeviceState"
-        
-        # 构建请求体
-        payload = {}
-        if device_name_list:
-            payload["deviceName"] = device_name_list
-        if device_id_list:
-            payload["deviceId"] = device_id_list
-            
-        # 发送请求
-        response = self.client._make_request(endpoint, payload)
-        
-        # 检查结果并统计输出
+                self.logger.info(f"离线时长: {format_offline_duration(timestamp_ms)}")
+
+    def _on_batch_status_response(self, response: Dict) -> None:
+        """统计并输出批量查询中各状态的设备数量"""
         if self.client.check_response(response):
             # 统计各状态设备数量
             status_counts = {"ONLINE": 0, "OFFLINE": 0, "UNACTIVE": 0}
-            
+
             # 获取设备状态列表
             devices_data = response.get("data", [])
             self.logger.info(f"共返回 {len(devices_data)} 个设备信息")
-            
+
             # 遍历统计
             for device_info in devices_data:
                 device_status = device_info.get("deviceStatus", {})
                 status = device_status.get("status", "未知")
-                
+
                 # 更新状态计数
                 if status in status_counts:
                     status_counts[status] += 1
-            
+
             # 打印设备状态统计
             self.logger.info(f"在线设备: {status_counts['ONLINE']} 台, " +
                            f"离线设备: {status_counts['OFFLINE']} 台, " +
                            f"未激活设备: {status_counts['UNACTIVE']} 台")
-                
+
+    def _on_rrpc_response(self, response: Dict) -> None:
+        """输出RRPC响应内容"""
+        if self.client.check_response(response):
+            payload = response.get("payload")
+
+            if payload is not None:
+                self.logger.info(f"RRPC响应: {len(payload)} 字节")
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(f"响应内容: {payload.hex()}")
+            elif response.get("payloadBase64Byte"):
+                self.logger.error("解析响应内容失败: payloadBase64Byte不是有效的Base64")
+            else:
+                self.logger.warning("响应中没有包含payloadBase64Byte字段")
+
+    def _on_custom_command_response(self, response: Dict) -> None:
+        """输出自定义指令下发结果"""
+        if self.client.check_response(response):
+            self.logger.info(f"自定义指令下发成功: {response.get('data', {})}")
+
+
+class DeviceManager(_DeviceManagerBase):
+    """设备管理模块，提供设备相关操作"""
+
+    def __init__(self, client: IoTClient, detail_cache: Optional[DeviceDetailCache] = None):
+        """
+        初始化设备管理模块
+
+        Args:
+            client: IoT客户端实例
+            detail_cache: 可选的设备详情缓存
+        """
+        super().__init__(client)
+        self.detail_cache = detail_cache
+        if detail_cache is not None and client.metrics is not None:
+            client.metrics.register_cache("device_detail", detail_cache)
+
+    def register_device(self,
+                        product_key: str,
+                        device_name: Optional[str] = None,
+                        nick_name: Optional[str] = None) -> Dict:
+        """
+        注册设备
+
+        Args:
+            product_key: 产品唯一标识码
+            device_name: 设备标识码，可选，若未提供则自动生成
+            nick_name: 设备显示名称，可选
+
+        Returns:
+            Dict: 注册结果，包含设备ID和密钥等信息
+        """
+        payload = self._register_payload(product_key, device_name, nick_name)
+
+        # 发送请求
+        try:
+            response = self.client._make_request(self.REGISTER_ENDPOINT, payload)
+        finally:
+            if self.detail_cache is not None and device_name:
+                self.detail_cache.invalidate(device_name=device_name)
+
+        # 注册结果中的设备ID和编码对应的缓存条目同样失效
+        if self.detail_cache is not None and isinstance(response.get("data"), dict):
+            self.detail_cache.invalidate(device_name=response["data"].get("deviceName"),
+                                         device_id=response["data"].get("deviceId"))
+
+        # 检查结果并格式化输出
+        self._on_register_response(response)
+
+        return response
+
+    def register_devices(self,
+                         devices: Iterable[Dict[str, Any]],
+                         checkpoint: Union[str, RegistrationLog, None] = None,
+                         concurrency: int = 8,
+                         rate: Optional[float] = None,
+                         recover_existing: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        并发批量注册设备，支持检查点续传
+
+        Args:
+            devices: 设备参数的可迭代对象，每项包含product_key，以及可选的device_name和nick_name
+            checkpoint: 可选的检查点日志路径；重新运行时跳过日志中已成功注册的设备
+            concurrency: 同时在途的注册请求数
+            rate: 每秒最多发送的注册请求数，None表示不限制
+            recover_existing: 注册失败时是否把同一产品下已存在的设备视为成功，默认关闭
+
+        Returns:
+            Iterator[Dict[str, Any]]: 每个设备的注册结果，按完成顺序产出，
+                详见 iotsdk.provisioning.register_devices
+        """
+        return register_devices(self, devices, checkpoint=checkpoint,
+                                concurrency=concurrency, rate=rate,
+                                recover_existing=recover_existing)
+
+    def get_device_detail(self,
+                          device_name: Optional[str] = None,
+                          device_id: Optional[str] = None,
+                          fields: Optional[List[str]] = None) -> Dict:
+        """
+        查询设备详情
+
+        Args:
+            device_name: 设备编码，可选
+            device_id: 设备唯一标识，可选
+            fields: 启用详情缓存时，调用方实际需要的字段；只要这些字段未过期即可命中缓存
+
+        Returns:
+            Dict: 设备详情信息
+
+        注意:
+            device_name和device_id至少需要提供一个
+        """
+        payload = self._device_payload(device_name, device_id)
+
+        if self.detail_cache is not None:
+            cached = self.detail_cache.get(device_name, device_id, fields)
+            if cached is not None:
+                return cached
+
+        # 发送请求
+        response = self.client._make_request(self.DETAIL_ENDPOINT, payload)
+
+        if self.detail_cache is not None:
+            self.detail_cache.put(response)
+
+        # 检查结果并格式化输出
+        self._on_detail_response(response)
+
         return response
-        
-    def send_rrpc_message(self, 
-                         device_name: str, 
-                         product_key: str, 
-                         message_content: str, 
-                         timeout: int = 5000) -> Dict:
+
+    def get_device_status(self,
+                          device_name: Optional[str] = None,
+                          device_id: Optional[str] = None) -> Dict:
+        """
+        查询设备在线状态
+
+        Args:
+            device_name: 设备编码，可选
+            device_id: 设备唯一标识，可选
+
+        Returns:
+            Dict: 设备状态信息
+
+        注意:
+            device_name和device_id至少需要提供一个
+        """
+        payload = self._device_payload(device_name, device_id)
+
+        # 发送请求
+        response = self.client._make_request(self.STATUS_ENDPOINT, payload)
+
+        # 检查结果并格式化输出
+        self._on_status_response(response)
+
+        return response
+
+    def batch_get_device_status(self,
+                                device_name_list: Optional[List[str]] = None,
+                                device_id_list: Optional[List[str]] = None) -> Dict:
+        """
+        批量查询设备运行状态
+
+        Args:
+            device_name_list: 设备编码列表，可选
+            device_id_list: 设备唯一标识列表，可选
+
+        Returns:
+            Dict: 批量设备状态信息
+
+        注意:
+            device_name_list和device_id_list至少需要提供一个
+        """
+        payload = self._batch_status_payload(device_name_list, device_id_list)
+        if self.client.metrics is not None:
+            self.client.metrics.observe_batch(self.BATCH_STATUS_ENDPOINT,
+                                              len(device_name_list or []) + len(device_id_list or []),
+                                              self.BATCH_STATUS_LIMIT)
+
+        # 发送请求
+        response = self.client._make_request(self.BATCH_STATUS_ENDPOINT, payload)
+
+        # 检查结果并统计输出
+        self._on_batch_status_response(response)
+
+        return response
+
+    def send_rrpc_message(self,
+                         device_name: str,
+                         product_key: str,
+                         message_content: MessageContent,
+                         timeout: int = 5000,
+                         request_timeout: Optional[float] = None) -> Dict:
         """
         发送RRPC消息
-        
+
         Args:
             device_name: 设备编码
             product_key: 产品唯一标识码
-            message_content: 消息内容
+            message_content: 消息内容，字符串按UTF-8编码，bytes/bytearray/memoryview原样发送
             timeout: 超时时间(毫秒)，默认5000ms
-            
+            request_timeout: HTTP请求的超时时间(秒)，默认使用客户端的timeout
+
         Returns:
-            Dict: 消息发送结果
+            Dict: 消息发送结果，设备响应的原始字节保存在payload中(RRPCPayload，
+                可通过text()/json()查看)
         """
-        import base64
-        
-        endpoint = "/api/v1/device/rrpc"
-        
-        # 消息内容Base64编码
-        message_bytes = message_content.encode('utf-8')
-        base64_message = base64.b64encode(message_bytes).decode('utf-8')
-        
-        # 构建请求体
-        payload = {
-            "deviceName": device_name,
-            "productKey": product_key,
-            "requestBase64Byte": base64_message,
-            "timeout": timeout
-        }
-        
+        payload = self._rrpc_payload(device_name, product_key, message_content, timeout)
+
         # 发送请求
-        response = self.client._make_request(endpoint, payload)
-        
-        # 检查结果并解析响应
-        if self.client.check_response(response):
-            # 获取Base64编码的响应
-            base64_payload = response.get("payloadBase64Byte")
-            
-            if base64_payload:
-                # 解码Base64字符串
-                try:
-                    decoded_bytes = base64.b64decode(base64_payload)
-                    decoded_string = decoded_bytes.decode('utf-8')
-                    
-                    self.logger.info("解码后的响应内容:")
-                    self.logger.info(decoded_string)
-                    
-                    # 尝试解析为JSON
-                    try:
-                        import json
-                        json_data = json.loads(decoded_string)
-                        self.logger.info("解析为JSON成功")
-                    except json.JSONDecodeError:
-                        self.logger.debug("响应内容不是有效的JSON格式")
-                        
-                except Exception as e:
-                    self.logger.error(f"解析响应内容失败: {e}")
-            else:
-                self.logger.warning("响应中没有包含payloadBase64Byte字段")
-                
-        return response 
\ No newline at end of file
+        response = self.client._make_request(self.RRPC_ENDPOINT, payload, timeout=request_timeout)
+
+        # 解码响应内容并输出
+        self._decode_rrpc_response(response)
+        self._on_rrpc_response(response)
+
+        return response
+
+    def send_custom_command(self,
+                            device_name: str,
+                            message_content: MessageContent) -> Dict:
+        """
+        下发自定义指令(异步下行，设备需订阅相应主题)
+
+        Args:
+            device_name: 设备编码
+            message_content: 指令内容，发送前进行Base64编码
+
+        Returns:
+            Dict: 指令下发结果
+        """
+        payload = self._custom_command_payload(device_name, message_content)
+
+        # 发送请求
+        response = self.client._make_request(self.CUSTOM_COMMAND_ENDPOINT, payload)
+
+        # 检查结果并格式化输出
+        self._on_custom_command_response(response)
+
+        return response
+
+    def send_rrpc_fanout(self,
+                         targets: Iterable[Sequence],
+                         message_content: Optional[MessageContent] = None,
+                         deadline: float = 30.0,
+                         concurrency: int = 32,
+                         timeout: int = 5000) -> Iterator[RRPCResult]:
+        """
+        在总时限内向多个设备并发发送RRPC消息
+
+        Args:
+            targets: (设备编码, 产品唯一标识码) 或 (设备编码, 产品唯一标识码, 消息内容) 的可迭代对象
+            message_content: 所有设备共用的消息内容
+            deadline: 总时限(秒)
+            concurrency: 同时在途的RRPC请求数
+            timeout: 单个设备的RRPC超时时间(毫秒)，不超过剩余的总时限
+
+        Returns:
+            Iterator[RRPCResult]: 每个设备的结果，按完成顺序产出，详见 iotsdk.fanout.rrpc_fanout
+        """
+        return rrpc_fanout(self, targets, message_content, deadline=deadline,
+                           concurrency=concurrency, timeout=timeout)
+
+    def iter_device_status(self,
+                           devices: Iterable[str],
+                           use_device_id: bool = False,
+                           concurrency: int = 4,
+                           chunk_size: int = _DeviceManagerBase.BATCH_STATUS_LIMIT,
+                           typed: bool = False) -> Iterator[Union[Dict, DeviceStatus]]:
+        """
+        流式批量查询任意数量设备的运行状态
+
+        按chunk_size把设备列表切分为多个批量请求，同时保持concurrency个请求在途，
+        每个请求完成后立即产出其中的设备状态。设备列表惰性读取，内存占用与设备总数无关。
+
+        Args:
+            devices: 设备编码或设备ID的可迭代对象，可以是生成器或打开的文件
+            use_device_id: devices中是否为设备ID，默认为设备编码
+            concurrency: 同时在途的批量请求数
+            chunk_size: 每个批量请求的设备数，最多100
+            typed: 是否产出紧凑的DeviceStatus记录代替字典
+
+        Returns:
+            Iterator[Union[Dict, DeviceStatus]]: 扁平化的单设备状态，按请求完成顺序产出
+
+        注意:
+            某个批量请求失败时抛出异常，未完成的请求会被取消
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency必须大于0")
+        if not 0 < chunk_size <= self.BATCH_STATUS_LIMIT:
+            raise ValueError(f"chunk_size必须在1到{self.BATCH_STATUS_LIMIT}之间")
+
+        # 文件逐行读取时去掉换行符并跳过空行
+        keys = (key.strip() for key in devices)
+        chunks = iter_chunks((key for key in keys if key), chunk_size)
+
+        with ThreadPoolExecutor(max_workers=concurrency,
+                                thread_name_prefix="iotsdk-status-sweep") as executor:
+            in_flight = set()
+            try:
+                for _ in range(concurrency):
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    in_flight.add(executor.submit(self.fetch_status_chunk, chunk, use_device_id, typed))
+
+                while in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        # 先补充新的请求，保持流水线满载，再产出结果
+                        chunk = next(chunks, None)
+                        if chunk is not None:
+                            in_flight.add(executor.submit(self.fetch_status_chunk, chunk, use_device_id, typed))
+
+                        for record in future.result():
+                            yield record
+            finally:
+                for future in in_flight:
+                    future.cancel()
+
+    def fetch_status_chunk(self, keys: List[str], use_device_id: bool = False,
+                           typed: bool = False) -> List[Union[Dict, DeviceStatus]]:
+        """
+        查询一批设备的运行状态并返回扁平化后的记录列表
+
+        Args:
+            keys: 设备编码或设备ID，最多BATCH_STATUS_LIMIT个
+            use_device_id: keys中是否为设备ID，默认为设备编码
+            typed: 是否返回紧凑的DeviceStatus记录代替字典
+
+        Returns:
+            List[Union[Dict, DeviceStatus]]: 单设备状态记录
+
+        Raises:
+            ValueError: 批量查询返回失败
+        """
+        if use_device_id:
+            response = self.batch_get_device_status(device_id_list=keys)
+        else:
+            response = self.batch_get_device_status(device_name_list=keys)
+
+        if not self.client.check_response(response):
+            raise ValueError(f"批量状态查询失败: {response.get('errorMessage', '未知错误')}")
+
+        if typed:
+            return DeviceStatus.from_batch_response(response)
+        return [normalize_device_status(device_info) for device_info in response.get("data") or []]
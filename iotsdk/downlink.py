@@ -0,0 +1,158 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional
+
+# 通知工作线程退出的标记
+_STOP = object()
+
+
+class CommandQueue:
+    """
+    自定义指令后台发送队列
+
+    调用方提交指令后立即拿到Future，由工作线程通过设备管理器(共享客户端的连接池)发送。
+    指令按设备编码分配到固定的工作线程，同一设备的指令按提交顺序下发；
+    每个工作线程的队列有长度上限，队列满时submit阻塞或抛出queue.Full，形成背压。
+    """
+
+    def __init__(self,
+                 device_manager,
+                 workers: int = 8,
+                 maxsize: int = 10000):
+        """
+        初始化指令发送队列
+
+        Args:
+            device_manager: 设备管理器实例
+            workers: 工作线程数，即同时在途的下发请求数上限
+            maxsize: 所有工作线程排队的指令总数上限
+        """
+        if workers < 1:
+            raise ValueError("workers必须大于0")
+        if maxsize < workers:
+            raise ValueError("maxsize不能小于workers")
+
+        self.device_manager = device_manager
+        self.logger = device_manager.logger
+        # 队列本身不设上限，长度上限在锁内检查，保证关闭时写入退出标记不会阻塞
+        self._queues: List[queue.Queue] = [queue.Queue() for _ in range(workers)]
+        self._queue_limit = maxsize // workers
+        self._closed = False
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        self._threads = [
+            threading.Thread(target=self._run, args=(q,), name=f"iotsdk-downlink-{i}", daemon=True)
+            for i, q in enumerate(self._queues)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def pending(self) -> int:
+        """排队中尚未发送的指令数"""
+        return sum(q.qsize() for q in self._queues)
+
+    def submit(self,
+               device_name: str,
+               message_content,
+               block: bool = True,
+               timeout: Optional[float] = None) -> Future:
+        """
+        提交一条自定义指令
+
+        Args:
+            device_name: 设备编码
+            message_content: 指令内容，str按UTF-8编码，bytes/bytearray/memoryview原样发送
+            block: 队列满时是否阻塞等待
+            timeout: 阻塞等待的最长秒数，None表示一直等待
+
+        Returns:
+            Future: 结果为与send_custom_command相同结构的响应，发送异常时抛出该异常
+
+        Raises:
+            queue.Full: 队列已满且不阻塞或等待超时
+            RuntimeError: 队列已关闭
+        """
+        if not device_name:
+            raise ValueError("设备编码(deviceName)不能为空")
+
+        commands = self._queues[hash(device_name) % len(self._queues)]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._not_full:
+            # 关闭检查与入队在同一把锁内，关闭后不会再有指令排在退出标记之后
+            while True:
+                if self._closed:
+                    raise RuntimeError("指令队列已关闭")
+                if commands.qsize() < self._queue_limit:
+                    break
+                if not block:
+                    raise queue.Full
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise queue.Full
+                self._not_full.wait(remaining)
+            future = Future()
+            commands.put_nowait((future, device_name, message_content))
+        return future
+
+    def close(self, wait: bool = True, cancel_pending: bool = False) -> None:
+        """
+        停止接收新指令；已排队的指令发送完毕后工作线程退出
+
+        Args:
+            wait: 是否等待工作线程退出
+            cancel_pending: 是否放弃尚未发送的指令，其Future以RuntimeError结束
+        """
+        with self._not_full:
+            if self._closed:
+                return
+            self._closed = True
+            if cancel_pending:
+                for q in self._queues:
+                    self._fail_pending(q)
+            for q in self._queues:
+                q.put_nowait(_STOP)
+            # 唤醒因队列满而等待的submit，使其抛出RuntimeError
+            self._not_full.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _fail_pending(self, commands: queue.Queue) -> None:
+        """取出队列中剩余的指令，将其Future置为失败"""
+        while True:
+            try:
+                item = commands.get_nowait()
+            except queue.Empty:
+                return
+            if item is _STOP:
+                continue
+            future = item[0]
+            if future.set_running_or_notify_cancel():
+                future.set_exception(RuntimeError("指令队列已关闭"))
+
+    def _run(self, commands: queue.Queue) -> None:
+        while True:
+            item = commands.get()
+            with self._not_full:
+                self._not_full.notify_all()
+            if item is _STOP:
+                # 正常情况下退出标记之后没有指令，兜底将残留指令的Future置为失败
+                self._fail_pending(commands)
+                return
+            future, device_name, message_content = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self.device_manager.send_custom_command(device_name, message_content))
+            except BaseException as e:
+                self.logger.error(f"自定义指令下发失败: {device_name} {e}")
+                future.set_exception(e)
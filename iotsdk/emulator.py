@@ -0,0 +1,759 @@
+"""
+IoT云平台本地模拟器
+
+实现SDK用到的全部接口(认证、设备注册、详情、状态、批量状态、RRPC、自定义指令)，
+用于离线的功能测试和压力测试。设备群按序号惰性生成：设备编码、设备ID、密钥和状态
+都由序号和随机种子的哈希推导，百万级设备不占用内存；通过接口注册的设备单独保存。
+
+可以在进程内启动:
+
+    with Emulator(SimulatedFleet(size=1_000_000), latency="lognormal:0.005,0.5") as emulator:
+        client = IoTClient(emulator.base_url, "any-token")
+
+也可以作为独立进程启动，启动后在标准输出打印基础URL:
+
+    python -m iotsdk.emulator --port 8080 --devices 1000000 --error-rate 0.01 --rate-limit 500
+"""
+
+import argparse
+import base64
+import binascii
+import hashlib
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, Union
+
+from .ratelimit import TokenBucket
+
+AUTH_ENDPOINT = "/api/v1/oauth/auth"
+REGISTER_ENDPOINT = "/api/v1/quickdevice/register"
+DETAIL_ENDPOINT = "/api/v1/quickdevice/detail"
+STATUS_ENDPOINT = "/api/v1/quickdevice/status"
+BATCH_STATUS_ENDPOINT = "/api/v1/quickdevice/batchGetDeviceState"
+RRPC_ENDPOINT = "/api/v1/device/rrpc"
+CUSTOM_COMMAND_ENDPOINT = "/api/v1/device/down/record/add/custom"
+
+# 设备离线时长和创建时间的推导范围(毫秒)
+_MAX_OFFLINE_MS = 30 * 24 * 3600 * 1000
+_MAX_AGE_MS = 365 * 24 * 3600 * 1000
+
+# 单个接口的配置值，或 接口路径 -> 配置值 的字典
+PerEndpoint = Union[Any, Dict[str, Any]]
+# RRPC应答函数: (设备编码, 产品唯一标识码, 请求字节) -> 应答字节，None表示设备不应答
+RRPCHandler = Callable[[str, str, bytes], Optional[bytes]]
+
+
+class Latency:
+    """
+    延迟分布
+
+    支持 fixed:秒、uniform:最小,最大、normal:均值,标准差、lognormal:中位数,sigma、
+    exponential:均值；采样结果小于0时取0。
+    """
+
+    KINDS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+
+    def __init__(self, kind: str = "fixed", a: float = 0.0, b: float = 0.0):
+        """
+        初始化延迟分布
+
+        Args:
+            kind: 分布类型
+            a: 第一个参数(固定值、最小值、均值或中位数)
+            b: 第二个参数(最大值、标准差或sigma)
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f"不支持的延迟分布: {kind}")
+        if kind == "uniform" and b < a:
+            raise ValueError("uniform分布的最大值不能小于最小值")
+        self.kind = kind
+        self.a = a
+        self.b = b
+
+    @classmethod
+    def parse(cls, spec: Union[str, float, "Latency", None]) -> "Latency":
+        """
+        解析延迟分布描述
+
+        Args:
+            spec: 如 "0.01"、"uniform:0.001,0.01"、"lognormal:0.005,0.5"，
+                  数字表示固定延迟，None表示无延迟
+
+        Returns:
+            Latency: 延迟分布
+        """
+        if isinstance(spec, Latency):
+            return spec
+        if spec is None:
+            return cls()
+        if isinstance(spec, (int, float)):
+            return cls("fixed", float(spec))
+
+        kind, _, params = spec.partition(":")
+        if not params:
+            return cls("fixed", float(kind))
+        values = [float(value) for value in params.split(",")]
+        return cls(kind, *values[:2])
+
+    def sample(self, rng: random.Random) -> float:
+        """采样一次延迟(秒)"""
+        if self.kind == "fixed":
+            value = self.a
+        elif self.kind == "uniform":
+            value = rng.uniform(self.a, self.b)
+        elif self.kind == "normal":
+            value = rng.gauss(self.a, self.b)
+        elif self.kind == "lognormal":
+            value = self.a * math.exp(rng.gauss(0.0, self.b)) if self.a > 0 else 0.0
+        else:
+            value = rng.expovariate(1.0 / self.a) if self.a > 0 else 0.0
+        return max(0.0, value)
+
+    def __repr__(self) -> str:
+        return f"Latency({self.kind!r}, {self.a}, {self.b})"
+
+
+class SimulatedFleet:
+    """
+    惰性生成的模拟设备群
+
+    第i个设备的编码为 prefix + i，设备ID由哈希前缀和十六进制序号组成，可以反查序号；
+    状态、时间戳、密钥等字段都由序号和种子的哈希推导，相同参数每次得到相同结果。
+    指定flap_interval时，设备状态每隔该秒数重新推导一次，用于测试状态变化。
+    """
+
+    def __init__(self,
+                 size: int = 1_000_000,
+                 product_key: str = "emu-product",
+                 prefix: str = "device-",
+                 online_ratio: float = 0.7,
+                 unactive_ratio: float = 0.05,
+                 flap_interval: Optional[float] = None,
+                 seed: int = 0):
+        """
+        初始化模拟设备群
+
+        Args:
+            size: 设备数量
+            product_key: 设备所属的产品唯一标识码
+            prefix: 设备编码前缀
+            online_ratio: 在线设备比例
+            unactive_ratio: 未激活设备比例，其余设备离线
+            flap_interval: 状态重新推导的间隔(秒)，None表示状态不变
+            seed: 随机种子
+        """
+        if size < 0:
+            raise ValueError("size不能小于0")
+        if online_ratio < 0 or unactive_ratio < 0 or online_ratio + unactive_ratio > 1:
+            raise ValueError("online_ratio和unactive_ratio必须非负且之和不超过1")
+
+        self.size = size
+        self.product_key = product_key
+        self.prefix = prefix
+        self.online_ratio = online_ratio
+        self.unactive_ratio = unactive_ratio
+        self.flap_interval = flap_interval
+        self.seed = seed
+        self.created_at = int(time.time() * 1000)
+
+    def _hash(self, *parts: Any) -> int:
+        data = ":".join(str(part) for part in (self.seed,) + parts).encode("ascii")
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+    def device_name(self, index: int) -> str:
+        """第index个设备的编码"""
+        return f"{self.prefix}{index}"
+
+    def device_id(self, index: int) -> str:
+        """第index个设备的ID"""
+        return f"{self._hash('id', index) & 0xffffffff:08x}{index:x}"
+
+    def index_of(self, device_name: Optional[str] = None, device_id: Optional[str] = None) -> Optional[int]:
+        """
+        按设备编码或设备ID查找设备序号
+
+        Returns:
+            Optional[int]: 设备序号，不属于该设备群时返回None
+        """
+        try:
+            if device_name is not None:
+                if not device_name.startswith(self.prefix):
+                    return None
+                digits = device_name[len(self.prefix):]
+                index = int(digits)
+                if str(index) != digits:
+                    return None
+            elif device_id is not None and len(device_id) > 8:
+                index = int(device_id[8:], 16)
+                if self.device_id(index) != device_id:
+                    return None
+            else:
+                return None
+        except ValueError:
+            return None
+        return index if 0 <= index < self.size else None
+
+    def status(self, index: int, now_ms: Optional[int] = None) -> Tuple[str, int]:
+        """
+        设备的当前状态
+
+        Returns:
+            Tuple[str, int]: (ONLINE/OFFLINE/UNACTIVE, 状态更新时间戳毫秒)
+        """
+        if self.flap_interval:
+            now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+            period_ms = int(self.flap_interval * 1000)
+            epoch = now_ms // period_ms
+            value = self._hash("status", index, epoch)
+            # 状态在本周期内的某个时刻发生变化
+            timestamp = epoch * period_ms + (value >> 40) % period_ms
+            timestamp = min(timestamp, now_ms)
+        else:
+            value = self._hash("status", index)
+            timestamp = self.created_at - (value >> 40) % _MAX_OFFLINE_MS
+
+        fraction = (value & 0xffffff) / 0x1000000
+        if fraction < self.unactive_ratio:
+            return "UNACTIVE", timestamp
+        if fraction < self.unactive_ratio + self.online_ratio:
+            return "ONLINE", timestamp
+        return "OFFLINE", timestamp
+
+    def detail(self, index: int, now_ms: Optional[int] = None) -> Dict[str, Any]:
+        """设备详情，字段与quickdevice/detail接口一致"""
+        status, timestamp = self.status(index, now_ms)
+        created = self.created_at - _MAX_OFFLINE_MS - self._hash("created", index) % _MAX_AGE_MS
+        name = self.device_name(index)
+        return {
+            "deviceId": self.device_id(index),
+            "deviceName": name,
+            "nickName": name,
+            "productKey": self.product_key,
+            "productName": f"{self.product_key}产品",
+            "deviceSecret": hashlib.blake2b(f"{self.seed}:secret:{index}".encode("ascii"),
+                                            digest_size=16).hexdigest(),
+            "firmwareVersion": f"1.0.{self._hash('firmware', index) % 10}",
+            "status": status,
+            "createTime": _iso(created),
+            "activeTime": None if status == "UNACTIVE" else _iso(created + 60000),
+            "onlineTime": _iso(timestamp) if status == "ONLINE" else None,
+        }
+
+
+def _iso(timestamp_ms: int) -> str:
+    seconds, millis = divmod(timestamp_ms, 1000)
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds)) + f".{millis:03d}Z"
+
+
+def _echo(device_name: str, product_key: str, request: bytes) -> Optional[bytes]:
+    return request
+
+
+class Emulator:
+    """
+    IoT云平台模拟服务
+
+    每个请求依次经过: 延迟 -> 限流(429) -> 错误注入(500) -> token校验(401) -> 接口处理。
+    延迟、错误率和限流比例可以是单个值，也可以是 接口路径 -> 值 的字典。
+    """
+
+    def __init__(self,
+                 fleet: Optional[SimulatedFleet] = None,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 latency: PerEndpoint = None,
+                 error_rate: PerEndpoint = 0.0,
+                 throttle_rate: PerEndpoint = 0.0,
+                 rate_limit: Optional[float] = None,
+                 retry_after: Optional[float] = 1.0,
+                 token_ttl: Optional[float] = None,
+                 credentials: Optional[Dict[str, str]] = None,
+                 require_auth: bool = False,
+                 rrpc_handler: Optional[RRPCHandler] = None,
+                 rrpc_latency: Union[str, float, Latency, None] = None,
+                 batch_limit: int = 100,
+                 seed: Optional[int] = None):
+        """
+        初始化模拟服务
+
+        Args:
+            fleet: 模拟设备群，默认100万个设备
+            host: 监听地址
+            port: 监听端口，0表示自动分配
+            latency: 接口处理延迟，Latency、延迟描述字符串或秒数
+            error_rate: 返回HTTP 500的请求比例
+            throttle_rate: 随机返回HTTP 429的请求比例
+            rate_limit: 服务端每秒处理的请求数上限，超出时返回429，Retry-After为补充令牌所需的秒数
+            retry_after: 随机限流时Retry-After响应头的秒数，None表示不返回该响应头
+            token_ttl: 认证接口签发的token有效期(秒)，None表示不过期
+            credentials: 允许的 appId -> appSecret，None表示接受任意应用凭证
+            require_auth: 是否只接受认证接口签发的token；否则接受任意非空token，
+                          但已过期的签发token仍会被拒绝
+            rrpc_handler: RRPC应答函数，默认原样返回请求内容
+            rrpc_latency: 设备处理RRPC的延迟，超过请求的timeout时返回超时失败
+            batch_limit: 批量状态查询单次请求的设备数上限
+            seed: 延迟和故障注入的随机种子
+        """
+        self.fleet = fleet if fleet is not None else SimulatedFleet()
+        self.latency = self._per_endpoint(latency, Latency.parse, None)
+        self.error_rate = self._per_endpoint(error_rate, float, 0.0)
+        self.throttle_rate = self._per_endpoint(throttle_rate, float, 0.0)
+        self.rate_limiter = TokenBucket(rate_limit) if rate_limit else None
+        self.retry_after = retry_after
+        self.token_ttl = token_ttl
+        self.credentials = credentials
+        self.require_auth = require_auth
+        self.rrpc_handler = rrpc_handler or _echo
+        self.rrpc_latency = Latency.parse(rrpc_latency)
+        self.batch_limit = batch_limit
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        # 签发的token -> 过期时间(monotonic)，None表示不过期
+        self._tokens: Dict[str, Optional[float]] = {}
+        # 通过接口注册的设备，按设备编码和设备ID索引
+        self._registered: Dict[str, Dict[str, Any]] = {}
+        self._registered_ids: Dict[str, Dict[str, Any]] = {}
+        self._message_id = 0
+        self._requests: Dict[str, int] = {}
+        self._responses: Dict[int, int] = {}
+
+        self._server = ThreadingHTTPServer((host, port), _EmulatorHandler)
+        self._server.daemon_threads = True
+        self._server.emulator = self
+        self._thread: Optional[threading.Thread] = None
+        self._routes = {
+            AUTH_ENDPOINT: self._auth,
+            REGISTER_ENDPOINT: self._register,
+            DETAIL_ENDPOINT: self._detail,
+            STATUS_ENDPOINT: self._status,
+            BATCH_STATUS_ENDPOINT: self._batch_status,
+            RRPC_ENDPOINT: self._rrpc,
+            CUSTOM_COMMAND_ENDPOINT: self._custom_command,
+        }
+
+    @staticmethod
+    def _per_endpoint(value: PerEndpoint, convert: Callable, default: Any) -> Dict[Optional[str], Any]:
+        """把配置统一为 接口路径 -> 值 的字典，None键保存未列出接口使用的值"""
+        if isinstance(value, dict):
+            result = {path: convert(item) for path, item in value.items()}
+            result.setdefault(None, convert(default))
+            return result
+        return {None: convert(value)}
+
+    @property
+    def base_url(self) -> str:
+        """模拟服务的基础URL"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "Emulator":
+        """在后台线程中启动服务"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever,
+                                            name="iotsdk-emulator", daemon=True)
+            self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """在当前线程中运行服务，直到stop被调用"""
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        """停止服务并关闭监听端口"""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def issue_token(self, ttl: Optional[float] = None) -> str:
+        """
+        直接签发token，不经过认证接口
+
+        Args:
+            ttl: 有效期(秒)，默认使用token_ttl
+
+        Returns:
+            str: token
+        """
+        ttl = self.token_ttl if ttl is None else ttl
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._tokens[token] = time.monotonic() + ttl if ttl is not None else None
+        return token
+
+    def expire_tokens(self) -> None:
+        """使所有已签发的token立即过期"""
+        now = time.monotonic()
+        with self._lock:
+            for token in self._tokens:
+                self._tokens[token] = now
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        请求统计
+
+        Returns:
+            Dict[str, Dict]: requests(按接口路径的请求数)、responses(按HTTP状态码的响应数)
+        """
+        with self._lock:
+            return {"requests": dict(self._requests), "responses": dict(self._responses)}
+
+    def reset_stats(self) -> None:
+        """清空请求统计"""
+        with self._lock:
+            self._requests.clear()
+            self._responses.clear()
+
+    def handle(self, path: str, headers, body: bytes) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+        """
+        处理一个请求
+
+        Returns:
+            Tuple[int, Dict, Dict]: (HTTP状态码, 响应体, 额外的响应头)
+        """
+        with self._lock:
+            self._requests[path] = self._requests.get(path, 0) + 1
+
+        route = self._routes.get(path)
+        if route is None:
+            return 404, _failure(404, f"接口不存在: {path}"), {}
+
+        delay = self.latency.get(path, self.latency[None]).sample(self._rng)
+        if delay:
+            time.sleep(delay)
+
+        if self.rate_limiter is not None:
+            wait_seconds = self.rate_limiter.try_acquire()
+            if wait_seconds:
+                return 429, _failure(429, "请求过于频繁"), {"Retry-After": f"{wait_seconds:.3f}"}
+        if self._rng.random() < self.throttle_rate.get(path, self.throttle_rate[None]):
+            headers = {"Retry-After": f"{self.retry_after:g}"} if self.retry_after is not None else {}
+            return 429, _failure(429, "请求过于频繁"), headers
+        if self._rng.random() < self.error_rate.get(path, self.error_rate[None]):
+            return 500, _failure(500, "服务内部错误"), {}
+
+        if path != AUTH_ENDPOINT and not self._check_token(headers.get("token")):
+            return 401, _failure(401, "token无效或已过期"), {}
+
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            return 400, _failure(400, "请求体不是有效的JSON"), {}
+        if not isinstance(payload, dict):
+            return 400, _failure(400, "请求体必须是JSON对象"), {}
+        return 200, route(payload), {}
+
+    def _record_response(self, status: int) -> None:
+        with self._lock:
+            self._responses[status] = self._responses.get(status, 0) + 1
+
+    def _check_token(self, token: Optional[str]) -> bool:
+        if not token:
+            return False
+        with self._lock:
+            if token not in self._tokens:
+                return not self.require_auth
+            expires_at = self._tokens[token]
+        return expires_at is None or time.monotonic() < expires_at
+
+    def _find(self, device_name: Optional[str] = None,
+              device_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """查找设备详情，先查注册的设备，再查模拟设备群"""
+        with self._lock:
+            if device_name:
+                registered = self._registered.get(device_name)
+            else:
+                registered = self._registered_ids.get(device_id)
+        if registered is not None:
+            return dict(registered)
+
+        index = self.fleet.index_of(device_name=device_name or None,
+                                    device_id=None if device_name else device_id)
+        return self.fleet.detail(index) if index is not None else None
+
+    def _device_status(self, device_name: Optional[str] = None,
+                       device_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """设备状态字段，设备不存在时返回None"""
+        with self._lock:
+            registered = (self._registered.get(device_name) if device_name
+                          else self._registered_ids.get(device_id))
+        if registered is not None:
+            status, timestamp = registered["status"], registered["timestamp"]
+            name, device_id = registered["deviceName"], registered["deviceId"]
+        else:
+            index = self.fleet.index_of(device_name=device_name or None,
+                                        device_id=None if device_name else device_id)
+            if index is None:
+                return None
+            status, timestamp = self.fleet.status(index)
+            name, device_id = self.fleet.device_name(index), self.fleet.device_id(index)
+        return {
+            "deviceId": device_id,
+            "deviceName": name,
+            "status": status,
+            "timestamp": timestamp,
+            "lastOnlineTime": None if status == "UNACTIVE" else _iso(timestamp),
+        }
+
+    def _auth(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        app_id = payload.get("appId")
+        app_secret = payload.get("appSecret")
+        if not app_id or not app_secret:
+            return _failure(400, "appId和appSecret不能为空")
+        if self.credentials is not None and self.credentials.get(app_id) != app_secret:
+            return _failure(401, "appId或appSecret错误")
+        return _success(self.issue_token())
+
+    def _register(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        product_key = payload.get("productKey")
+        if not product_key:
+            return _failure(400, "productKey不能为空")
+        device_name = payload.get("deviceName") or uuid.uuid4().hex[:16]
+        if product_key == self.fleet.product_key and self.fleet.index_of(device_name=device_name) is not None:
+            return _failure(409, f"设备已存在: {device_name}")
+
+        now_ms = int(time.time() * 1000)
+        device = {
+            "deviceId": uuid.uuid4().hex,
+            "deviceName": device_name,
+            "nickName": payload.get("nickName") or device_name,
+            "productKey": product_key,
+            "productName": f"{product_key}产品",
+            "deviceSecret": uuid.uuid4().hex,
+            "firmwareVersion": None,
+            "status": "UNACTIVE",
+            "timestamp": now_ms,
+            "createTime": _iso(now_ms),
+            "activeTime": None,
+            "onlineTime": None,
+        }
+        with self._lock:
+            if device_name in self._registered:
+                return _failure(409, f"设备已存在: {device_name}")
+            self._registered[device_name] = device
+            self._registered_ids[device["deviceId"]] = device
+        return _success({key: device[key] for key in
+                         ("productKey", "deviceName", "nickName", "deviceId", "deviceSecret")})
+
+    def _detail(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if not payload.get("deviceName") and not payload.get("deviceId"):
+            return _failure(400, "deviceName和deviceId至少需要提供一个")
+        device = self._find(payload.get("deviceName"), payload.get("deviceId"))
+        if device is None:
+            return _failure(404, "设备不存在")
+        device.pop("timestamp", None)
+        return _success(device)
+
+    def _status(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if not payload.get("deviceName") and not payload.get("deviceId"):
+            return _failure(400, "deviceName和deviceId至少需要提供一个")
+        status = self._device_status(payload.get("deviceName"), payload.get("deviceId"))
+        if status is None:
+            return _failure(404, "设备不存在")
+        return _success({"status": status["status"], "timestamp": status["timestamp"]})
+
+    def _batch_status(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        names = payload.get("deviceName") or []
+        ids = payload.get("deviceId") or []
+        if not isinstance(names, list) or not isinstance(ids, list):
+            return _failure(400, "deviceName和deviceId必须是列表")
+        if not names and not ids:
+            return _failure(400, "deviceName和deviceId至少需要提供一个")
+        if len(names) + len(ids) > self.batch_limit:
+            return _failure(400, f"单次请求最多支持查询{self.batch_limit}个设备")
+
+        # 不存在的设备不出现在结果中
+        data = []
+        for name in names:
+            status = self._device_status(device_name=name)
+            if status is not None:
+                data.append({"deviceStatus": status})
+        for device_id in ids:
+            status = self._device_status(device_id=device_id)
+            if status is not None:
+                data.append({"deviceStatus": status})
+        return _success(data)
+
+    def _rrpc(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        device_name = payload.get("deviceName")
+        product_key = payload.get("productKey")
+        if not device_name or not product_key:
+            return _failure(400, "deviceName和productKey不能为空")
+        try:
+            request = base64.b64decode(payload.get("requestBase64Byte") or "", validate=True)
+        except (binascii.Error, TypeError):
+            return _failure(400, "requestBase64Byte不是有效的Base64")
+
+        device = self._find(device_name=device_name)
+        if device is None or device["productKey"] != product_key:
+            return _failure(404, "设备不存在")
+        if device["status"] != "ONLINE":
+            return _failure(503, "设备不在线")
+
+        timeout_ms = payload.get("timeout") or 5000
+        delay = self.rrpc_latency.sample(self._rng)
+        reply = self.rrpc_handler(device_name, product_key, request)
+        if reply is None or delay * 1000 >= timeout_ms:
+            # 设备未在超时时间内应答
+            time.sleep(timeout_ms / 1000)
+            return _failure(408, "RRPC调用超时")
+        if delay:
+            time.sleep(delay)
+
+        result = _success(None)
+        result["payloadBase64Byte"] = base64.b64encode(reply).decode("ascii")
+        return result
+
+    def _custom_command(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        device_name = payload.get("deviceName")
+        if not device_name:
+            return _failure(400, "deviceName不能为空")
+        try:
+            base64.b64decode(payload.get("messageContent") or "", validate=True)
+        except (binascii.Error, TypeError):
+            return _failure(400, "messageContent不是有效的Base64")
+        if self._find(device_name=device_name) is None:
+            return _failure(404, "设备不存在")
+
+        with self._lock:
+            self._message_id += 1
+            message_id = self._message_id
+        return _success({"messageId": str(message_id)})
+
+
+def _success(data: Any) -> Dict[str, Any]:
+    return {"success": True, "code": 200, "data": data}
+
+
+def _failure(code: int, message: str) -> Dict[str, Any]:
+    return {"success": False, "code": code, "errorMessage": message}
+
+
+class _EmulatorHandler(BaseHTTPRequestHandler):
+    """把请求交给Emulator处理，支持keep-alive"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        emulator = self.server.emulator
+        status, result, extra_headers = emulator.handle(self.path, self.headers, body)
+        emulator._record_response(status)
+
+        data = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in extra_headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def spawn(args: Sequence[str] = (), timeout: float = 10.0) -> Tuple[subprocess.Popen, str]:
+    """
+    在子进程中启动模拟服务，服务的CPU开销不计入当前进程
+
+    Args:
+        args: 传递给 python -m iotsdk.emulator 的命令行参数
+        timeout: 等待服务启动的最长秒数
+
+    Returns:
+        Tuple[subprocess.Popen, str]: (子进程, 基础URL)，使用完毕后调用terminate()
+    """
+    # 在包所在目录启动，保证子进程导入的是同一份iotsdk
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen([sys.executable, "-m", "iotsdk.emulator", *args],
+                               cwd=package_root, stdout=subprocess.PIPE, text=True)
+    # 子进程启动后在标准输出打印基础URL
+    timer = threading.Timer(timeout, process.kill)
+    timer.start()
+    try:
+        line = process.stdout.readline().strip()
+    finally:
+        timer.cancel()
+    if not line.startswith("http"):
+        process.kill()
+        raise RuntimeError("模拟服务启动失败")
+    return process, line
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """命令行入口，启动模拟服务直到被中断"""
+    parser = argparse.ArgumentParser(prog="python -m iotsdk.emulator", description="IoT云平台本地模拟器")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=0, help="监听端口，0表示自动分配")
+    parser.add_argument("--devices", type=int, default=1_000_000, help="模拟设备数量")
+    parser.add_argument("--product-key", default="emu-product", help="模拟设备的产品唯一标识码")
+    parser.add_argument("--prefix", default="device-", help="模拟设备的编码前缀")
+    parser.add_argument("--online-ratio", type=float, default=0.7, help="在线设备比例")
+    parser.add_argument("--unactive-ratio", type=float, default=0.05, help="未激活设备比例")
+    parser.add_argument("--flap-interval", type=float, help="设备状态变化间隔(秒)")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--latency", help="接口延迟，如 0.01、uniform:0.001,0.01、lognormal:0.005,0.5")
+    parser.add_argument("--rrpc-latency", help="设备处理RRPC的延迟，格式同--latency")
+    parser.add_argument("--rrpc-reply-hex", help="RRPC固定应答内容(十六进制)，默认原样返回请求")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回500的请求比例")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="随机返回429的请求比例")
+    parser.add_argument("--rate-limit", type=float, help="每秒处理的请求数上限")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="随机限流时Retry-After的秒数")
+    parser.add_argument("--token-ttl", type=float, help="签发token的有效期(秒)")
+    parser.add_argument("--app-id", help="允许的应用ID，未指定时接受任意应用凭证")
+    parser.add_argument("--app-secret", help="应用密钥")
+    parser.add_argument("--require-auth", action="store_true", help="只接受认证接口签发的token")
+    parser.add_argument("--batch-limit", type=int, default=100, help="批量状态查询的设备数上限")
+    args = parser.parse_args(argv)
+
+    rrpc_handler = None
+    if args.rrpc_reply_hex is not None:
+        reply = bytes.fromhex(args.rrpc_reply_hex)
+
+        def rrpc_handler(device_name: str, product_key: str, request: bytes) -> bytes:
+            return reply
+
+    fleet = SimulatedFleet(size=args.devices, product_key=args.product_key, prefix=args.prefix,
+                           online_ratio=args.online_ratio, unactive_ratio=args.unactive_ratio,
+                           flap_interval=args.flap_interval, seed=args.seed)
+    emulator = Emulator(fleet, host=args.host, port=args.port,
+                        latency=args.latency, error_rate=args.error_rate,
+                        throttle_rate=args.throttle_rate, rate_limit=args.rate_limit,
+                        retry_after=args.retry_after,
+                        token_ttl=args.token_ttl,
+                        credentials={args.app_id: args.app_secret} if args.app_id else None,
+                        require_auth=args.require_auth,
+                        rrpc_handler=rrpc_handler, rrpc_latency=args.rrpc_latency,
+                        batch_limit=args.batch_limit, seed=args.seed)
+
+    print(emulator.base_url, flush=True)
+    try:
+        emulator.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        emulator.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
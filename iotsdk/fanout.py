@@ -0,0 +1,129 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, Sequence
+
+import requests
+
+
+class RRPCResult(NamedTuple):
+    """单个设备的RRPC结果"""
+
+    device_name: str
+    product_key: str
+    success: bool
+    response: Optional[Dict]
+    error: Optional[str]
+    latency: float
+    timed_out: bool
+    skipped: bool
+
+
+def rrpc_fanout(device_manager,
+                targets: Iterable[Sequence],
+                message_content=None,
+                deadline: float = 30.0,
+                concurrency: int = 32,
+                timeout: int = 5000,
+                min_timeout: int = 200) -> Iterator[RRPCResult]:
+    """
+    在总时限内向多个设备并发发送RRPC消息
+
+    每个请求的RRPC超时时间和HTTP超时时间都不超过剩余的总时限；剩余时间不足min_timeout时
+    不再发送新的请求，其余设备直接以skipped结果产出。到达总时限时仍未返回的请求以
+    timed_out结果产出，后台线程在各自的HTTP超时后退出。
+
+    Args:
+        device_manager: 设备管理器实例
+        targets: (设备编码, 产品唯一标识码) 或 (设备编码, 产品唯一标识码, 消息内容) 的可迭代对象
+        message_content: 所有设备共用的消息内容，targets中未指定消息内容时使用
+        deadline: 总时限(秒)
+        concurrency: 同时在途的RRPC请求数
+        timeout: 单个设备的RRPC超时时间(毫秒)
+        min_timeout: 剩余时间少于该毫秒数时不再发送新的请求
+
+    Yields:
+        RRPCResult: 每个设备的结果，按完成顺序产出；latency为秒，
+            HTTP超时或平台等待满RRPC超时后返回失败时timed_out为True
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency必须大于0")
+    if not 0 < min_timeout <= timeout:
+        raise ValueError("需要满足 0 < min_timeout <= timeout")
+
+    logger = device_manager.logger
+    deadline_at = time.monotonic() + deadline
+
+    def send(device_name: str, product_key: str, content, rrpc_timeout: int,
+             request_timeout: float) -> RRPCResult:
+        start = time.monotonic()
+        try:
+            response = device_manager.send_rrpc_message(device_name, product_key, content,
+                                                        timeout=rrpc_timeout,
+                                                        request_timeout=request_timeout)
+        except requests.exceptions.Timeout as e:
+            return RRPCResult(device_name, product_key, False, None, str(e),
+                              time.monotonic() - start, True, False)
+        except Exception as e:
+            return RRPCResult(device_name, product_key, False, None, str(e),
+                              time.monotonic() - start, False, False)
+
+        latency = time.monotonic() - start
+        if device_manager.client.check_response(response):
+            return RRPCResult(device_name, product_key, True, response, None, latency, False, False)
+        return RRPCResult(device_name, product_key, False, response,
+                          response.get("errorMessage", "未知错误"), latency,
+                          latency * 1000 >= rrpc_timeout, False)
+
+    def unpack(target: Sequence):
+        if len(target) > 2:
+            return target[0], target[1], target[2]
+        if message_content is None:
+            raise ValueError(f"设备 {target[0]} 没有指定消息内容")
+        return target[0], target[1], message_content
+
+    source = iter(targets)
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="iotsdk-rrpc")
+    in_flight = {}
+    exhausted = False
+    try:
+        while True:
+            # 补充请求直到在途数达到concurrency
+            while not exhausted and len(in_flight) < concurrency:
+                target = next(source, None)
+                if target is None:
+                    exhausted = True
+                    break
+                device_name, product_key, content = unpack(target)
+                remaining_ms = (deadline_at - time.monotonic()) * 1000
+                if remaining_ms < min_timeout:
+                    # 剩余时间不足以完成一次RRPC，不再发送
+                    yield RRPCResult(device_name, product_key, False, None, "超出总时限，未发送",
+                                     0.0, True, True)
+                    continue
+                rrpc_timeout = int(min(timeout, remaining_ms))
+                future = executor.submit(send, device_name, product_key, content,
+                                         rrpc_timeout, remaining_ms / 1000)
+                in_flight[future] = (device_name, product_key, time.monotonic())
+            if not in_flight:
+                break
+
+            remaining = deadline_at - time.monotonic()
+            finished, _ = wait(in_flight, timeout=max(0.0, remaining), return_when=FIRST_COMPLETED)
+            if not finished and remaining <= 0:
+                # 到达总时限，放弃所有未返回的请求
+                now = time.monotonic()
+                for future, (device_name, product_key, start) in in_flight.items():
+                    future.cancel()
+                    yield RRPCResult(device_name, product_key, False, None, "超出总时限",
+                                     now - start, True, False)
+                logger.warning(f"RRPC批量发送超出总时限，{len(in_flight)}个请求未返回")
+                in_flight.clear()
+                continue
+
+            for future in finished:
+                del in_flight[future]
+                yield future.result()
+    finally:
+        for future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=False)
@@ -0,0 +1,296 @@
+import sys
+import time
+from array import array
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # 未安装NumPy时使用array模块和纯Python实现
+    np = None
+
+from .models import (DeviceStatus, STATUS_CODES, STATUS_NAMES, STATUS_OFFLINE,
+                     STATUS_UNKNOWN, to_epoch_ms)
+from .utils import normalize_device_status
+
+
+class FleetDiff(NamedTuple):
+    """两个快照之间的差异"""
+
+    # (设备ID, 之前状态, 当前状态)，状态未知时为"UNKNOWN"
+    changed: List[Tuple[str, str, str]]
+    # 当前快照中新出现的设备ID
+    added: List[str]
+    # 当前快照中已不存在的设备ID
+    removed: List[str]
+
+
+def _status_name(code: int) -> str:
+    return STATUS_NAMES[code] or "UNKNOWN"
+
+
+def _match_rows(index, keys_index):
+    """
+    查找keys_index中每个设备在index中的行号，不存在时为-1
+
+    按设备ID的哈希排序后二分查找，再逐一核对匹配到的设备ID；出现哈希冲突时返回None，
+    由调用方改用逐行匹配。重复的设备ID取最后一行，与row_of一致。
+    """
+    ids, order, sorted_hashes = index
+    key_ids, key_order, sorted_keys = keys_index
+    positions = np.searchsorted(sorted_hashes, sorted_keys, side="right") - 1
+    clipped = np.maximum(positions, 0)
+    found = (positions >= 0) & (sorted_hashes[clipped] == sorted_keys)
+    rows = np.full(len(key_ids), -1, dtype=np.int64)
+    rows[key_order[found]] = order[clipped[found]]
+    matched = rows >= 0
+    if not (ids[rows[matched]] == key_ids[matched]).all():
+        return None
+    return rows
+
+
+class FleetSnapshot:
+    """
+    列式存储的设备状态快照
+
+    每个设备占一行：设备ID(驻留字符串)、uint8状态码、int64时间戳和最后在线时间、
+    产品编号。统计、筛选、按产品分组和快照对比在安装NumPy时向量化执行，
+    否则退化为array模块上的循环。时间列中0表示未知。
+    """
+
+    def __init__(self):
+        self.device_ids: List[str] = []
+        self.device_names: List[Optional[str]] = []
+        self.status = array("B")
+        self.timestamp = array("q")
+        self.last_online_time = array("q")
+        self.product = array("I")
+        # 产品编号0表示未知产品
+        self.products: List[Optional[str]] = [None]
+        self._product_index: Dict[Optional[str], int] = {None: 0}
+        self._row_index: Optional[Dict[str, int]] = None
+        self._id_index = None
+        self.created_at = int(time.time() * 1000)
+
+    def __len__(self) -> int:
+        return len(self.device_ids)
+
+    @classmethod
+    def from_records(cls,
+                     records: Iterable[Union[Dict[str, Any], DeviceStatus]],
+                     product_keys: Optional[Dict[str, str]] = None) -> "FleetSnapshot":
+        """
+        从设备状态构建快照
+
+        Args:
+            records: 状态字典(含批量查询的deviceStatus嵌套格式)或DeviceStatus记录
+            product_keys: 可选的设备ID到产品密钥的映射，记录中没有productKey时使用
+
+        Returns:
+            FleetSnapshot: 设备状态快照
+        """
+        snapshot = cls()
+        for record in records:
+            snapshot.append(record, product_keys)
+        return snapshot
+
+    @classmethod
+    def from_batch_responses(cls,
+                             responses: Iterable[Dict],
+                             product_keys: Optional[Dict[str, str]] = None) -> "FleetSnapshot":
+        """
+        从多个batch_get_device_status响应构建快照
+
+        Args:
+            responses: 批量状态查询响应
+            product_keys: 可选的设备ID到产品密钥的映射
+
+        Returns:
+            FleetSnapshot: 设备状态快照
+        """
+        snapshot = cls()
+        for response in responses:
+            if response and response.get("success"):
+                for device_info in response.get("data") or []:
+                    snapshot.append(device_info, product_keys)
+        return snapshot
+
+    def append(self,
+               record: Union[Dict[str, Any], DeviceStatus],
+               product_keys: Optional[Dict[str, str]] = None) -> None:
+        """
+        追加一个设备的状态
+
+        Args:
+            record: 状态字典或DeviceStatus记录
+            product_keys: 可选的设备ID到产品密钥的映射
+        """
+        if isinstance(record, DeviceStatus):
+            device_id = record.device_id
+            device_name = record.device_name
+            status_code = record.status_code
+            timestamp = record.timestamp
+            last_online = record.last_online_time
+            product_key = record.extra.get("productKey") if record.extra else None
+        else:
+            record = normalize_device_status(record)
+            device_id = record.get("deviceId")
+            device_name = record.get("deviceName")
+            status_code = STATUS_CODES.get(record.get("status"), STATUS_UNKNOWN)
+            timestamp = to_epoch_ms(record.get("timestamp"))
+            last_online = to_epoch_ms(record.get("lastOnlineTime"))
+            product_key = record.get("productKey")
+
+        if product_key is None and product_keys:
+            product_key = product_keys.get(device_id)
+
+        product = self._product_index.get(product_key)
+        if product is None:
+            product = len(self.products)
+            self.products.append(sys.intern(product_key))
+            self._product_index[product_key] = product
+
+        self.device_ids.append(sys.intern(device_id) if device_id else device_id)
+        self.device_names.append(device_name)
+        self.status.append(status_code)
+        self.timestamp.append(timestamp or 0)
+        self.last_online_time.append(last_online or 0)
+        self.product.append(product)
+        self._row_index = None
+        self._id_index = None
+
+    def _column(self, column: array):
+        """NumPy可用时返回零拷贝视图"""
+        return np.frombuffer(column, dtype=column.typecode) if np is not None and len(column) else column
+
+    def counts(self) -> Dict[str, int]:
+        """
+        各状态的设备数量
+
+        Returns:
+            Dict[str, int]: 如 {"ONLINE": 10, "OFFLINE": 2, "UNACTIVE": 0, "UNKNOWN": 0}
+        """
+        if np is not None and len(self):
+            bins = np.bincount(self._column(self.status), minlength=len(STATUS_NAMES)).tolist()
+        else:
+            bins = [self.status.count(code) for code in range(len(STATUS_NAMES))]
+        counts = {name: bins[code] for code, name in enumerate(STATUS_NAMES) if name}
+        counts["UNKNOWN"] = bins[STATUS_UNKNOWN]
+        return counts
+
+    def offline_longer_than(self, seconds: float, now_ms: Optional[int] = None) -> List[str]:
+        """
+        离线时长超过指定秒数的设备
+
+        离线时长按状态时间戳计算，时间戳未知的设备不计入。
+
+        Args:
+            seconds: 离线时长阈值(秒)
+            now_ms: 计算时使用的当前毫秒时间戳，默认为当前时间
+
+        Returns:
+            List[str]: 设备ID列表
+        """
+        if now_ms is None:
+            now_ms = int(time.time() * 1000)
+        cutoff = now_ms - int(seconds * 1000)
+
+        if np is not None and len(self):
+            timestamp = self._column(self.timestamp)
+            mask = (self._column(self.status) == STATUS_OFFLINE) & (timestamp > 0) & (timestamp < cutoff)
+            return [self.device_ids[row] for row in np.flatnonzero(mask).tolist()]
+
+        return [device_id for device_id, status, timestamp
+                in zip(self.device_ids, self.status, self.timestamp)
+                if status == STATUS_OFFLINE and 0 < timestamp < cutoff]
+
+    def ids_with_status(self, status: str) -> List[str]:
+        """
+        指定状态的设备
+
+        Args:
+            status: 状态字符串，如ONLINE
+
+        Returns:
+            List[str]: 设备ID列表
+        """
+        code = STATUS_CODES.get(status, STATUS_UNKNOWN)
+        if np is not None and len(self):
+            return [self.device_ids[row] for row in np.flatnonzero(self._column(self.status) == code).tolist()]
+        return [device_id for device_id, value in zip(self.device_ids, self.status) if value == code]
+
+    def group_by_product(self) -> Dict[Optional[str], Dict[str, int]]:
+        """
+        按产品统计各状态的设备数量
+
+        Returns:
+            Dict[Optional[str], Dict[str, int]]: 产品密钥到状态计数的映射，未知产品为None
+        """
+        width = len(STATUS_NAMES)
+        if np is not None and len(self):
+            keys = self._column(self.product).astype(np.int64) * width + self._column(self.status)
+            bins = np.bincount(keys, minlength=len(self.products) * width).tolist()
+        else:
+            bins = [0] * (len(self.products) * width)
+            for product, status in zip(self.product, self.status):
+                bins[product * width + status] += 1
+
+        groups = {}
+        for product, product_key in enumerate(self.products):
+            row = bins[product * width:(product + 1) * width]
+            if any(row):
+                counts = {name: row[code] for code, name in enumerate(STATUS_NAMES) if name}
+                counts["UNKNOWN"] = row[STATUS_UNKNOWN]
+                groups[product_key] = counts
+        return groups
+
+    def row_of(self, device_id: str) -> Optional[int]:
+        """设备ID所在的行号，不存在时为None"""
+        if self._row_index is None:
+            self._row_index = {device_id: row for row, device_id in enumerate(self.device_ids)}
+        return self._row_index.get(device_id)
+
+    def _ids_index(self):
+        """设备ID列、按ID哈希排序的行号和排序后的哈希，追加设备前缓存复用"""
+        if self._id_index is None:
+            hashes = np.fromiter(map(hash, self.device_ids), dtype=np.int64, count=len(self))
+            order = np.argsort(hashes, kind="stable")
+            self._id_index = (np.array(self.device_ids, dtype=object), order, hashes[order])
+        return self._id_index
+
+    def diff(self, previous: "FleetSnapshot") -> FleetDiff:
+        """
+        与之前的快照对比状态变化
+
+        安装NumPy时设备ID按哈希排序后二分查找匹配，向量化执行。
+
+        Args:
+            previous: 较早的快照
+
+        Returns:
+            FleetDiff: 状态发生变化的设备，以及新增和消失的设备
+        """
+        rows = removed_rows = None
+        if np is not None and len(self) and len(previous):
+            rows = _match_rows(previous._ids_index(), self._ids_index())
+            removed_rows = _match_rows(self._ids_index(), previous._ids_index())
+        if rows is not None and removed_rows is not None:
+            known = np.flatnonzero(rows >= 0)
+            old_status = previous._column(previous.status)[rows[known]]
+            changed_rows = known[old_status != self._column(self.status)[known]]
+            changed = [(self.device_ids[row], _status_name(previous.status[previous_row]),
+                        _status_name(self.status[row]))
+                       for row, previous_row in zip(changed_rows.tolist(), rows[changed_rows].tolist())]
+            added = [self.device_ids[row] for row in np.flatnonzero(rows < 0).tolist()]
+            removed = [previous.device_ids[row] for row in np.flatnonzero(removed_rows < 0).tolist()]
+            return FleetDiff(changed, added, removed)
+
+        changed, added = [], []
+        for row, device_id in enumerate(self.device_ids):
+            previous_row = previous.row_of(device_id)
+            if previous_row is None:
+                added.append(device_id)
+            elif previous.status[previous_row] != self.status[row]:
+                changed.append((device_id, _status_name(previous.status[previous_row]),
+                                _status_name(self.status[row])))
+        removed = [device_id for device_id in previous.device_ids if self.row_of(device_id) is None]
+        return FleetDiff(changed, added, removed)
@@ -0,0 +1,400 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .models import (DeviceStatus, STATUS_CODES, STATUS_NAMES, STATUS_OFFLINE,
+                     STATUS_ONLINE, STATUS_UNKNOWN, to_epoch_ms)
+from .utils import normalize_device_status
+
+# 快照文件的格式标识
+_MAGIC = b"IOTSDK-HISTORY-2\n"
+# 设备ID以换行分隔保存的旧版快照，仍可读取
+_MAGIC_V1 = b"IOTSDK-HISTORY-1\n"
+
+
+class StatusHistory:
+    """
+    设备状态历史
+
+    按设备ID保存最近capacity次状态变化(变化时间和状态码)。所有设备的环形缓冲区
+    连续存放在两个array中，每个设备固定占用capacity * 9字节，设备数量再多内存也是有界的：
+    一百万个设备、capacity=16时约150MB。只记录状态变化，重复的相同状态不占用空间。
+
+    时间均为毫秒时间戳；统计时间窗口早于最早记录的部分不计入观察时间。
+    """
+
+    def __init__(self, capacity: int = 16):
+        """
+        初始化状态历史
+
+        Args:
+            capacity: 每个设备最多保留的状态变化次数
+        """
+        if capacity < 2:
+            raise ValueError("capacity不能小于2")
+
+        self.capacity = capacity
+        self._device_ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._times = array("q")
+        self._codes = array("B")
+        # 每个设备下一次写入的位置和已写入的总次数
+        self._heads = array("I")
+        self._counts = array("I")
+        self._empty_times = array("q", bytes(8 * capacity))
+        self._empty_codes = array("B", bytes(capacity))
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._device_ids)
+
+    def __contains__(self, device_id: str) -> bool:
+        return device_id in self._rows
+
+    @property
+    def device_ids(self) -> List[str]:
+        """有历史记录的设备ID"""
+        return list(self._device_ids)
+
+    def record(self, device_id: str, status: Union[str, int], timestamp: Optional[int] = None) -> bool:
+        """
+        记录设备状态
+
+        Args:
+            device_id: 设备唯一标识
+            status: 状态字符串(如ONLINE)或状态码
+            timestamp: 状态变化时间的毫秒时间戳，默认为当前时间
+
+        Returns:
+            bool: 是否产生了新的状态变化；与最近状态相同或早于最近变化时为False
+        """
+        code = STATUS_CODES.get(status, STATUS_UNKNOWN) if isinstance(status, str) else status
+        if not device_id or code == STATUS_UNKNOWN:
+            return False
+        timestamp = int(time.time() * 1000) if timestamp is None else int(timestamp)
+
+        with self._lock:
+            row = self._rows.get(device_id)
+            if row is None:
+                row = self._add_row(device_id)
+            elif self._counts[row]:
+                last = row * self.capacity + (self._heads[row] - 1) % self.capacity
+                if self._codes[last] == code or timestamp < self._times[last]:
+                    return False
+
+            slot = row * self.capacity + self._heads[row]
+            self._times[slot] = timestamp
+            self._codes[slot] = code
+            self._heads[row] = (self._heads[row] + 1) % self.capacity
+            self._counts[row] += 1
+            return True
+
+    def record_status(self, record: Union[Dict[str, Any], DeviceStatus],
+                      device_id: Optional[str] = None) -> bool:
+        """
+        记录一个设备状态字典或DeviceStatus记录
+
+        Args:
+            record: 状态字典(含批量查询的deviceStatus嵌套格式)或DeviceStatus记录
+            device_id: 记录中没有deviceId时使用的设备ID
+
+        Returns:
+            bool: 是否产生了新的状态变化
+        """
+        if isinstance(record, DeviceStatus):
+            return self.record(record.device_id or device_id, record.status_code, record.timestamp)
+        record = normalize_device_status(record)
+        return self.record(record.get("deviceId") or device_id, record.get("status", ""),
+                           to_epoch_ms(record.get("timestamp")))
+
+    def record_response(self, response: Dict, device_id: Optional[str] = None) -> bool:
+        """
+        记录get_device_status的响应
+
+        Args:
+            response: 设备状态响应
+            device_id: 响应中没有deviceId时使用的设备ID
+
+        Returns:
+            bool: 是否产生了新的状态变化
+        """
+        if not response or not response.get("success") or not isinstance(response.get("data"), dict):
+            return False
+        return self.record_status(response["data"], device_id)
+
+    def record_batch_response(self, response: Dict) -> int:
+        """
+        记录batch_get_device_status的响应
+
+        Args:
+            response: 批量设备状态响应
+
+        Returns:
+            int: 产生状态变化的设备数
+        """
+        if not response or not response.get("success"):
+            return 0
+        return sum(self.record_status(device_info) for device_info in response.get("data") or [])
+
+    def record_change(self, change) -> bool:
+        """
+        记录StatusWatcher的状态变化，可直接作为on_change回调
+
+        Args:
+            change: StatusChange
+
+        Returns:
+            bool: 是否产生了新的状态变化
+        """
+        timestamp = change.timestamp
+        if timestamp is None:
+            timestamp = int(time.time() * 1000)
+        return self.record(change.device_id, change.new_status, timestamp)
+
+    def transitions(self, device_id: str) -> List[Tuple[int, str]]:
+        """
+        设备保留的状态变化
+
+        Args:
+            device_id: 设备唯一标识
+
+        Returns:
+            List[Tuple[int, str]]: 按时间排序的(毫秒时间戳, 状态)
+        """
+        with self._lock:
+            row = self._rows.get(device_id)
+            if row is None:
+                return []
+            return [(timestamp, STATUS_NAMES[code]) for timestamp, code in self._entries(row)]
+
+    def uptime(self, device_id: str, window: Optional[float] = None,
+               now_ms: Optional[int] = None) -> Optional[float]:
+        """
+        在线时间占观察时间的比例
+
+        Args:
+            device_id: 设备唯一标识
+            window: 统计最近多少秒，None表示全部历史
+            now_ms: 统计截止的毫秒时间戳，默认为当前时间
+
+        Returns:
+            Optional[float]: 0到1之间的比例，没有观察数据时为None
+        """
+        stats = self._device_stats(device_id, window, now_ms)
+        if stats is None or not stats[1]:
+            return None
+        return stats[0] / stats[1]
+
+    def flap_count(self, device_id: str, window: Optional[float] = None,
+                   now_ms: Optional[int] = None) -> int:
+        """
+        时间窗口内的状态变化次数(不含首次观察)
+
+        Args:
+            device_id: 设备唯一标识
+            window: 统计最近多少秒，None表示全部历史
+            now_ms: 统计截止的毫秒时间戳，默认为当前时间
+
+        Returns:
+            int: 状态变化次数
+        """
+        stats = self._device_stats(device_id, window, now_ms)
+        return 0 if stats is None else stats[2]
+
+    def mean_time_offline(self, device_id: str, window: Optional[float] = None,
+                          now_ms: Optional[int] = None) -> Optional[float]:
+        """
+        时间窗口内每次离线的平均时长
+
+        Args:
+            device_id: 设备唯一标识
+            window: 统计最近多少秒，None表示全部历史
+            now_ms: 统计截止的毫秒时间戳，默认为当前时间
+
+        Returns:
+            Optional[float]: 平均离线秒数，窗口内没有离线时为None
+        """
+        stats = self._device_stats(device_id, window, now_ms)
+        if stats is None or not stats[4]:
+            return None
+        return stats[3] / stats[4] / 1000
+
+    def fleet_summary(self, window: Optional[float] = None,
+                      now_ms: Optional[int] = None) -> Dict[str, Any]:
+        """
+        整个设备群的可用性统计
+
+        Args:
+            window: 统计最近多少秒，None表示全部历史
+            now_ms: 统计截止的毫秒时间戳，默认为当前时间
+
+        Returns:
+            Dict[str, Any]: devices(有观察数据的设备数)、uptime(按观察时间加权的在线比例)、
+                flaps(状态变化总次数)、mean_time_offline(平均离线秒数)
+        """
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        devices = online = observed = flaps = offline = periods = 0
+        with self._lock:
+            for row in range(len(self._device_ids)):
+                stats = self._analyze(row, window, now_ms)
+                if not stats[1]:
+                    continue
+                devices += 1
+                online += stats[0]
+                observed += stats[1]
+                flaps += stats[2]
+                offline += stats[3]
+                periods += stats[4]
+        return {
+            "devices": devices,
+            "uptime": online / observed if observed else None,
+            "flaps": flaps,
+            "mean_time_offline": offline / periods / 1000 if periods else None,
+        }
+
+    def fleet_uptime(self, window: Optional[float] = None,
+                     now_ms: Optional[int] = None) -> Dict[str, float]:
+        """
+        每个设备的在线比例
+
+        Args:
+            window: 统计最近多少秒，None表示全部历史
+            now_ms: 统计截止的毫秒时间戳，默认为当前时间
+
+        Returns:
+            Dict[str, float]: 设备ID到在线比例的映射，不含没有观察数据的设备
+        """
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        result = {}
+        with self._lock:
+            for row, device_id in enumerate(self._device_ids):
+                stats = self._analyze(row, window, now_ms)
+                if stats[1]:
+                    result[device_id] = stats[0] / stats[1]
+        return result
+
+    def save(self, path: str) -> None:
+        """
+        将历史快照原子写入文件
+
+        Args:
+            path: 快照文件路径
+        """
+        with self._lock:
+            header = json.dumps({
+                "capacity": self.capacity,
+                "devices": len(self._device_ids),
+                "byteorder": sys.byteorder,
+            }).encode("utf-8")
+            # 设备ID可能包含任意字符，以JSON数组保存
+            ids = json.dumps(self._device_ids, ensure_ascii=False).encode("utf-8")
+
+            directory = os.path.dirname(os.path.abspath(path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".history-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(_MAGIC)
+                    f.write(header + b"\n")
+                    f.write(len(ids).to_bytes(8, "little"))
+                    f.write(ids)
+                    for column in (self._times, self._codes, self._heads, self._counts):
+                        column.tofile(f)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+    @classmethod
+    def load(cls, path: str) -> "StatusHistory":
+        """
+        从快照文件恢复历史
+
+        Args:
+            path: 快照文件路径
+
+        Returns:
+            StatusHistory: 恢复的状态历史
+        """
+        with open(path, "rb") as f:
+            magic = f.readline()
+            if magic not in (_MAGIC, _MAGIC_V1):
+                raise ValueError(f"不是有效的状态历史快照: {path}")
+            header = json.loads(f.readline())
+            ids_size = int.from_bytes(f.read(8), "little")
+            ids = f.read(ids_size).decode("utf-8")
+
+            history = cls(capacity=header["capacity"])
+            devices = header["devices"]
+            if magic == _MAGIC:
+                device_ids = json.loads(ids)
+            else:
+                device_ids = ids.split("\n") if devices else []
+            if len(device_ids) != devices or len(set(device_ids)) != devices:
+                raise ValueError(f"状态历史快照已损坏，设备数与设备ID不一致: {path}")
+            history._device_ids = [sys.intern(device_id) for device_id in device_ids]
+            history._rows = {device_id: row for row, device_id in enumerate(history._device_ids)}
+            for column, length in ((history._times, devices * history.capacity),
+                                   (history._codes, devices * history.capacity),
+                                   (history._heads, devices),
+                                   (history._counts, devices)):
+                column.fromfile(f, length)
+                if header["byteorder"] != sys.byteorder:
+                    column.byteswap()
+        return history
+
+    def _add_row(self, device_id: str) -> int:
+        row = len(self._device_ids)
+        self._device_ids.append(sys.intern(device_id))
+        self._rows[device_id] = row
+        self._times.extend(self._empty_times)
+        self._codes.extend(self._empty_codes)
+        self._heads.append(0)
+        self._counts.append(0)
+        return row
+
+    def _entries(self, row: int) -> List[Tuple[int, int]]:
+        """按时间顺序返回设备保留的(时间, 状态码)"""
+        count = min(self._counts[row], self.capacity)
+        base = row * self.capacity
+        start = (self._heads[row] - count) % self.capacity
+        return [(self._times[base + (start + i) % self.capacity],
+                 self._codes[base + (start + i) % self.capacity]) for i in range(count)]
+
+    def _device_stats(self, device_id: str, window: Optional[float],
+                      now_ms: Optional[int]) -> Optional[Tuple[int, int, int, int, int]]:
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        with self._lock:
+            row = self._rows.get(device_id)
+            return None if row is None else self._analyze(row, window, now_ms)
+
+    def _analyze(self, row: int, window: Optional[float], now_ms: int) -> Tuple[int, int, int, int, int]:
+        """
+        统计时间窗口内的在线时间、观察时间、变化次数、离线时间和离线次数(毫秒)
+
+        最早一次记录之前的状态未知，不计入观察时间；离线时段按窗口截断。
+        """
+        entries = self._entries(row)
+        start = None if window is None else now_ms - int(window * 1000)
+        online = observed = flaps = offline = periods = 0
+
+        for i, (timestamp, code) in enumerate(entries):
+            end = entries[i + 1][0] if i + 1 < len(entries) else now_ms
+            begin = timestamp if start is None else max(timestamp, start)
+            end = min(end, now_ms)
+            if i and (start is None or timestamp > start) and timestamp <= now_ms:
+                flaps += 1
+            if end <= begin:
+                continue
+            duration = end - begin
+            observed += duration
+            if code == STATUS_ONLINE:
+                online += duration
+            elif code == STATUS_OFFLINE:
+                offline += duration
+                periods += 1
+        return online, observed, flaps, offline, periods
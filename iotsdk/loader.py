@@ -0,0 +1,201 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .device import DeviceManager
+from .utils import normalize_device_status
+
+
+class DeviceStatusLoader:
+    """
+    设备状态查询合并器
+
+    在一个很短的时间窗口内收集各线程发起的单设备状态查询，合并为一次
+    batchGetDeviceState请求(每批最多100个设备)，再把结果分发给各调用方。
+    同一窗口内重复查询的设备只会请求一次。
+    """
+
+    def __init__(self,
+                 device_manager: DeviceManager,
+                 window: float = 0.005,
+                 max_batch_size: int = DeviceManager.BATCH_STATUS_LIMIT,
+                 max_workers: int = 4):
+        """
+        初始化状态查询合并器
+
+        Args:
+            device_manager: 设备管理器实例
+            window: 收集查询的时间窗口(秒)
+            max_batch_size: 单次批量请求的设备数上限，不能超过100
+            max_workers: 并行发送批量请求的线程数
+        """
+        if not 0 < max_batch_size <= DeviceManager.BATCH_STATUS_LIMIT:
+            raise ValueError(f"max_batch_size必须在1到{DeviceManager.BATCH_STATUS_LIMIT}之间")
+
+        self.device_manager = device_manager
+        self.logger = device_manager.logger
+        self.window = window
+        self.max_batch_size = max_batch_size
+
+        # 按查询字段分别排队：设备编码与设备ID不能混在同一个批量请求中
+        self._pending = {"deviceName": {}, "deviceId": {}}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._dispatcher = None
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="iotsdk-status-loader")
+
+    def load(self,
+             device_name: Optional[str] = None,
+             device_id: Optional[str] = None) -> Future:
+        """
+        提交单个设备的状态查询
+
+        Args:
+            device_name: 设备编码，可选
+            device_id: 设备唯一标识，可选，同时提供时按设备ID查询
+
+        Returns:
+            Future: 结果为与get_device_status相同结构的响应；
+                    该设备查询失败时设置为对应的异常
+        """
+        if not device_name and not device_id:
+            raise ValueError("设备编码(deviceName)和设备ID(deviceId)至少需要提供一个")
+
+        field, key = ("deviceId", device_id) if device_id else ("deviceName", device_name)
+        future = Future()
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("DeviceStatusLoader已关闭")
+            self._pending[field].setdefault(key, []).append(future)
+            self._ensure_dispatcher()
+            self._cond.notify()
+
+        return future
+
+    def get_device_status(self,
+                          device_name: Optional[str] = None,
+                          device_id: Optional[str] = None,
+                          timeout: Optional[float] = None) -> Dict:
+        """
+        查询设备在线状态，与DeviceManager.get_device_status用法一致
+
+        Args:
+            device_name: 设备编码，可选
+            device_id: 设备唯一标识，可选
+            timeout: 等待结果的最长时间(秒)
+
+        Returns:
+            Dict: 设备状态信息
+        """
+        return self.load(device_name, device_id).result(timeout)
+
+    def close(self) -> None:
+        """发送剩余的查询并停止后台线程"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._dispatcher is not None:
+            self._dispatcher.join()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _ensure_dispatcher(self) -> None:
+        if self._dispatcher is None:
+            self._dispatcher = threading.Thread(target=self._run,
+                                                name="iotsdk-status-dispatcher",
+                                                daemon=True)
+            self._dispatcher.start()
+
+    def _pending_count(self) -> int:
+        return max(len(keys) for keys in self._pending.values())
+
+    def _run(self) -> None:
+        """后台调度：等待窗口结束或凑满一批后提交批量请求"""
+        while True:
+            with self._cond:
+                while not self._pending_count() and not self._closed:
+                    self._cond.wait()
+                if not self._pending_count():
+                    return
+
+                deadline = time.monotonic() + self.window
+                while self._pending_count() < self.max_batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                batches = self._take_batches()
+
+            for field, batch in batches:
+                self._executor.submit(self._execute, field, batch)
+
+    def _take_batches(self) -> List[Tuple[str, Dict[str, List[Future]]]]:
+        """取出所有排队的查询并按批量上限分组"""
+        batches = []
+        for field, pending in self._pending.items():
+            if not pending:
+                continue
+            keys = list(pending)
+            for start in range(0, len(keys), self.max_batch_size):
+                batch = {key: pending[key] for key in keys[start:start + self.max_batch_size]}
+                batches.append((field, batch))
+            self._pending[field] = {}
+        return batches
+
+    def _execute(self, field: str, batch: Dict[str, List[Future]]) -> None:
+        """发送一次批量请求，并把每个设备的结果或错误分别交给对应的调用方"""
+        # 丢弃已被调用方取消的查询
+        batch = {
+            key: active for key, active in (
+                (key, [f for f in futures if f.set_running_or_notify_cancel()])
+                for key, futures in batch.items()
+            ) if active
+        }
+        if not batch:
+            return
+
+        keys = list(batch)
+        try:
+            if field == "deviceId":
+                response = self.device_manager.batch_get_device_status(device_id_list=keys)
+            else:
+                response = self.device_manager.batch_get_device_status(device_name_list=keys)
+        except Exception as e:
+            self.logger.error(f"批量状态查询请求失败: {e}")
+            for futures in batch.values():
+                for future in futures:
+                    future.set_exception(e)
+            return
+
+        if not self.device_manager.client.check_response(response):
+            error = ValueError(f"批量状态查询失败: {response.get('errorMessage', '未知错误')}")
+            for futures in batch.values():
+                for future in futures:
+                    future.set_exception(error)
+            return
+
+        records = {}
+        for device_info in response.get("data") or []:
+            record = normalize_device_status(device_info)
+            records[record.get(field)] = record
+
+        for key, futures in batch.items():
+            record = records.get(key)
+            for future in futures:
+                if record is None:
+                    future.set_exception(ValueError(f"批量状态查询未返回该设备: {key}"))
+                else:
+                    future.set_result({
+                        "success": True,
+                        "code": response.get("code", 200),
+                        "data": record
+                    })
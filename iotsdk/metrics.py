@@ -0,0 +1,251 @@
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# 延迟直方图的默认分桶(秒)
+DEFAULT_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 批量查询填充率的分桶
+FILL_RATIO_BUCKETS = (0.1, 0.25, 0.5, 0.75, 0.9, 1.0)
+
+
+class RequestTiming(NamedTuple):
+    """单次HTTP请求的计时和字节数"""
+
+    endpoint: str
+    method: str
+    status: Optional[int]
+    bytes_sent: int
+    bytes_received: int
+    ttfb: float
+    body: float
+    parse: float
+
+    @property
+    def total(self) -> float:
+        """请求总耗时(秒)"""
+        return self.ttfb + self.body + self.parse
+
+
+class Histogram:
+    """固定分桶的累积直方图"""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Prometheus格式的(le, 累积计数)"""
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((repr(float(bound)), total))
+        result.append(("+Inf", total + self.counts[-1]))
+        return result
+
+
+class _EndpointStats:
+    __slots__ = ("requests", "errors", "retries", "bytes_sent", "bytes_received",
+                 "ttfb", "body", "parse")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.requests: Dict[Optional[int], int] = {}
+        self.errors: Dict[Optional[int], int] = {}
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.ttfb = Histogram(buckets)
+        self.body = Histogram(buckets)
+        self.parse = Histogram(buckets)
+
+
+class Metrics:
+    """
+    客户端请求指标
+
+    按接口统计请求数、错误数、重试次数、收发字节数，以及首字节时间(ttfb，取自
+    requests的response.elapsed，包含建立连接的时间，requests无法单独观察连接耗时)、
+    响应体读取时间和JSON解析时间的直方图；同时统计
+    批量状态查询的填充率和已注册缓存的命中情况。可以导出为Prometheus文本格式，
+    或在每次请求后调用回调。
+
+    客户端未配置metrics时不做任何计时，开销只有一次属性判断。
+    """
+
+    def __init__(self,
+                 latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+                 prefix: str = "iotsdk"):
+        """
+        初始化请求指标
+
+        Args:
+            latency_buckets: 延迟直方图的分桶上界(秒)
+            prefix: 导出时指标名称的前缀
+        """
+        self.latency_buckets = tuple(latency_buckets)
+        self.prefix = prefix
+        self._endpoints: Dict[str, _EndpointStats] = {}
+        self._fill_ratio: Dict[str, Histogram] = {}
+        self._caches: Dict[str, object] = {}
+        self._callbacks: List[Callable[[RequestTiming], None]] = []
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback: Callable[[RequestTiming], None]) -> None:
+        """
+        注册请求回调，每次HTTP请求完成后在请求线程中调用
+
+        Args:
+            callback: 接收RequestTiming的函数
+        """
+        self._callbacks = self._callbacks + [callback]
+
+    def register_cache(self, name: str, cache) -> None:
+        """
+        注册需要导出命中率的缓存
+
+        Args:
+            name: 缓存名称，如detail
+            cache: 提供stats()的缓存，如DeviceDetailCache或DeviceStatusCache
+        """
+        self._caches[name] = cache
+
+    def observe_request(self, timing: RequestTiming) -> None:
+        """记录一次完成的HTTP请求"""
+        with self._lock:
+            stats = self._stats(timing.endpoint)
+            stats.requests[timing.status] = stats.requests.get(timing.status, 0) + 1
+            stats.bytes_sent += timing.bytes_sent
+            stats.bytes_received += timing.bytes_received
+            stats.ttfb.observe(timing.ttfb)
+            stats.body.observe(timing.body)
+            stats.parse.observe(timing.parse)
+        for callback in self._callbacks:
+            callback(timing)
+
+    def observe_error(self, endpoint: str, status: Optional[int] = None) -> None:
+        """记录一次失败的请求，status为None表示连接失败或超时"""
+        with self._lock:
+            errors = self._stats(endpoint).errors
+            errors[status] = errors.get(status, 0) + 1
+
+    def observe_retry(self, endpoint: str) -> None:
+        """记录一次重试"""
+        with self._lock:
+            self._stats(endpoint).retries += 1
+
+    def observe_batch(self, endpoint: str, size: int, limit: int) -> None:
+        """记录一次批量请求的设备数，用于统计填充率"""
+        with self._lock:
+            histogram = self._fill_ratio.get(endpoint)
+            if histogram is None:
+                histogram = self._fill_ratio[endpoint] = Histogram(FILL_RATIO_BUCKETS)
+            histogram.observe(size / limit)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        当前指标的字典形式
+
+        Returns:
+            Dict[str, Dict]: endpoints(按接口的计数和平均耗时)、batch_fill_ratio、caches
+        """
+        with self._lock:
+            endpoints = {
+                endpoint: {
+                    "requests": sum(stats.requests.values()),
+                    "errors": sum(stats.errors.values()),
+                    "retries": stats.retries,
+                    "bytes_sent": stats.bytes_sent,
+                    "bytes_received": stats.bytes_received,
+                    "ttfb_avg": stats.ttfb.sum / stats.ttfb.count if stats.ttfb.count else None,
+                    "body_avg": stats.body.sum / stats.body.count if stats.body.count else None,
+                    "parse_avg": stats.parse.sum / stats.parse.count if stats.parse.count else None,
+                }
+                for endpoint, stats in self._endpoints.items()
+            }
+            fill = {endpoint: histogram.sum / histogram.count
+                    for endpoint, histogram in self._fill_ratio.items() if histogram.count}
+        caches = {name: cache.stats() for name, cache in self._caches.items()}
+        return {"endpoints": endpoints, "batch_fill_ratio": fill, "caches": caches}
+
+    def to_prometheus(self) -> str:
+        """
+        导出为Prometheus文本格式
+
+        Returns:
+            str: 可直接作为/metrics响应体的文本
+        """
+        p = self.prefix
+        lines = []
+
+        def header(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {p}_{name} {help_text}")
+            lines.append(f"# TYPE {p}_{name} {kind}")
+
+        def histogram(name: str, labels: str, hist: Histogram) -> None:
+            for le, count in hist.cumulative():
+                lines.append(f'{p}_{name}_bucket{{{labels},le="{le}"}} {count}')
+            lines.append(f"{p}_{name}_sum{{{labels}}} {hist.sum}")
+            lines.append(f"{p}_{name}_count{{{labels}}} {hist.count}")
+
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+
+            header("requests_total", "counter", "按接口和HTTP状态码统计的请求数")
+            for endpoint, stats in endpoints:
+                for status, count in stats.requests.items():
+                    lines.append(f'{p}_requests_total{{endpoint="{endpoint}",status="{status or ""}"}} {count}')
+
+            header("request_errors_total", "counter", "失败的请求数，status为空表示连接失败或超时")
+            for endpoint, stats in endpoints:
+                for status, count in stats.errors.items():
+                    lines.append(f'{p}_request_errors_total{{endpoint="{endpoint}",status="{status or ""}"}} {count}')
+
+            header("request_retries_total", "counter", "重试次数")
+            for endpoint, stats in endpoints:
+                lines.append(f'{p}_request_retries_total{{endpoint="{endpoint}"}} {stats.retries}')
+
+            header("request_bytes_sent_total", "counter", "发送的请求体字节数")
+            for endpoint, stats in endpoints:
+                lines.append(f'{p}_request_bytes_sent_total{{endpoint="{endpoint}"}} {stats.bytes_sent}')
+
+            header("response_bytes_received_total", "counter", "接收的响应体字节数")
+            for endpoint, stats in endpoints:
+                lines.append(f'{p}_response_bytes_received_total{{endpoint="{endpoint}"}} {stats.bytes_received}')
+
+            for name, attr, help_text in (
+                    ("request_ttfb_seconds", "ttfb", "从发送请求(含建立连接)到收到响应头的时间"),
+                    ("response_body_seconds", "body", "读取响应体的时间"),
+                    ("response_parse_seconds", "parse", "JSON解析时间")):
+                header(name, "histogram", help_text)
+                for endpoint, stats in endpoints:
+                    histogram(name, f'endpoint="{endpoint}"', getattr(stats, attr))
+
+            header("batch_fill_ratio", "histogram", "批量请求的设备数占单批上限的比例")
+            for endpoint, hist in sorted(self._fill_ratio.items()):
+                histogram("batch_fill_ratio", f'endpoint="{endpoint}"', hist)
+
+        caches = sorted((name, cache.stats()) for name, cache in self._caches.items())
+        header("cache_hits_total", "counter", "缓存命中次数(含过期命中)")
+        for name, stats in caches:
+            lines.append(f'{p}_cache_hits_total{{cache="{name}"}} {stats.get("hits", 0) + stats.get("stale_hits", 0)}')
+        header("cache_misses_total", "counter", "缓存未命中次数")
+        for name, stats in caches:
+            lines.append(f'{p}_cache_misses_total{{cache="{name}"}} {stats.get("misses", 0)}')
+
+        return "\n".join(lines) + "\n"
+
+    def _stats(self, endpoint: str) -> _EndpointStats:
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = self._endpoints[endpoint] = _EndpointStats(self.latency_buckets)
+        return stats
@@ -0,0 +1,279 @@
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+from .utils import normalize_device_status
+
+# 设备状态编码，使用小整数代替字符串
+STATUS_UNKNOWN = 0
+STATUS_ONLINE = 1
+STATUS_OFFLINE = 2
+STATUS_UNACTIVE = 3
+
+STATUS_CODES = {"ONLINE": STATUS_ONLINE, "OFFLINE": STATUS_OFFLINE, "UNACTIVE": STATUS_UNACTIVE}
+STATUS_NAMES = (None, "ONLINE", "OFFLINE", "UNACTIVE")
+
+# 尚未解析的惰性字段
+_UNPARSED = object()
+
+
+def to_epoch_ms(value: Union[int, float, str, None]) -> Optional[int]:
+    """
+    将毫秒时间戳、数字字符串或ISO格式时间统一转换为毫秒时间戳
+
+    不带时区的ISO时间按本地时间解释，与utils中按本地时间格式化毫秒时间戳的约定一致；
+    带时区(包括"Z")的ISO时间按其时区换算。
+
+    Args:
+        value: 时间值
+
+    Returns:
+        Optional[int]: 毫秒时间戳，为空或无法解析时为None
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if not isinstance(value, str) or not value:
+        return None
+    if value.isdigit():
+        return int(value)
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    # 不带时区时datetime.timestamp()按本地时间换算
+    return int(dt.timestamp() * 1000)
+
+
+class DeviceStatus:
+    """
+    紧凑的设备状态记录
+
+    状态保存为小整数，时间戳保存为整数；lastOnlineTime可能是ISO字符串，
+    首次访问last_online_time时才解析。原始字段可通过raw重新构造。
+    """
+
+    __slots__ = ("device_id", "device_name", "status_code", "timestamp",
+                 "as_address", "_last_online_raw", "_last_online_ms", "extra")
+
+    _KNOWN_FIELDS = frozenset(("deviceId", "deviceName", "status", "timestamp",
+                               "lastOnlineTime", "asAddress"))
+
+    def __init__(self,
+                 device_id: Optional[str] = None,
+                 device_name: Optional[str] = None,
+                 status_code: int = STATUS_UNKNOWN,
+                 timestamp: Optional[int] = None,
+                 last_online_time: Union[int, str, None] = None,
+                 as_address: Optional[str] = None,
+                 extra: Optional[Dict[str, Any]] = None):
+        self.device_id = device_id
+        self.device_name = device_name
+        self.status_code = status_code
+        self.timestamp = timestamp
+        self.as_address = as_address
+        self._last_online_raw = last_online_time
+        self._last_online_ms = _UNPARSED
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DeviceStatus":
+        """
+        从状态字典构造记录，兼容批量查询返回的deviceStatus嵌套格式
+
+        Args:
+            data: 单设备状态字典
+
+        Returns:
+            DeviceStatus: 设备状态记录
+        """
+        data = normalize_device_status(data)
+        status = data.get("status")
+        status_code = STATUS_CODES.get(status, STATUS_UNKNOWN)
+
+        extra = {key: value for key, value in data.items() if key not in cls._KNOWN_FIELDS}
+        if status_code == STATUS_UNKNOWN and status is not None:
+            extra["status"] = status
+
+        return cls(
+            device_id=data.get("deviceId"),
+            device_name=data.get("deviceName"),
+            status_code=status_code,
+            # 非数字的timestamp视为缺失，不影响同一批次其他记录的解析
+            timestamp=to_epoch_ms(data.get("timestamp")),
+            last_online_time=data.get("lastOnlineTime"),
+            as_address=data.get("asAddress"),
+            extra=extra or None
+        )
+
+    @classmethod
+    def from_response(cls, response: Dict) -> Optional["DeviceStatus"]:
+        """
+        从get_device_status的响应构造记录
+
+        Returns:
+            Optional[DeviceStatus]: 响应失败时为None
+        """
+        if not response or not response.get("success") or not isinstance(response.get("data"), dict):
+            return None
+        return cls.from_dict(response["data"])
+
+    @classmethod
+    def from_batch_response(cls, response: Dict) -> List["DeviceStatus"]:
+        """
+        从batch_get_device_status的响应构造记录列表
+
+        Returns:
+            List[DeviceStatus]: 响应失败时为空列表
+        """
+        if not response or not response.get("success"):
+            return []
+        return [cls.from_dict(device_info) for device_info in response.get("data") or []]
+
+    @property
+    def status(self) -> Optional[str]:
+        """状态字符串，如ONLINE"""
+        if self.status_code == STATUS_UNKNOWN and self.extra:
+            return self.extra.get("status")
+        return STATUS_NAMES[self.status_code]
+
+    @property
+    def last_online_time(self) -> Optional[int]:
+        """最后在线时间的毫秒时间戳，首次访问时解析"""
+        if self._last_online_ms is _UNPARSED:
+            self._last_online_ms = to_epoch_ms(self._last_online_raw)
+        return self._last_online_ms
+
+    @property
+    def raw(self) -> Dict[str, Any]:
+        """按接口返回的字段名重新构造的状态字典"""
+        data = {}
+        if self.device_id is not None:
+            data["deviceId"] = self.device_id
+        if self.device_name is not None:
+            data["deviceName"] = self.device_name
+        if self.status is not None:
+            data["status"] = self.status
+        if self.timestamp is not None:
+            data["timestamp"] = self.timestamp
+        if self._last_online_raw is not None:
+            data["lastOnlineTime"] = self._last_online_raw
+        if self.as_address is not None:
+            data["asAddress"] = self.as_address
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __repr__(self) -> str:
+        return (f"DeviceStatus(device_id={self.device_id!r}, device_name={self.device_name!r}, "
+                f"status={self.status!r}, timestamp={self.timestamp!r})")
+
+
+class DeviceDetail:
+    """
+    紧凑的设备详情记录
+
+    常用字段保存在slots中，其余字段保存在extra；时间类字段通过get_time惰性解析。
+    """
+
+    __slots__ = ("device_id", "device_name", "nick_name", "product_key", "product_name",
+                 "device_secret", "firmware_version", "status_code", "extra")
+
+    _FIELD_MAP = (
+        ("deviceId", "device_id"),
+        ("deviceName", "device_name"),
+        ("nickName", "nick_name"),
+        ("productKey", "product_key"),
+        ("productName", "product_name"),
+        ("deviceSecret", "device_secret"),
+        ("firmwareVersion", "firmware_version"),
+    )
+    _KNOWN_FIELDS = frozenset([key for key, _ in _FIELD_MAP] + ["status"])
+
+    def __init__(self, **fields):
+        for _, attr in self._FIELD_MAP:
+            setattr(self, attr, fields.get(attr))
+        self.status_code = fields.get("status_code", STATUS_UNKNOWN)
+        self.extra = fields.get("extra")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DeviceDetail":
+        """
+        从设备详情字典构造记录
+
+        Args:
+            data: get_device_detail响应中的data
+
+        Returns:
+            DeviceDetail: 设备详情记录
+        """
+        fields = {attr: data.get(key) for key, attr in cls._FIELD_MAP}
+        status = data.get("status")
+        fields["status_code"] = STATUS_CODES.get(status, STATUS_UNKNOWN)
+
+        extra = {key: value for key, value in data.items() if key not in cls._KNOWN_FIELDS}
+        if fields["status_code"] == STATUS_UNKNOWN and status is not None:
+            extra["status"] = status
+        fields["extra"] = extra or None
+        return cls(**fields)
+
+    @classmethod
+    def from_response(cls, response: Dict) -> Optional["DeviceDetail"]:
+        """
+        从get_device_detail的响应构造记录
+
+        Returns:
+            Optional[DeviceDetail]: 响应失败时为None
+        """
+        if not response or not response.get("success") or not isinstance(response.get("data"), dict):
+            return None
+        return cls.from_dict(response["data"])
+
+    @property
+    def status(self) -> Optional[str]:
+        """状态字符串，如ONLINE"""
+        if self.status_code == STATUS_UNKNOWN and self.extra:
+            return self.extra.get("status")
+        return STATUS_NAMES[self.status_code]
+
+    def get_time(self, field: str) -> Optional[int]:
+        """
+        读取时间类字段并转换为毫秒时间戳
+
+        Args:
+            field: 接口返回的字段名，如gmtCreate
+
+        Returns:
+            Optional[int]: 毫秒时间戳，字段不存在或无法解析时为None
+        """
+        return to_epoch_ms(self.extra.get(field)) if self.extra else None
+
+    @property
+    def raw(self) -> Dict[str, Any]:
+        """按接口返回的字段名重新构造的详情字典"""
+        data = {key: getattr(self, attr) for key, attr in self._FIELD_MAP
+                if getattr(self, attr) is not None}
+        if self.status is not None:
+            data["status"] = self.status
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __repr__(self) -> str:
+        return (f"DeviceDetail(device_id={self.device_id!r}, device_name={self.device_name!r}, "
+                f"product_key={self.product_key!r}, status={self.status!r})")
+
+
+class RRPCPayload(bytes):
+    """RRPC响应的原始字节，按需提供文本和JSON视图"""
+
+    __slots__ = ()
+
+    def text(self, encoding: str = "utf-8", errors: str = "strict") -> str:
+        """按指定编码解码为字符串"""
+        return self.decode(encoding, errors)
+
+    def json(self) -> Any:
+        """解析为JSON，内容不是JSON时抛出ValueError"""
+        return json.loads(self)
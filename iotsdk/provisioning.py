@@ -0,0 +1,225 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Tuple, Union
+
+from .ratelimit import TokenBucket
+
+
+class RegistrationLog:
+    """
+    批量注册的检查点日志
+
+    每行一个JSON对象(NDJSON)，记录每个设备的注册结果，成功的记录包含平台返回的
+    deviceId和deviceSecret。日志只追加写入，每批结果写完后fsync，进程崩溃后
+    重新运行时跳过已成功注册的设备。文件包含设备密钥，仅当前用户可读写。
+    """
+
+    def __init__(self, path: str):
+        """
+        初始化检查点日志
+
+        Args:
+            path: 日志文件路径，不存在时自动创建
+        """
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(product_key: str, device_name: str) -> str:
+        """设备在日志中的唯一键"""
+        return f"{product_key}/{device_name}"
+
+    def completed(self) -> Dict[str, Dict[str, Any]]:
+        """
+        读取已成功注册的设备
+
+        Returns:
+            Dict[str, Dict[str, Any]]: 设备键到日志记录的映射；
+                末尾因崩溃而不完整的行会被忽略
+        """
+        entries = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if entry.get("success"):
+                        entries[self.key(entry["productKey"], entry["deviceName"])] = entry
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def append(self, entries: Iterable[Dict[str, Any]]) -> None:
+        """
+        追加一批记录并同步到磁盘
+
+        Args:
+            entries: 日志记录
+        """
+        data = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+        if not data:
+            return
+        with self._lock:
+            if self._file is None:
+                fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+                self._file = os.fdopen(fd, "a", encoding="utf-8")
+            self._file.write(data)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """关闭日志文件"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def register_devices(device_manager,
+                     devices: Iterable[Dict[str, Any]],
+                     checkpoint: Union[str, RegistrationLog, None] = None,
+                     concurrency: int = 8,
+                     rate: Optional[float] = None,
+                     rate_limiter: Optional[TokenBucket] = None,
+                     recover_existing: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    并发批量注册设备
+
+    Args:
+        device_manager: 设备管理器实例
+        devices: 设备参数的可迭代对象，每项包含product_key，以及可选的device_name和nick_name；
+                 惰性读取，可以是生成器
+        checkpoint: 可选的检查点日志路径或RegistrationLog；提供时每个设备必须指定device_name，
+                    已成功注册的设备会被跳过
+        concurrency: 同时在途的注册请求数
+        rate: 每秒最多发送的注册请求数，None表示不限制
+        rate_limiter: 可选的共享令牌桶，优先于rate
+        recover_existing: 注册失败时是否查询设备详情，默认关闭；开启后设备已存在于同一产品下
+                          (如上次运行注册成功但未写入检查点)时视为成功，记录平台返回的deviceId和
+                          deviceSecret，结果中recovered为True。注意这会把"设备已存在"的失败当作成功
+
+    Yields:
+        Dict[str, Any]: 每个设备的结果，包含productKey、deviceName、success，成功时包含
+            deviceId和deviceSecret，失败时包含errorMessage；因检查点跳过的设备skipped为True；
+            按请求完成顺序产出
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency必须大于0")
+
+    owns_log = isinstance(checkpoint, str)
+    log = RegistrationLog(checkpoint) if owns_log else checkpoint
+    done = log.completed() if log is not None else {}
+    if rate_limiter is None and rate is not None:
+        rate_limiter = TokenBucket(rate)
+
+    logger = device_manager.logger
+    # 本次运行已提交的设备键，输入中重复的设备只注册一次
+    submitted: Set[str] = set()
+
+    def register(device: Dict[str, Any]) -> Dict[str, Any]:
+        product_key = device["product_key"]
+        device_name = device.get("device_name")
+        try:
+            response = device_manager.register_device(product_key, device_name, device.get("nick_name"))
+            error = None if device_manager.client.check_response(response) \
+                else response.get("errorMessage", "未知错误")
+        except Exception as e:
+            response, error = None, str(e)
+
+        if error is None:
+            data = response["data"]
+            return {"productKey": product_key, "deviceName": data.get("deviceName", device_name),
+                    "deviceId": data.get("deviceId"), "deviceSecret": data.get("deviceSecret"),
+                    "success": True, "at": int(time.time() * 1000)}
+
+        if recover_existing and device_name:
+            recovered = _recover_existing(device_manager, product_key, device_name)
+            if recovered is not None:
+                return recovered
+        return {"productKey": product_key, "deviceName": device_name, "success": False,
+                "errorMessage": error, "at": int(time.time() * 1000)}
+
+    def pending() -> Iterator[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+        """产出(待注册的设备, None)或(None, 跳过的设备的结果)"""
+        for device in devices:
+            if not device.get("product_key"):
+                raise ValueError("每个设备都必须提供product_key")
+            if log is not None:
+                if not device.get("device_name"):
+                    raise ValueError("使用检查点时每个设备都必须提供device_name")
+                key = RegistrationLog.key(device["product_key"], device["device_name"])
+                if key in done or key in submitted:
+                    yield None, {**done.get(key, {"productKey": device["product_key"],
+                                                  "deviceName": device["device_name"]}), "skipped": True}
+                    continue
+                submitted.add(key)
+            yield device, None
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency,
+                                thread_name_prefix="iotsdk-register") as executor:
+            source = pending()
+            in_flight = set()
+            exhausted = False
+            try:
+                while True:
+                    # 补充请求直到在途数达到concurrency，跳过的设备直接产出
+                    while not exhausted and len(in_flight) < concurrency:
+                        item = next(source, None)
+                        if item is None:
+                            exhausted = True
+                            continue
+                        device, skipped = item
+                        if skipped is not None:
+                            yield skipped
+                        else:
+                            if rate_limiter is not None:
+                                rate_limiter.acquire()
+                            in_flight.add(executor.submit(register, device))
+                    if not in_flight:
+                        break
+
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    results = [future.result() for future in finished]
+                    # 先写检查点再产出，保证调用方看到的结果已经落盘
+                    if log is not None:
+                        log.append(results)
+                    for result in results:
+                        if not result["success"]:
+                            logger.warning(f"设备注册失败: {result['productKey']}/{result['deviceName']} "
+                                           f"{result['errorMessage']}")
+                        yield result
+            finally:
+                for future in in_flight:
+                    future.cancel()
+    finally:
+        if owns_log:
+            log.close()
+
+
+def _recover_existing(device_manager, product_key: str, device_name: str) -> Optional[Dict[str, Any]]:
+    """查询已存在的设备，属于同一产品时返回成功记录"""
+    try:
+        response = device_manager.get_device_detail(device_name=device_name)
+    except Exception:
+        return None
+    if not device_manager.client.check_response(response):
+        return None
+    data = response["data"]
+    if data.get("productKey") != product_key or not data.get("deviceSecret"):
+        return None
+    return {"productKey": product_key, "deviceName": device_name, "deviceId": data.get("deviceId"),
+            "deviceSecret": data.get("deviceSecret"), "success": True, "recovered": True,
+            "at": int(time.time() * 1000)}
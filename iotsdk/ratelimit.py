@@ -0,0 +1,201 @@
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    令牌桶限流器
+
+    以rate个/秒的速度补充令牌，最多积累burst个；每个请求消耗一个令牌，
+    令牌不足时阻塞等待。多个客户端共用同一实例即可共享平台配额。
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        初始化令牌桶
+
+        Args:
+            rate: 每秒补充的令牌数，即长期平均请求速率
+            burst: 桶容量，允许的最大突发请求数，默认等于rate
+        """
+        if rate <= 0:
+            raise ValueError("rate必须大于0")
+
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: int = 1) -> float:
+        """
+        尝试获取令牌
+
+        Args:
+            tokens: 需要的令牌数
+
+        Returns:
+            float: 0表示获取成功，否则为需要等待的秒数
+        """
+        if tokens > self.burst:
+            raise ValueError(f"tokens({tokens})不能超过桶容量burst({self.burst})")
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: int = 1, timeout: Optional[float] = None) -> bool:
+        """
+        阻塞直到获取令牌
+
+        Args:
+            tokens: 需要的令牌数
+            timeout: 最长等待秒数，None表示一直等待
+
+        Returns:
+            bool: 是否在超时前获取到令牌
+        """
+        if tokens > self.burst:
+            raise ValueError(f"tokens({tokens})不能超过桶容量burst({self.burst})")
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    基于AIMD的自适应并发限制
+
+    请求延迟和结果正常时并发上限按加法缓慢增长(每轮约增加increase)；
+    遇到限流(HTTP 429)或超时时按乘法回退。同一轮延迟内的多次回退只生效一次，
+    避免一次突发的失败把上限压到最低。
+    """
+
+    SUCCESS = "success"
+    THROTTLED = "throttled"
+    TIMEOUT = "timeout"
+    ERROR = "error"
+
+    def __init__(self,
+                 initial_limit: int = 10,
+                 min_limit: int = 1,
+                 max_limit: int = 200,
+                 increase: float = 1.0,
+                 backoff_factor: float = 0.5,
+                 latency_tolerance: float = 2.0,
+                 min_latency_window: float = 60.0):
+        """
+        初始化自适应并发限制
+
+        Args:
+            initial_limit: 初始并发上限
+            min_limit: 并发上限的最小值
+            max_limit: 并发上限的最大值
+            increase: 每轮(约limit个成功请求)增加的并发数
+            backoff_factor: 回退时并发上限的乘数
+            latency_tolerance: 延迟超过近期最低延迟的多少倍时视为不健康，停止增长
+            min_latency_window: 统计最低延迟的窗口秒数，基准取当前和上一个窗口内的最低值，
+                使网络或服务端变化后基准能随之更新
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("需要满足 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0 < backoff_factor < 1:
+            raise ValueError("backoff_factor必须在0和1之间")
+        if min_latency_window <= 0:
+            raise ValueError("min_latency_window必须大于0")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.backoff_factor = backoff_factor
+        self.latency_tolerance = latency_tolerance
+        self.min_latency_window = min_latency_window
+
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        # 当前窗口和上一个窗口内成功请求的最低延迟
+        self._window_min = None
+        self._previous_window_min = None
+        self._window_started_at = time.monotonic()
+        self._last_backoff = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """当前并发上限"""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """当前在途请求数"""
+        return self._in_flight
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        占用一个并发名额，达到上限时阻塞等待
+
+        Args:
+            timeout: 最长等待秒数，None表示一直等待
+
+        Returns:
+            bool: 是否在超时前获取到名额
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._in_flight < int(self._limit), timeout):
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(self, latency: float, outcome: str = SUCCESS) -> None:
+        """
+        释放名额并根据本次请求的延迟和结果调整并发上限
+
+        Args:
+            latency: 本次请求耗时(秒)
+            outcome: 请求结果，SUCCESS、THROTTLED、TIMEOUT或ERROR
+        """
+        with self._cond:
+            self._in_flight -= 1
+            now = time.monotonic()
+
+            if outcome in (self.THROTTLED, self.TIMEOUT):
+                # 同一轮延迟内只回退一次
+                if now - self._last_backoff >= latency:
+                    self._limit = max(self.min_limit, self._limit * self.backoff_factor)
+                    self._last_backoff = now
+            elif outcome == self.SUCCESS:
+                min_latency = self._observe_latency(latency, now)
+                if latency <= max(min_latency, 0.001) * self.latency_tolerance:
+                    self._limit = min(self.max_limit, self._limit + self.increase / self._limit)
+
+            self._cond.notify_all()
+
+    def _observe_latency(self, latency: float, now: float) -> float:
+        """记录成功请求的延迟，返回近期最低延迟(需持有锁)"""
+        elapsed = now - self._window_started_at
+        if elapsed >= self.min_latency_window:
+            # 超过两个窗口没有成功请求时，旧窗口的数据不再有参考价值
+            self._previous_window_min = self._window_min if elapsed < 2 * self.min_latency_window else None
+            self._window_min = None
+            self._window_started_at = now
+        if self._window_min is None or latency < self._window_min:
+            self._window_min = latency
+        if self._previous_window_min is None:
+            return self._window_min
+        return min(self._window_min, self._previous_window_min)
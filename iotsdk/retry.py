@@ -0,0 +1,169 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+# 携带该请求头的写操作可以安全重试
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+class CircuitOpenError(RuntimeError):
+    """熔断器处于打开状态，请求未发送直接失败"""
+
+
+class RetryPolicy:
+    """
+    请求重试策略
+
+    采用decorrelated jitter退避：每次等待时间在base_delay与上次等待时间的3倍之间随机选取，
+    不超过max_delay。服务端返回Retry-After时按其指定的时间等待。
+    """
+
+    def __init__(self,
+                 max_attempts: int = 3,
+                 base_delay: float = 0.1,
+                 max_delay: float = 5.0,
+                 retry_statuses=(429, 500, 502, 503, 504),
+                 idempotent: bool = True):
+        """
+        初始化重试策略
+
+        Args:
+            max_attempts: 最多尝试次数(含首次请求)，1表示不重试
+            base_delay: 退避等待的最小秒数
+            max_delay: 退避等待的最大秒数，Retry-After超过该值时不再重试
+            retry_statuses: 需要重试的HTTP状态码
+            idempotent: 接口是否幂等；非幂等接口只有携带Idempotency-Key请求头时才重试
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts必须大于0")
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = frozenset(retry_statuses)
+        self.idempotent = idempotent
+
+    def allows_retry(self, headers: Optional[Dict] = None) -> bool:
+        """判断本次请求是否允许重试"""
+        if self.max_attempts <= 1:
+            return False
+        return self.idempotent or bool(headers and headers.get(IDEMPOTENCY_HEADER))
+
+    def next_delay(self, previous_delay: float, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        计算下一次重试前的等待时间
+
+        Args:
+            previous_delay: 上一次的等待秒数
+            retry_after: 服务端要求的等待秒数
+
+        Returns:
+            Optional[float]: 等待秒数，超过max_delay无法满足服务端要求时返回None
+        """
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_delay else None
+        upper = max(self.base_delay, previous_delay * 3)
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
+
+
+# 不重试的策略
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+# 各接口的默认策略：查询类接口可以安全重试；注册、下行等写操作默认不重试
+DEFAULT_RETRY_POLICIES = {
+    "/api/v1/quickdevice/status": RetryPolicy(),
+    "/api/v1/quickdevice/detail": RetryPolicy(),
+    "/api/v1/quickdevice/batchGetDeviceState": RetryPolicy(),
+    "/api/v1/quickdevice/register": RetryPolicy(idempotent=False),
+    "/api/v1/device/down/record/add/custom": RetryPolicy(idempotent=False),
+    "/api/v1/device/rrpc": RetryPolicy(idempotent=False),
+}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    解析Retry-After响应头
+
+    Args:
+        value: 秒数或HTTP日期格式的响应头值
+
+    Returns:
+        Optional[float]: 需要等待的秒数，无法解析时为None
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class CircuitBreaker:
+    """
+    单个接口的熔断器
+
+    连续失败达到failure_threshold次后打开，期间请求直接抛出CircuitOpenError；
+    经过recovery_timeout秒后进入半开状态，放行一个探测请求，成功则关闭，失败则重新打开。
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """
+        初始化熔断器
+
+        Args:
+            failure_threshold: 触发熔断的连续失败次数
+            recovery_timeout: 熔断后到允许探测请求的秒数
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """请求前检查，熔断期间抛出CircuitOpenError"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            raise CircuitOpenError("接口熔断中，请求未发送")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """探测请求未得到结果时归还探测名额，下一次请求重新探测"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
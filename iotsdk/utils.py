@@ -1,7 +1,40 @@
 from datetime import datetime
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from itertools import islice
+from typing import Optional, Dict, Any, Iterable, Iterator, List
 import json
 
+def _to_list(values: Iterable[Any]) -> List[Any]:
+    """将序列或NumPy数组转换为Python列表"""
+    tolist = getattr(values, "tolist", None)
+    return tolist() if tolist is not None else list(values)
+
+
+@lru_cache(maxsize=65536)
+def _format_epoch_second(second: int) -> str:
+    """按秒缓存的本地时间格式化结果"""
+    return datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S")
+
+
+@lru_cache(maxsize=65536)
+def _format_iso(time_str: str) -> str:
+    dt = datetime.fromisoformat(time_str.replace("Z", "+00:00"))
+    return dt.strftime("%Y-%m-%d %H:%M:%S")
+
+
+@lru_cache(maxsize=65536)
+def _format_duration_minutes(minutes: int) -> str:
+    """按整分钟缓存的离线时长文本"""
+    if minutes < 60:
+        return f"约 {minutes} 分钟"
+    
+    hours = minutes // 60
+    if hours < 24:
+        return f"约 {hours} 小时 {minutes % 60} 分钟"
+    
+    return f"约 {hours // 24} 天 {hours % 24} 小时"
+
+
 def format_timestamp(timestamp_ms: Optional[int]) -> str:
     """
     将毫秒时间戳格式化为可读字符串
@@ -16,8 +49,7 @@ def format_timestamp(timestamp_ms: Optional[int]) -> str:
         return "未知"
         
     try:
-        dt = datetime.fromtimestamp(timestamp_ms / 1000)  # 毫秒转秒
-        return dt.strftime("%Y-%m-%d %H:%M:%S")
+        return _format_epoch_second(int(timestamp_ms // 1000))  # 毫秒转秒
     except Exception:
         return str(timestamp_ms)
         
@@ -35,35 +67,70 @@ def format_iso_time(time_str: Optional[str]) -> str:
         return "未知"
         
     try:
-        dt = datetime.fromisoformat(time_str.replace("Z", "+00:00"))
-        return dt.strftime("%Y-%m-%d %H:%M:%S")
+        return _format_iso(time_str)
     except Exception:
         return time_str
         
-def format_offline_duration(timestamp_ms: int) -> str:
+def format_offline_duration(timestamp_ms: int, now_ms: Optional[int] = None) -> str:
     """
     计算并格式化离线时长
     
     Args:
         timestamp_ms: 离线时的毫秒时间戳
+        now_ms: 计算时使用的当前毫秒时间戳，默认为当前时间
         
     Returns:
         str: 格式化的离线时长
     """
-    now_ms = int(datetime.now().timestamp() * 1000)
+    if now_ms is None:
+        now_ms = int(datetime.now().timestamp() * 1000)
     offline_duration_ms = now_ms - timestamp_ms
-    offline_minutes = offline_duration_ms / (1000 * 60)
+    return _format_duration_minutes(int(offline_duration_ms / (1000 * 60)))
+    
+def format_timestamps(timestamps_ms: Iterable[Optional[int]]) -> List[str]:
+    """
+    批量格式化毫秒时间戳，同一秒内的时间戳只格式化一次
     
-    if offline_minutes < 60:
-        return f"约 {int(offline_minutes)} 分钟"
+    Args:
+        timestamps_ms: 毫秒时间戳序列或NumPy数组
+        
+    Returns:
+        List[str]: 格式化后的时间字符串列表
+    """
+    return [format_timestamp(timestamp_ms) for timestamp_ms in _to_list(timestamps_ms)]
+    
+def format_iso_times(time_strs: Iterable[Optional[str]]) -> List[str]:
+    """
+    批量转换ISO格式时间字符串，相同的字符串只解析一次
+    
+    Args:
+        time_strs: ISO格式时间字符串序列
+        
+    Returns:
+        List[str]: 格式化后的时间字符串列表
+    """
+    return [format_iso_time(time_str) for time_str in _to_list(time_strs)]
     
-    offline_hours = offline_minutes / 60
-    if offline_hours < 24:
-        return f"约 {int(offline_hours)} 小时 {int(offline_minutes % 60)} 分钟"
+def format_offline_durations(timestamps_ms: Iterable[int], now_ms: Optional[int] = None) -> List[str]:
+    """
+    批量计算并格式化离线时长，所有设备使用同一个当前时间
     
-    offline_days = int(offline_hours / 24)
-    remaining_hours = int(offline_hours % 24)
-    return f"约 {offline_days} 天 {remaining_hours} 小时"
+    Args:
+        timestamps_ms: 离线时的毫秒时间戳序列或NumPy数组
+        now_ms: 计算时使用的当前毫秒时间戳，默认为当前时间
+        
+    Returns:
+        List[str]: 格式化的离线时长列表
+    """
+    if now_ms is None:
+        now_ms = int(datetime.now().timestamp() * 1000)
+        
+    # NumPy数组整体计算分钟数，其余序列逐个计算
+    if hasattr(timestamps_ms, "dtype"):
+        minutes = ((now_ms - timestamps_ms) / (1000 * 60)).astype("int64").tolist()
+    else:
+        minutes = [int((now_ms - timestamp_ms) / (1000 * 60)) for timestamp_ms in timestamps_ms]
+    return [_format_duration_minutes(value) for value in minutes]
     
 def pretty_print_json(data: Dict[str, Any]) -> None:
     """
@@ -89,4 +156,45 @@ def get_status_text(status: str) -> str:
         "OFFLINE": "离线",
         "UNACTIVE": "未激活"
     }
-    return status_map.get(status, status) 
\ No newline at end of file
+    return status_map.get(status, status) 
+
+def normalize_device_status(device_info: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    将批量状态查询返回的单条设备信息统一为扁平结构
+    
+    兼容 {"deviceStatus": {...}} 嵌套格式和直接返回状态字段的扁平格式
+    
+    Args:
+        device_info: batchGetDeviceState返回的data列表中的单个元素
+        
+    Returns:
+        Dict[str, Any]: 包含deviceId、deviceName、status等字段的设备状态
+    """
+    nested = device_info.get("deviceStatus")
+    if not isinstance(nested, dict):
+        return device_info
+        
+    record = dict(nested)
+    for key, value in device_info.items():
+        if key != "deviceStatus":
+            record.setdefault(key, value)
+    return record
+
+
+def iter_chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """
+    将任意可迭代对象按固定大小惰性切分
+    
+    Args:
+        items: 可迭代对象，可以是生成器或逐行读取的文件
+        size: 每块的元素个数
+        
+    Returns:
+        Iterator[List[Any]]: 依次产出的列表，最后一块可能不足size个
+    """
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,363 @@
+import asyncio
+import math
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .models import STATUS_NAMES, STATUS_UNKNOWN
+from .utils import iter_chunks
+
+# 尚未观察到状态的设备
+_UNSEEN = 255
+
+
+class StatusChange(NamedTuple):
+    """一次设备状态变化"""
+
+    device_id: Optional[str]
+    device_name: Optional[str]
+    old_status: Optional[str]
+    new_status: str
+    timestamp: Optional[int]
+    observed_at: float
+
+
+class StatusWatcher:
+    """
+    设备状态变化监视器
+
+    通过batchGetDeviceState周期性扫描一组设备，只在状态在ONLINE、OFFLINE、UNACTIVE之间
+    变化时通知监听器。每个设备的轮询间隔独立调整：状态发生变化的设备间隔减半，
+    状态保持不变的设备间隔逐渐拉长，频繁上下线的设备因此被更频繁地检查，
+    长期不变的设备占用的请求量逐渐减少。
+
+    设备状态、轮询间隔保存在array中，调度按min_interval分槽保存行号，
+    每个设备只占用十几个字节；移除设备空出的行由之后添加的设备复用。
+    """
+
+    def __init__(self,
+                 device_manager,
+                 devices: Iterable[str] = (),
+                 use_device_id: bool = True,
+                 interval: float = 30.0,
+                 min_interval: Optional[float] = None,
+                 max_interval: Optional[float] = None,
+                 backoff: float = 1.5,
+                 concurrency: int = 4,
+                 on_change: Optional[Callable[[StatusChange], None]] = None,
+                 emit_initial: bool = False):
+        """
+        初始化状态监视器
+
+        Args:
+            device_manager: 设备管理器实例
+            devices: 设备ID或设备编码
+            use_device_id: devices中是否为设备ID，默认为设备ID
+            interval: 设备的初始轮询间隔(秒)
+            min_interval: 轮询间隔下限，默认为interval的四分之一
+            max_interval: 轮询间隔上限，默认为interval的八倍
+            backoff: 状态未变化时轮询间隔的乘数
+            concurrency: 同时在途的批量请求数
+            on_change: 可选的状态变化回调
+            emit_initial: 是否把首次观察到的状态也作为变化通知(old_status为None)
+        """
+        min_interval = interval / 4 if min_interval is None else min_interval
+        max_interval = interval * 8 if max_interval is None else max_interval
+        if not 0 < min_interval <= interval <= max_interval:
+            raise ValueError("需要满足 0 < min_interval <= interval <= max_interval")
+        if backoff < 1:
+            raise ValueError("backoff不能小于1")
+        if concurrency < 1:
+            raise ValueError("concurrency必须大于0")
+
+        self.device_manager = device_manager
+        self.logger = device_manager.logger
+        self.use_device_id = use_device_id
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.concurrency = concurrency
+        self.emit_initial = emit_initial
+        self.requests = 0
+
+        self._keys: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._status = array("B")
+        self._intervals = array("f")
+        # 每行当前所在的调度槽，-1表示未调度(扫描中或已移除)
+        self._slots = array("q")
+        # 已移除设备空出的行号
+        self._free_rows: List[int] = []
+        # 调度槽编号 -> 该槽到期的行号
+        self._schedule: Dict[int, array] = {}
+        self._listeners: List[Callable[[StatusChange], None]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        if on_change is not None:
+            self.add_listener(on_change)
+        self.add_devices(devices)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add_devices(self, devices: Iterable[str]) -> None:
+        """
+        添加要监视的设备，新设备在下一次扫描时查询
+
+        Args:
+            devices: 设备ID或设备编码
+        """
+        with self._lock:
+            for key in devices:
+                key = key.strip()
+                if not key or key in self._rows:
+                    continue
+                if self._free_rows:
+                    row = self._free_rows.pop()
+                    self._keys[row] = key
+                    self._status[row] = _UNSEEN
+                    self._intervals[row] = self.interval
+                else:
+                    row = len(self._keys)
+                    self._keys.append(key)
+                    self._status.append(_UNSEEN)
+                    self._intervals.append(self.interval)
+                    self._slots.append(-1)
+                self._rows[key] = row
+                # 新设备放入0号槽，下一次扫描立即查询
+                self._schedule_row(row, 0.0)
+
+    def remove_devices(self, devices: Iterable[str]) -> None:
+        """
+        停止监视设备
+
+        Args:
+            devices: 设备ID或设备编码
+        """
+        with self._lock:
+            for key in devices:
+                row = self._rows.pop(key, None)
+                if row is not None:
+                    self._keys[row] = None
+                    self._unschedule_row(row)
+                    self._free_rows.append(row)
+
+    def status_of(self, device: str) -> Optional[str]:
+        """设备最近一次观察到的状态，未观察到时为None"""
+        row = self._rows.get(device)
+        if row is None or self._status[row] == _UNSEEN:
+            return None
+        return STATUS_NAMES[self._status[row]]
+
+    def interval_of(self, device: str) -> Optional[float]:
+        """设备当前的轮询间隔(秒)"""
+        row = self._rows.get(device)
+        return None if row is None else self._intervals[row]
+
+    def add_listener(self, callback: Callable[[StatusChange], None]) -> None:
+        """
+        注册状态变化回调，回调在扫描线程中执行
+
+        Args:
+            callback: 接收StatusChange的函数
+        """
+        with self._lock:
+            self._listeners = self._listeners + [callback]
+
+    def remove_listener(self, callback: Callable[[StatusChange], None]) -> None:
+        """注销状态变化回调"""
+        with self._lock:
+            self._listeners = [listener for listener in self._listeners if listener is not callback]
+
+    async def changes(self, maxsize: int = 0) -> AsyncIterator[StatusChange]:
+        """
+        以异步迭代器的形式接收状态变化
+
+        扫描仍在后台线程中进行(需要先调用start)，变化通过call_soon_threadsafe
+        转交给当前事件循环。
+
+        Args:
+            maxsize: 队列长度上限，0表示不限制；队列满时丢弃新的变化并记录警告
+
+        Yields:
+            StatusChange: 状态变化
+        """
+        loop = asyncio.get_running_loop()
+        queue: "asyncio.Queue[StatusChange]" = asyncio.Queue(maxsize)
+
+        def put(change: StatusChange) -> None:
+            try:
+                queue.put_nowait(change)
+            except asyncio.QueueFull:
+                self.logger.warning(f"状态变化队列已满，丢弃: {change}")
+
+        def listener(change: StatusChange) -> None:
+            loop.call_soon_threadsafe(put, change)
+
+        self.add_listener(listener)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.remove_listener(listener)
+
+    def sweep(self, now: Optional[float] = None) -> List[StatusChange]:
+        """
+        查询所有已到期的设备并通知状态变化
+
+        Args:
+            now: 当前的time.monotonic()时间，默认为当前时间
+
+        Returns:
+            List[StatusChange]: 本次扫描发现的状态变化
+        """
+        now = time.monotonic() if now is None else now
+        rows, keys = self._take_due(now)
+        if not rows:
+            return []
+
+        chunks = list(iter_chunks(keys, self.device_manager.BATCH_STATUS_LIMIT))
+        self.requests += len(chunks)
+
+        changes = []
+        seen = set()
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(chunks)),
+                                thread_name_prefix="iotsdk-watcher") as executor:
+            futures = [executor.submit(self.device_manager.fetch_status_chunk, chunk,
+                                       self.use_device_id, True) for chunk in chunks]
+            for future in futures:
+                try:
+                    records = future.result()
+                except Exception as e:
+                    # 失败的设备按原间隔在下一轮重试
+                    self.logger.warning(f"状态扫描失败: {e}")
+                    continue
+                with self._lock:
+                    for record in records:
+                        self._observe(record, now, changes, seen)
+
+        with self._lock:
+            for row, key in zip(rows, keys):
+                # 扫描期间被移除或被新设备复用的行不再按原设备重新调度
+                if row not in seen and self._keys[row] == key and self._slots[row] == -1:
+                    self._schedule_row(row, now + self._intervals[row])
+
+        self._emit(changes)
+        return changes
+
+    def start(self) -> None:
+        """在后台线程中持续扫描"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="iotsdk-status-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """停止后台扫描"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.sweep()
+            except Exception as e:
+                self.logger.error(f"状态扫描异常: {e}")
+            self._stop.wait(self._time_to_next_due())
+
+    def _time_to_next_due(self) -> float:
+        with self._lock:
+            if not self._schedule:
+                return self.min_interval
+            due = min(self._schedule) * self.min_interval
+        return max(0.0, due - time.monotonic())
+
+    def _slot(self, due: float) -> int:
+        return math.ceil(due / self.min_interval)
+
+    def _schedule_row(self, row: int, due: float) -> None:
+        """把行放入到期时间对应的槽，已在其他槽中时先移出，保证每行只调度一次"""
+        self._unschedule_row(row)
+        slot = self._slot(due)
+        rows = self._schedule.get(slot)
+        if rows is None:
+            rows = self._schedule[slot] = array("I")
+        rows.append(row)
+        self._slots[row] = slot
+
+    def _unschedule_row(self, row: int) -> None:
+        slot = self._slots[row]
+        if slot == -1:
+            return
+        rows = self._schedule[slot]
+        rows.remove(row)
+        if not rows:
+            del self._schedule[slot]
+        self._slots[row] = -1
+
+    def _take_due(self, now: float) -> Tuple[List[int], List[str]]:
+        """取出所有已到期的行及对应的设备"""
+        current = math.floor(now / self.min_interval)
+        rows, keys = [], []
+        with self._lock:
+            for slot in sorted(slot for slot in self._schedule if slot <= current):
+                for row in self._schedule.pop(slot):
+                    self._slots[row] = -1
+                    rows.append(row)
+                    keys.append(self._keys[row])
+        return rows, keys
+
+    def _observe(self, record, now: float, changes: List[StatusChange], seen: set) -> None:
+        """记录一个设备的最新状态，调整其轮询间隔并重新调度"""
+        key = record.device_id if self.use_device_id else record.device_name
+        row = self._rows.get(key)
+        if row is None or row in seen:
+            return
+        seen.add(row)
+
+        code = record.status_code
+        previous = self._status[row]
+        interval = self._intervals[row]
+        if code == STATUS_UNKNOWN or code == previous:
+            interval = min(self.max_interval, interval * self.backoff)
+        else:
+            if previous != _UNSEEN:
+                # 状态变化后缩短间隔，尽快发现后续的抖动
+                interval = max(self.min_interval, interval / 2)
+            if previous != _UNSEEN or self.emit_initial:
+                changes.append(StatusChange(
+                    device_id=record.device_id,
+                    device_name=record.device_name,
+                    old_status=None if previous == _UNSEEN else STATUS_NAMES[previous],
+                    new_status=STATUS_NAMES[code],
+                    timestamp=record.timestamp,
+                    observed_at=now
+                ))
+            self._status[row] = code
+
+        self._intervals[row] = interval
+        self._schedule_row(row, now + interval)
+
+    def _emit(self, changes: List[StatusChange]) -> None:
+        listeners = self._listeners
+        for change in changes:
+            for listener in listeners:
+                try:
+                    listener(change)
+                except Exception as e:
+                    self.logger.error(f"状态变化回调异常: {e}")
@@ -15,15 +15,24 @@ setup(
     packages=find_packages(),
     classifiers=[
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires=">=3.6",
+    python_requires=">=3.7",
     install_requires=[
         "requests>=2.25.0",
     ],
+    extras_require={
+        "async": ["aiohttp>=3.7.0"],
+        "speedups": ["orjson>=3.0.0"],
+        "numpy": ["numpy>=1.17"],
+    },
+    entry_points={
+        "console_scripts": [
+            "iotsdk=iotsdk.cli:main",
+        ],
+    },
 ) 
\ No newline at end of file